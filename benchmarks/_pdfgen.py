@@ -0,0 +1,101 @@
+"""
+Gerador de PDFs sintéticos (sem dependências) para os benchmarks:
+uma página de extrato DTA seguida de N páginas de "Cargas".
+Os dados são fictícios.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+TECON = "INST.PORT.MAR.ALF.USO PUBLICO-TECON RIO GRANDE-RIO GRANDE/RS"
+
+EXTRATO = f"""Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte/Situação
+Via de Transporte : RODOVIARIA
+Declaração solicitada em 29/08/2025 às 16:30:23 hs, pelo CPF : 778.857.910-68
+Declaração registrada em 29/08/2025 às 16:37:40 hs, pelo CPF : 778.857.910-68
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - {TECON}
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+Beneficiário/Transportador
+CNPJ/CPF do Beneficiário : 08.325.039/0001-90
+Nome do Beneficiário: EMPRESA BENEFICIARIA EXEMPLO LTDA
+CNPJ/CPF do Transportador : 13.233.554/0001-80
+Nome do Transportador: TRANSPORTADORA EXEMPLO LTDA
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37""".splitlines()
+
+
+def cargas_pages(n: int, lines_per_page: int = 50) -> List[List[str]]:
+    return [
+        ["Cargas"]
+        + [
+            f"Conhecimento {p}-{i} : MSCU{p:04d}{i:03d} Peso 1.234,56"
+            for i in range(lines_per_page)
+        ]
+        for p in range(n)
+    ]
+
+
+def make_pdf(pages: Sequence[Sequence[str]]) -> bytes:
+    """PDF 1.4 mínimo: cada página é uma lista de linhas em Helvetica 10pt."""
+    objs: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objs.append(obj)
+        return len(objs)
+
+    font = add(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>"
+    )
+    pages_id = add(b"")  # preenchido depois (precisa dos filhos)
+    kids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "40 800 Td"]
+        for ln in lines:
+            esc = ln.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({esc}) Tj T*")
+        ops.append("ET")
+        data = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, font, content)
+            )
+        )
+    objs[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1,
+        catalog,
+        xref,
+    )
+    return bytes(out)
+
+
+def make_extrato_pdf(cargas: int) -> bytes:
+    return make_pdf([EXTRATO] + cargas_pages(cargas))
@@ -0,0 +1,80 @@
+"""
+Benchmark dos backends de extração sobre um corpus de PDFs.
+
+Uso:
+    poetry run python benchmarks/bench_extractors.py caminho/do/corpus [--repeat 3]
+
+Para cada backend (pdfplumber, pypdf, auto) mede extração + parsing e reporta:
+  - docs/s
+  - concordância do JSON parseado com o pdfplumber (referência)
+  - no backend `auto`, quantos documentos caíram no fallback
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.pdf.factory import BACKENDS, build_extractor
+
+
+def _parse_all(
+    backend: str, pdfs: List[Path], repeat: int
+) -> tuple[float, List[Optional[Dict[str, Any]]], Any]:
+    parsers = [BrDtaExtratoParser(), BrDtaParser()]
+    extractor = build_extractor(backend, parsers)
+    uc = ExtractDataUseCase(extractor, parsers)
+
+    results: List[Optional[Dict[str, Any]]] = []
+    start = time.perf_counter()
+    for i in range(repeat):
+        for pdf in pdfs:
+            try:
+                doc = uc.run(str(pdf))
+                data = doc.model_dump(
+                    mode="json", exclude_none=True, exclude_unset=True
+                )
+            except Exception:
+                data = None
+            if i == 0:
+                results.append(data)
+    elapsed = time.perf_counter() - start
+    return elapsed, results, extractor
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("corpus", type=Path, help="Diretório com PDFs (busca recursiva)")
+    ap.add_argument("--repeat", type=int, default=1, help="Repetições por documento")
+    args = ap.parse_args()
+
+    pdfs = sorted(args.corpus.rglob("*.pdf"))
+    if not pdfs:
+        raise SystemExit(f"Nenhum PDF encontrado em {args.corpus}")
+
+    reference: List[Optional[Dict[str, Any]]] = []
+    print(f"Corpus: {len(pdfs)} PDFs × {args.repeat} repetição(ões)\n")
+    print(f"{'backend':<12}{'docs/s':>10}{'ok':>8}{'concord.':>11}{'fallback':>10}")
+
+    for backend in BACKENDS:
+        elapsed, results, extractor = _parse_all(backend, pdfs, args.repeat)
+        if backend == "pdfplumber":
+            reference = results
+
+        ok = sum(1 for r in results if r is not None)
+        agree = sum(1 for r, ref in zip(results, reference) if r == ref)
+        docs_s = (len(pdfs) * args.repeat) / elapsed if elapsed else float("inf")
+        fallbacks = getattr(extractor, "fallbacks", "-")
+        print(
+            f"{backend:<12}{docs_s:>10.2f}{ok:>8}"
+            f"{agree / len(pdfs):>10.1%}{fallbacks!s:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark do compartilhamento de entidades de referência num lote.
+
+Uso:
+    poetry run python benchmarks/bench_interning.py [--docs 5000] [--distinct 40]
+
+Faz o parse de um lote de extratos sintéticos em que `--distinct` unidades
+locais/recintos/participantes se repetem (caso típico: milhares de DTAs do
+mesmo porto/EADI), com o interning ligado e desligado, e mede:
+  - tempo de parse por documento;
+  - memória retida pelos documentos do lote (tracemalloc).
+A saída JSON dos dois modos deve ser idêntica.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import List
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.interning import (
+    DEFAULT_MAX_ENTRIES,
+    intern_stats,
+    set_intern_limit,
+)
+
+TECON = "INST.PORT.MAR.ALF.USO PUBLICO-TECON RIO GRANDE-RIO GRANDE/RS"
+
+TEMPLATE = """Dados Gerais
+No. da Declaração : 25/{n:07d}-0
+Tipo : DTA - ENTRADA COMUM
+Origem
+Unidade Local : {ul:07d} - ALFANDEGA DO PORTO DE RIO GRANDE {ul}
+Recinto Aduaneiro : {ra:07d} - {tecon} {ra}
+Destino
+Unidade Local : {ul2:07d} - DELEGACIA DA RECEITA FEDERAL EM NOVO HAMBURGO {ul2}
+Recinto Aduaneiro : {ra2:07d} - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS {ra2}
+CNPJ/CPF do Beneficiário : 08.325.{p:03d}/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA {p}
+CNPJ/CPF do Transportador : 13.233.{t:03d}/0001-80
+Nome do Transportador: MULTI EXPRESS BRASIL TRANSPORTES DE CARGAS LTDA {t}
+"""
+
+
+def make_batch(docs: int, distinct: int) -> List[str]:
+    return [
+        TEMPLATE.format(
+            n=i,
+            ul=1017700 + i % distinct,
+            ra=301304 + (i * 7) % distinct,
+            ul2=1010700 + (i * 3) % distinct,
+            ra2=403201 + (i * 5) % distinct,
+            p=i % distinct,
+            t=(i * 11) % distinct,
+            tecon=TECON,
+        )
+        for i in range(docs)
+    ]
+
+
+def run(texts: List[str], limit: int):
+    set_intern_limit(limit)
+    parser = BrDtaExtratoParser()
+    gc.collect()
+    tracemalloc.start()
+    docs = [parser.parse(t) for t in texts]
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # tempo sem o custo do tracemalloc
+    set_intern_limit(limit)
+    start = time.perf_counter()
+    for t in texts:
+        parser.parse(t)
+    elapsed = time.perf_counter() - start
+    return docs, elapsed, retained
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--docs", type=int, default=5000)
+    ap.add_argument("--distinct", type=int, default=40)
+    args = ap.parse_args()
+
+    texts = make_batch(args.docs, args.distinct)
+    dump = dict(mode="json", exclude_none=True, exclude_unset=True)
+
+    print(f"{'interning':>10}{'µs/doc':>10}{'retido MB':>12}{'bytes/doc':>11}")
+    outputs = []
+    for name, limit in (("desligado", 0), ("ligado", DEFAULT_MAX_ENTRIES)):
+        docs, elapsed, retained = run(texts, limit)
+        outputs.append([d.model_dump(**dump) for d in docs])
+        print(
+            f"{name:>10}{elapsed / len(texts) * 1e6:>10.1f}"
+            f"{retained / 2**20:>12.2f}{retained / len(texts):>11.0f}"
+        )
+        del docs
+    print(f"tabelas: {intern_stats()}")
+    print(f"saída idêntica: {'sim' if outputs[0] == outputs[1] else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
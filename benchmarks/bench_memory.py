@@ -0,0 +1,62 @@
+"""
+Benchmark de memória da extração pdfplumber: pico × nº de páginas.
+
+Uso:
+    poetry run python benchmarks/bench_memory.py [--pages 10 50 100]
+
+Para cada tamanho gera um extrato sintético (1 página de dados + N de
+"Cargas") e mede, com tracemalloc, o pico de memória Python da extração
+no modo padrão e no modo `memory_bounded`. O texto extraído deve ser
+idêntico nos dois modos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _pdfgen import make_extrato_pdf  # noqa: E402
+
+from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor  # noqa: E402
+
+
+def _measure(extractor: PdfPlumberExtractor, pdf: bytes) -> tuple[float, float, str]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = extractor.extract(pdf)
+    elapsed = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024), elapsed, text
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100])
+    args = ap.parse_args()
+
+    print(
+        f"{'páginas':>8}{'padrão MB':>12}{'limitado MB':>13}{'s padrão':>10}"
+        f"{'s limitado':>12}{'igual':>7}"
+    )
+    for n in args.pages:
+        pdf = make_extrato_pdf(n)
+        base_mb, base_s, base_txt = _measure(PdfPlumberExtractor(), pdf)
+        bound_mb, bound_s, bound_txt = _measure(
+            PdfPlumberExtractor(memory_bounded=True), pdf
+        )
+        print(
+            f"{n + 1:>8}{base_mb:>12.1f}{bound_mb:>13.1f}{base_s:>10.2f}"
+            f"{bound_s:>12.2f}{'sim' if base_txt == bound_txt else 'NÃO':>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark do custo de montar o DocumentoDados a partir do que o parser casou.
+
+Uso:
+    poetry run python benchmarks/bench_models.py [--repeat 2000]
+
+Mede, por documento:
+  - só a montagem dos modelos, com os valores já casados:
+      blocos   — um construtor validado por bloco + atribuições no documento
+                 (como os parsers faziam);
+      única    — a árvore em dicts validada uma vez, na fronteira do
+                 documento (`DocumentoDados.from_parsed`);
+      estrita  — idem, em modo strict (WS_DOCFLOW_STRICT_MODELS=1);
+  - o parse completo do extrato sintético, no modo padrão e no strict.
+A saída JSON de todas as variantes deve ser idêntica.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _pdfgen import EXTRATO  # noqa: E402
+
+from ws_docflow.core.domain.models import (  # noqa: E402
+    DeclaracaoInfo,
+    DocumentoDados,
+    Localidade,
+    Participante,
+    RecintoAduaneiro,
+    Situacao,
+    TotaisOrigem,
+    Transporte,
+    UnidadeLocal,
+    set_strict_models,
+)
+from ws_docflow.infra.parsers.br_dta_extrato_parser import (  # noqa: E402
+    BrDtaExtratoParser,
+)
+
+TEXT = "\n".join(EXTRATO)
+DUMP = dict(mode="json", exclude_none=True, exclude_unset=True)
+
+ORIGEM = (("1017700", "PORTO"), ("0301304", "TECON"))
+DESTINO = (("1010700", "DRF"), ("0403201", "EADI"))
+BENEF = ("08.325.039/0001-90", "EMPRESA BENEFICIARIA EXEMPLO LTDA")
+TOTAIS = ("ARMAZENAMENTO", Decimal("57024.00"), Decimal("308585.37"))
+CPF = "778.857.910-68"
+
+
+def build_blocks() -> DocumentoDados:
+    """Montagem antiga: um modelo validado por bloco, depois setattr."""
+    (oc, od), (rc, rd) = ORIGEM
+    (dc, dd), (drc, drd) = DESTINO
+    doc = DocumentoDados(
+        declaracao=DeclaracaoInfo(numero="2503999080", tipo="DTA - ENTRADA COMUM"),
+        situacao_atual="",
+        origem=Localidade(
+            unidade_local=UnidadeLocal(codigo=oc, descricao=od),
+            recinto_aduaneiro=RecintoAduaneiro(codigo=rc, descricao=rd),
+        ),
+        destino=Localidade(
+            unidade_local=UnidadeLocal(codigo=dc, descricao=dd),
+            recinto_aduaneiro=RecintoAduaneiro(codigo=drc, descricao=drd),
+        ),
+    )
+    doc.beneficiario = Participante(documento=BENEF[0], nome=BENEF[1])
+    doc.totais_origem = TotaisOrigem(
+        tipo=TOTAIS[0], valor_total_usd=TOTAIS[1], valor_total_brl=TOTAIS[2]
+    )
+    transp = Transporte()
+    transp.via = "RODOVIARIA"
+    doc.transporte = transp
+    sit = Situacao()
+    sit.registrada_por_cpf = CPF
+    sit.veiculos_informados = False
+    doc.situacao = sit
+    return doc
+
+
+def build_tree() -> DocumentoDados:
+    """Montagem atual: dicts + uma validação na fronteira do documento."""
+    (oc, od), (rc, rd) = ORIGEM
+    (dc, dd), (drc, drd) = DESTINO
+    return DocumentoDados.from_parsed(
+        {
+            "declaracao": {"numero": "2503999080", "tipo": "DTA - ENTRADA COMUM"},
+            "situacao_atual": "",
+            "origem": {
+                "unidade_local": {"codigo": oc, "descricao": od},
+                "recinto_aduaneiro": {"codigo": rc, "descricao": rd},
+            },
+            "destino": {
+                "unidade_local": {"codigo": dc, "descricao": dd},
+                "recinto_aduaneiro": {"codigo": drc, "descricao": drd},
+            },
+            "beneficiario": {"documento": BENEF[0], "nome": BENEF[1]},
+            "totais_origem": {
+                "tipo": TOTAIS[0],
+                "valor_total_usd": TOTAIS[1],
+                "valor_total_brl": TOTAIS[2],
+            },
+            "transporte": {"via": "RODOVIARIA"},
+            "situacao": {"registrada_por_cpf": CPF, "veiculos_informados": False},
+        }
+    )
+
+
+def _per_doc_us(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--repeat", type=int, default=2000)
+    args = ap.parse_args()
+
+    parser = BrDtaExtratoParser()
+    rows = []
+    outputs = []
+    for name, build, strict in (
+        ("blocos", build_blocks, False),
+        ("única", build_tree, False),
+        ("estrita", build_tree, True),
+    ):
+        set_strict_models(strict)
+        rows.append((name, _per_doc_us(build, args.repeat)))
+        outputs.append(build().model_dump(**DUMP))
+
+    parses = []
+    for strict in (False, True):
+        set_strict_models(strict)
+        parses.append(
+            (
+                "strict" if strict else "padrão",
+                _per_doc_us(lambda: parser.parse(TEXT), args.repeat),
+                parser.parse(TEXT).model_dump(**DUMP),
+            )
+        )
+    set_strict_models(False)
+
+    print(f"{'montagem':>10}{'µs/doc':>10}")
+    for name, us in rows:
+        print(f"{name:>10}{us:>10.1f}")
+    print(f"{'parse':>10}{'µs/doc':>10}")
+    for name, us, _out in parses:
+        print(f"{name:>10}{us:>10.1f}")
+
+    same = all(o == outputs[0] for o in outputs) and parses[0][2] == parses[1][2]
+    print(f"saída idêntica: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
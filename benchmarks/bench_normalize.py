@@ -0,0 +1,92 @@
+"""
+Benchmark da normalização do texto (uma vez por documento) e do parse sobre ela.
+
+Uso:
+    poetry run python benchmarks/bench_normalize.py [--pages 1 20 200] [--repeat 30]
+
+Para o extrato sintético seguido de N páginas de "Cargas", em duas versões
+do mesmo texto — "limpo" (LF, um espaço) e "sujo" (CRLF, tabs, NBSP,
+espaços nas pontas, rótulos em caixa alta) — mede, por documento:
+  - a normalização sozinha (fold + mapa de offsets);
+  - normalização + classificação + parse extrato + tentativa do parser
+    clássico, todos sobre o mesmo documento normalizado.
+A saída JSON das duas versões deve ser idêntica.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _pdfgen import EXTRATO, cargas_pages  # noqa: E402
+
+from ws_docflow.infra.parsers import normalize  # noqa: E402
+from ws_docflow.infra.parsers.br_dta_extrato_parser import (  # noqa: E402
+    BrDtaExtratoParser,
+)
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser  # noqa: E402
+from ws_docflow.infra.parsers.classifier import LayoutClassifier  # noqa: E402
+
+DUMP = dict(mode="json", exclude_none=True, exclude_unset=True)
+
+
+def _sujo(line: str, i: int) -> str:
+    label, sep, value = line.partition(" : ")
+    if sep:
+        line = f"{label.upper()}\t:\xa0 {value}"
+    return ("  " if i % 2 else "") + line + " \t"
+
+
+def build(pages: int, sujo: bool) -> str:
+    lines = EXTRATO + [line for page in cargas_pages(pages) for line in page]
+    if not sujo:
+        return "\n".join(lines)
+    return "\r\n".join(_sujo(line, i) for i, line in enumerate(lines))
+
+
+def _per_doc_ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat * 1e3
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 20, 200])
+    ap.add_argument("--repeat", type=int, default=30)
+    args = ap.parse_args()
+
+    classifier = LayoutClassifier()
+    extrato, classico = BrDtaExtratoParser(), BrDtaParser()
+
+    def parse(text: str):
+        norm = normalize.NormalizedText(text)
+        classifier.classify(norm)
+        doc = extrato.parse(norm)
+        try:
+            classico.parse(norm)
+        except ValueError:
+            pass
+        return doc
+
+    print(f"{'páginas':>8}{'texto':>8}{'KB':>8}{'normaliza ms':>14}{'parse ms':>10}")
+    same = True
+    for pages in args.pages:
+        outputs = []
+        for sujo in (False, True):
+            text = build(pages, sujo)
+            norm_ms = _per_doc_ms(lambda: normalize.NormalizedText(text), args.repeat)
+            parse_ms = _per_doc_ms(lambda: parse(text), args.repeat)
+            outputs.append(parse(text).model_dump(**DUMP))
+            print(
+                f"{pages:>8}{'sujo' if sujo else 'limpo':>8}{len(text) / 1024:>8.0f}"
+                f"{norm_ms:>14.3f}{parse_ms:>10.3f}"
+            )
+        same = same and outputs[0] == outputs[1]
+    print(f"saída idêntica: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
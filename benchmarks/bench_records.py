@@ -0,0 +1,91 @@
+"""
+Benchmark de memória: DocumentoDados (pydantic) × forma compacta (tuplas).
+
+Uso:
+    poetry run python benchmarks/bench_records.py [--docs 100000]
+
+Faz o parse de `--docs` extratos sintéticos (números/valores distintos,
+entidades de referência repetidas, como num lote real) e mede a memória
+retida (tracemalloc) pelo lote guardado como:
+  - modelos: lista de DocumentoDados;
+  - records: lista de DocumentoRecord (core.domain.records);
+além do custo da conversão (µs/doc) e da ida e volta sem perdas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+
+from ws_docflow.core.domain.records import from_record, to_record
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+
+TEMPLATE = """Dados Gerais
+No. da Declaração : 25/{n:07d}-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte : RODOVIARIA
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Origem
+Unidade Local : {ul:07d} - ALFANDEGA DO PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON RIO GRANDE/RS
+Destino
+Unidade Local : 1010700 - DELEGACIA DA RECEITA FEDERAL EM NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+CNPJ/CPF do Beneficiário : 08.325.{p:03d}/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : {usd},00
+Valor Total do Trânsito na Moeda Nacional : {brl},37
+"""
+
+
+def _retained(build: Callable[[], List]) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, size
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--docs", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.docs
+
+    parser = BrDtaExtratoParser()
+    texts = (
+        TEMPLATE.format(n=i, ul=1017700 + i % 30, p=i % 50, usd=i, brl=i * 5)
+        for i in range(n)
+    )
+    start = time.perf_counter()
+    docs = [parser.parse(t) for t in texts]
+    print(f"parse: {(time.perf_counter() - start) / n * 1e6:.1f} µs/doc ({n} docs)")
+
+    # mesma massa de dados medida nas duas formas (cópia fiel dos modelos)
+    docs, modelos = _retained(lambda: [from_record(to_record(d)) for d in docs])
+    records, compactos = _retained(lambda: [to_record(d) for d in docs])
+    start = time.perf_counter()
+    for d in docs:
+        to_record(d)
+    to_us = (time.perf_counter() - start) / n * 1e6
+    start = time.perf_counter()
+    iguais = all(from_record(r) == d for r, d in zip(records, docs))
+    from_us = (time.perf_counter() - start) / n * 1e6
+
+    print(f"{'forma':>10}{'retido MB':>12}{'bytes/doc':>11}")
+    print(f"{'modelos':>10}{modelos / 2**20:>12.1f}{modelos / n:>11.0f}")
+    print(f"{'records':>10}{compactos / 2**20:>12.1f}{compactos / n:>11.0f}")
+    print(f"to_record: {to_us:.1f} µs/doc")
+    print(f"from_record + comparação: {from_us:.1f} µs/doc")
+    print(f"ida e volta sem perdas: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
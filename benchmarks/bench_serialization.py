@@ -0,0 +1,113 @@
+"""
+Benchmark da serialização do DocumentoDados para a resposta/saída JSON.
+
+Uso:
+    poetry run python benchmarks/bench_serialization.py [--repeat 5000]
+
+Compara, por documento, sobre o extrato sintético (completo e mínimo) e um
+lote de 20 declarações (resposta do parse multi):
+  - antes: model_dump(mode="json", ...) + JSONResponse (API) /
+           json.dumps(..., indent=2, default=str) (CLI);
+  - agora: infra.serialization (serializer compilado → bytes), compacto e
+           `pretty`.
+Confere também se o conteúdo é idêntico ao da serialização antiga.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _pdfgen import EXTRATO  # noqa: E402
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import (  # noqa: E402
+    BrDtaExtratoParser,
+)
+from ws_docflow.infra.serialization import (  # noqa: E402
+    documento_json,
+    documentos_json,
+    lote_json,
+)
+
+DUMP = dict(mode="json", exclude_none=True, exclude_unset=True)
+
+# extrato mínimo: só cabeçalho + Origem/Destino (sem participantes/situação)
+MINIMO = [ln for ln in EXTRATO if "CPF" not in ln and "Nome" not in ln]
+
+
+def _per_call_us(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--repeat", type=int, default=5000)
+    args = ap.parse_args()
+
+    parser = BrDtaExtratoParser()
+    completo = parser.parse("\n".join(EXTRATO))
+    minimo = parser.parse("\n".join(MINIMO))
+    lote = [completo] * 20
+
+    def um(doc):
+        # (resposta da API, saída da CLI) antes × agora
+        return (
+            lambda: doc.model_dump(**DUMP),
+            lambda: doc.model_dump(**DUMP),
+            lambda: documento_json(doc),
+            lambda: documento_json(doc, pretty=True),
+        )
+
+    def varios(docs):
+        return (
+            lambda: {
+                "documentos": [d.model_dump(**DUMP) for d in docs],
+                "total": len(docs),
+            },
+            lambda: [d.model_dump(**DUMP) for d in docs],
+            lambda: lote_json(docs),
+            lambda: documentos_json(docs, pretty=True),
+        )
+
+    casos = {
+        "completo": um(completo),
+        "mínimo": um(minimo),
+        "lote x20": varios(lote),
+    }
+
+    print(
+        f"{'documento':>10}{'API antes':>11}{'agora':>8}{'CLI antes':>11}{'agora':>8}"
+    )
+    iguais = True
+    for name, (api_dict, cli_dict, api_novo, cli_novo) in casos.items():
+        tempos = [
+            _per_call_us(lambda: JSONResponse(content=api_dict()).body, args.repeat),
+            _per_call_us(api_novo, args.repeat),
+            _per_call_us(
+                lambda: json.dumps(
+                    cli_dict(), ensure_ascii=False, indent=2, default=str
+                ),
+                args.repeat,
+            ),
+            _per_call_us(cli_novo, args.repeat),
+        ]
+        iguais &= json.loads(api_novo()) == api_dict()
+        iguais &= json.loads(cli_novo()) == cli_dict()
+        print(
+            f"{name:>10}"
+            + "".join(f"{t:>{w}.1f}" for t, w in zip(tempos, (11, 8, 11, 8)))
+        )
+
+    print("(µs por resposta; CLI = saída indentada)")
+    print(f"conteúdo idêntico: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark do caminho por coordenadas contra o caminho de texto em layout.
+
+Uso:
+    poetry run python benchmarks/bench_words.py caminho/do/corpus [--repeat 3]
+
+Compara, sobre os extratos do corpus (busca recursiva por *.pdf):
+  - texto:    PdfPlumberExtractor.extract_text → BrDtaExtratoParser
+  - palavras: PdfPlumberWordExtractor → BrDtaExtratoLayoutParser
+cada um com e sem parada antecipada, reportando docs/s e a concordância do
+JSON com o caminho de texto completo (referência). PDFs que o parser de texto
+não reconhece como extrato são ignorados.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.core.use_cases.extract_layout_data import ExtractLayoutDataUseCase
+from ws_docflow.infra.parsers.br_dta_extrato_layout_parser import (
+    BrDtaExtratoLayoutParser,
+)
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+from ws_docflow.infra.pdf.word_extractor import PdfPlumberWordExtractor
+
+
+def _use_cases() -> Dict[str, Any]:
+    return {
+        "texto": ExtractDataUseCase(PdfPlumberExtractor(), BrDtaExtratoParser()),
+        "texto+stop": ExtractDataUseCase(
+            PdfPlumberExtractor(), BrDtaExtratoParser(), early_stop=True
+        ),
+        "palavras": ExtractLayoutDataUseCase(
+            PdfPlumberWordExtractor(), BrDtaExtratoLayoutParser()
+        ),
+        "palavras+stop": ExtractLayoutDataUseCase(
+            PdfPlumberWordExtractor(), BrDtaExtratoLayoutParser(), early_stop=True
+        ),
+    }
+
+
+def _run(uc: Any, pdfs: List[Path], repeat: int):
+    results: List[Optional[Dict[str, Any]]] = []
+    start = time.perf_counter()
+    for i in range(repeat):
+        for pdf in pdfs:
+            try:
+                data = uc.run(str(pdf)).model_dump(
+                    mode="json", exclude_none=True, exclude_unset=True
+                )
+            except Exception:
+                data = None
+            if i == 0:
+                results.append(data)
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("corpus", type=Path, help="Diretório com PDFs (busca recursiva)")
+    ap.add_argument("--repeat", type=int, default=1, help="Repetições por documento")
+    args = ap.parse_args()
+
+    pdfs = sorted(args.corpus.rglob("*.pdf"))
+    if not pdfs:
+        raise SystemExit(f"Nenhum PDF encontrado em {args.corpus}")
+
+    use_cases = _use_cases()
+    _elapsed, reference = _run(use_cases["texto"], pdfs, 1)
+    pdfs = [p for p, ref in zip(pdfs, reference) if ref is not None]
+    reference = [ref for ref in reference if ref is not None]
+    if not pdfs:
+        raise SystemExit("Nenhum extrato reconhecido no corpus")
+
+    print(f"Corpus: {len(pdfs)} extratos × {args.repeat} repetição(ões)\n")
+    print(f"{'caminho':<15}{'docs/s':>10}{'ok':>6}{'concord.':>11}")
+    for name, uc in use_cases.items():
+        elapsed, results = _run(uc, pdfs, args.repeat)
+        ok = sum(1 for r in results if r is not None)
+        agree = sum(1 for r, ref in zip(results, reference) if r == ref)
+        docs_s = (len(pdfs) * args.repeat) / elapsed if elapsed else float("inf")
+        print(f"{name:<15}{docs_s:>10.2f}{ok:>6}{agree / len(pdfs):>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ws_docflow.infra.logging import logger as log
+
+
+def _too_large(max_bytes: int) -> str:
+    return f"Corpo do pedido excede o limite de {max_bytes} bytes."
+
+
+class BodySizeLimit:
+    """
+    Limite do corpo dos pedidos HTTP, aplicado antes de qualquer byte ir
+    para buffer: `Content-Length` acima do limite → 413 sem ler o corpo;
+    sem ele (chunked), a leitura é interrompida com 413 assim que o total
+    recebido passa do limite.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: Optional[int] = None) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        max_bytes = self.max_bytes
+        if scope["type"] != "http" or not max_bytes:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > max_bytes:
+            log.warning(f"⚠️ Pedido com {int(length)} bytes recusado (413)")
+            response = JSONResponse({"detail": _too_large(max_bytes)}, 413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # o FastAPI repassa HTTPException levantada na leitura do corpo
+                    raise HTTPException(status_code=413, detail=_too_large(max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
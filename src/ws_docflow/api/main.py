@@ -1,16 +1,46 @@
 from __future__ import annotations
 
 import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from ws_docflow.core.domain.models import set_strict_models
 from ws_docflow.infra.logging import logger as log
+from ws_docflow.infra.parsers.interning import set_intern_limit
+from ws_docflow.infra.settings import get_settings
+from .limits import BodySizeLimit
+from .routes import get_job_runner, get_parse_pool, get_segment_pool, metrics_router
 from .routes import router as api_router  # rotas em arquivo separado
 
+set_strict_models(get_settings().strict_models)
+set_intern_limit(get_settings().intern_entries)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # fila de jobs de uma execução anterior: retoma os pendentes já no startup
+    if Path(get_settings().jobs_db).exists():
+        get_job_runner()
+    yield
+    # encerra o executor do parse (threads/processos) junto com a aplicação
+    get_parse_pool().shutdown(wait=False)
+    if get_segment_pool.cache_info().currsize:
+        get_segment_pool().shutdown(wait=False)
+    if get_job_runner.cache_info().currsize:
+        # o job em andamento termina; os demais ficam na fila para o próximo start
+        get_job_runner().stop(timeout=5)
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="ws-docflow API",
     version="0.1.0",
-    description="🚢 **ws-docflow** — Extração de dados de PDFs aduaneiros (DTA/Extrato)",
+    description=(
+        "🚢 **ws-docflow** — Extração de dados de PDFs aduaneiros (DTA/Extrato)"
+    ),
 )
 
 # CORS (ajuste conforme necessário)
@@ -23,6 +53,13 @@ app.add_middleware(
 )
 
 
+# Limite do corpo dos pedidos (413 antes de bufferizar o excesso)
+_max_body_mb = get_settings().max_body_mb
+app.add_middleware(
+    BodySizeLimit, max_bytes=_max_body_mb * 1024 * 1024 if _max_body_mb else None
+)
+
+
 # Middleware de logs (tempo de resposta)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -41,3 +78,5 @@ async def log_requests(request: Request, call_next):
 
 # monta /api/*
 app.include_router(api_router, prefix="/api")
+# /metrics (Prometheus)
+app.include_router(metrics_router)
@@ -1,21 +1,54 @@
 from __future__ import annotations
 
-import base64
-import os
-import tempfile
-from typing import Optional
+import asyncio
+import zlib
+from functools import lru_cache, partial
+from typing import AsyncIterator, Callable, List, Optional, Sequence, Tuple, cast
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, field_validator, ConfigDict
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_json
 
+from ws_docflow.core.domain.fields import Fields, parse_fields
+from ws_docflow.core.domain.models import set_strict_models
+from ws_docflow.core.errors import (
+    ExtractionLimitError,
+    InvalidFieldsError,
+    OverloadedError,
+    PayloadTooLargeError,
+)
+from ws_docflow.core.ports import SourceT
+from ws_docflow.infra.executor import ParsePool
+from ws_docflow.infra.jobs import (
+    CONCLUIDO,
+    ESTADOS,
+    FALHOU,
+    Job,
+    JobRunner,
+    JobStore,
+    job_json,
+)
 from ws_docflow.infra.logging import logger as log
-from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+from ws_docflow.infra.metrics import StageMetrics, prometheus_lines
+from ws_docflow.infra.pdf.caching_extractor import ExtractionCache
+from ws_docflow.infra.pdf.factory import build_extractor
+from ws_docflow.infra.pdf.sources import is_file_like, picklable_source, source_size
+from ws_docflow.infra.resources import ResourceLimits
+from ws_docflow.infra.serialization import documento_json, lote_json
+from ws_docflow.infra.settings import get_settings
+from ws_docflow.infra.uploads import check_size, decode_base64, spool_copy
 from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
 from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.classifier import LayoutClassifier
+from ws_docflow.infra.parsers.interning import intern_stats, set_intern_limit
+from ws_docflow.infra.parsers.normalize import NormalizedText
+from ws_docflow.infra.parsers.splitter import split_declaracoes
 from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
 
 router = APIRouter(tags=["Parse"])
+# montado na raiz (/metrics), onde o Prometheus procura por padrão
+metrics_router = APIRouter(tags=["Métricas"])
 
 
 # -------- Schemas --------
@@ -29,95 +62,503 @@ class ParseBase64Request(BaseModel):
         }
     )
     filename: Optional[str] = "documento.pdf"
-    content_base64: str  # PDF em base64 (sem data URI)
+    # PDF em base64 (sem data URI); validado na própria decodificação, que é
+    # uma só (ver infra.uploads.decode_base64)
+    content_base64: str
 
-    @field_validator("content_base64")
-    @classmethod
-    def must_be_base64(cls, v: str) -> str:
-        try:
-            base64.b64decode(v, validate=True)
-        except Exception as exc:
-            raise ValueError(f"content_base64 inválido: {exc}")
-        return v
+
+class ParseBatchItem(BaseModel):
+    """Documento do lote base64 (o base64 é validado item a item, no lote)."""
+
+    filename: Optional[str] = None
+    content_base64: str
 
 
 # -------- Core helpers --------
-def _parse_with_single(source: str | bytes, parser) -> dict:
-    extractor = PdfPlumberExtractor()
-    uc = ExtractDataUseCase(extractor, parser)
-    doc = uc.run(source)
-    return doc.model_dump(mode="json", exclude_none=True, exclude_unset=True)
+@lru_cache(maxsize=1)
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Cache de extração compartilhado pelo processo (None se desligado)."""
+    settings = get_settings()
+    if settings.cache_entries <= 0 and not settings.cache_dir:
+        return None
+    return ExtractionCache(
+        max_entries=settings.cache_entries,
+        disk_dir=settings.cache_dir,
+        disk_max_bytes=settings.cache_max_mb * 1024 * 1024,
+    )
+
+
+def _init_parse_worker() -> None:
+    """Estado global do processo, repetido em cada worker do executor."""
+    settings = get_settings()
+    set_strict_models(settings.strict_models)
+    set_intern_limit(settings.intern_entries)
+
+
+@lru_cache(maxsize=1)
+def get_parse_pool() -> ParsePool:
+    """
+    Executor do parse (fora do event loop), limitado pelas configurações.
+    Com executor "process", cache de extração, métricas por etapa e tabelas
+    de interning ficam por processo worker.
+    """
+    settings = get_settings()
+    return ParsePool(
+        settings.parse_workers,
+        settings.parse_queue,
+        kind=settings.parse_executor,
+        retry_after=settings.retry_after,
+        initializer=(
+            _init_parse_worker if settings.parse_executor == "process" else None
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_segment_pool() -> ParsePool:
+    """
+    Processos do parse por declaração (/api/parse-multi), abertos uma vez e
+    compartilhados pelos pedidos (o `executor` dele vai a `run_many`).
+    """
+    settings = get_settings()
+    return ParsePool(
+        settings.pdf_workers, 0, kind="process", initializer=_init_parse_worker
+    )
 
 
-def _parse_with_uc(source: str | bytes) -> dict:
+@lru_cache(maxsize=1)
+def get_job_runner() -> JobRunner:
     """
-    Tenta sequencialmente os parsers:
+    Fila de jobs (arquivo SQLite) + workers, iniciados no 1º uso (ou no
+    startup da API, se o arquivo já existe: retoma os jobs pendentes).
+    """
+    settings = get_settings()
+    runner = JobRunner(
+        JobStore(settings.jobs_db, ttl=settings.job_ttl, lease=settings.job_lease),
+        _parse_with_uc,
+        workers=settings.job_workers,
+    )
+    runner.start()
+    return runner
+
+
+@lru_cache(maxsize=1)
+def get_stage_metrics() -> StageMetrics:
+    """Durações por etapa (extract/classify/parse) acumuladas pelo processo."""
+    return StageMetrics()
+
+
+def _build_use_case(parsers: Sequence, fields: Fields = None) -> ExtractDataUseCase:
+    """Extrator + use case conforme as configurações do processo."""
+    settings = get_settings()
+    extractor = build_extractor(
+        settings.pdf_backend,
+        parsers,
+        workers=settings.pdf_workers,
+        parallel_min_pages=settings.parallel_min_pages,
+        cache=get_extraction_cache(),
+        ocr=settings.ocr,
+        ocr_lang=settings.ocr_lang,
+        ocr_workers=settings.ocr_workers,
+        ocr_page_timeout=settings.ocr_page_timeout,
+        memory_bounded=settings.memory_bounded,
+        limits=ResourceLimits.from_mb(
+            settings.page_limit, settings.max_rss_mb, settings.retry_after
+        ),
+        metrics=get_stage_metrics(),
+    )
+    return ExtractDataUseCase(
+        extractor,
+        list(parsers),
+        early_stop=settings.early_stop,
+        max_pages=settings.max_pages,
+        classifier=LayoutClassifier() if settings.classify else None,
+        min_confidence=settings.classify_min_confidence,
+        metrics=get_stage_metrics(),
+        fields=fields,
+        normalizer=NormalizedText,
+    )
+
+
+def _parse_with_uc(source: SourceT, fields: Fields = None) -> bytes:
+    """
+    Extrai o texto uma única vez, classifica o layout e despacha direto ao
+    parser dele; com confiança baixa, tenta os parsers em ordem:
       1) BrDtaExtratoParser (extrato)
       2) BrDtaParser        (DTA comum)
-    Cai para o próximo parser se o atual não casar.
+    Cai para o próximo parser se o atual não casar (ExtractDataUseCase).
+    Com `fields`, só as seções pedidas são calculadas e devolvidas.
     """
-    last_err: Exception | None = None
-    for parser_cls in (BrDtaExtratoParser, BrDtaParser):
+    _record_input(source)
+    uc = _build_use_case([BrDtaExtratoParser(), BrDtaParser()], fields)
+    doc = uc.run(source)
+    with get_stage_metrics().timed("serialize"):
+        return documento_json(doc, fields=fields)
+
+
+def _record_input(source: SourceT) -> None:
+    size = source_size(source)
+    if size is not None:
+        get_stage_metrics().record("input_bytes", size)
+
+
+# bytes iniciais olhados para validar o cabeçalho %PDF
+_HEADER_PEEK = 1024
+
+
+def _peek_header(source: SourceT) -> bytes:
+    if is_file_like(source):
+        source.seek(0)  # type: ignore[union-attr]
+        head = source.read(_HEADER_PEEK)  # type: ignore[union-attr]
+        source.seek(0)  # type: ignore[union-attr]
+        return head
+    return bytes(memoryview(source)[:_HEADER_PEEK])  # type: ignore[arg-type]
+
+
+def _max_pdf_bytes() -> Optional[int]:
+    max_pdf_mb = get_settings().max_pdf_mb
+    return max_pdf_mb * 1024 * 1024 if max_pdf_mb else None
+
+
+def _decode_pdf_base64(content: str):
+    """base64 → buffer (uma decodificação); inválido → HTTP 422."""
+    try:
+        return decode_base64(content, _max_pdf_bytes())
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"content_base64 inválido: {exc}")
+
+
+def _check_header(source: SourceT) -> None:
+    head = _peek_header(source)
+    if not head:
+        raise HTTPException(status_code=400, detail="Arquivo vazio.")
+    if not head.lstrip().startswith(b"%PDF"):
+        raise HTTPException(
+            status_code=415, detail="Conteúdo não parece ser um PDF válido."
+        )
+
+
+def _parse_multi(source: SourceT, fields: Fields = None) -> bytes:
+    """PDF com várias declarações concatenadas → uma entrada por declaração."""
+    _record_input(source)
+    uc = _build_use_case([BrDtaExtratoParser(), BrDtaParser()], fields)
+    workers = get_settings().pdf_workers
+    if workers <= 1 or get_parse_pool().kind == "process":
+        # o pedido já ocupa um processo do pool de parse: trechos em série
+        docs = uc.run_many(source, split_declaracoes)
+    else:
+        executor = get_segment_pool().executor
+        docs = uc.run_many(source, split_declaracoes, workers, executor=executor)
+    with get_stage_metrics().timed("serialize"):
+        return lote_json(docs, fields)
+
+
+async def _run_parse(
+    source: SourceT,
+    parse: Callable[[SourceT, Fields], bytes] = _parse_with_uc,
+    fields: Fields = None,
+) -> Response:
+    """
+    Valida o cabeçalho e faz o parse direto da fonte: bytes do base64 ou o
+    arquivo temporário do próprio upload (sem cópia em memória nem em disco).
+    Extração e parse rodam no ParsePool, fora do event loop; sem vaga, o
+    pedido é recusado na hora (OverloadedError). O JSON já sai pronto do
+    serializer do modelo (sem passar por dicts).
+    """
+    _check_header(source)
+    pool = get_parse_pool()
+    if pool.kind == "process":
+        # o arquivo temporário do upload não atravessa processos
+        source = picklable_source(source)
+    content = await pool.run(parse, source, fields)
+    return Response(content=content, media_type="application/json")
+
+
+def _overloaded(exc: OverloadedError) -> HTTPException:
+    log.warning(f"⏳ Parse recusado (pool lotado): {exc}")
+    return HTTPException(
+        status_code=503,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# -------- Lote (NDJSON) --------
+# Cada documento do lote vira uma linha assim que termina (ordem de
+# conclusão), com o índice de entrada e o nome do arquivo:
+#   {"indice": 0, "arquivo": "a.pdf", "documento": {...}}
+#   {"indice": 1, "arquivo": "b.pdf", "status": 415, "erro": "..."}
+# O erro de um documento vira a linha dele; o lote segue. O lote ocupa no
+# máximo `workers` vagas do ParsePool por vez e, com o pool lotado por outros
+# pedidos, espera vaga (o 503 só vale antes de começar o lote).
+
+_PDF_CONTENT_TYPES = ("application/pdf", "application/octet-stream")
+
+# (nome do arquivo, carrega a fonte: buffer do PDF, HTTPException ou
+# PayloadTooLargeError)
+BatchItem = Tuple[Optional[str], Callable[[], SourceT]]
+
+
+def _pdf_upload(
+    content_type: Optional[str], size: Optional[int], source: Optional[SourceT]
+) -> SourceT:
+    if content_type not in _PDF_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415, detail="Envie um arquivo PDF válido (application/pdf)."
+        )
+    check_size(size, _max_pdf_bytes())
+    # passou nos mesmos testes que decidiram a cópia no pedido: não é None
+    return cast(SourceT, source)
+
+
+async def _parse_waiting(source: SourceT, fields: Fields) -> bytes:
+    """Parse de um item do lote no pool; lotado, espera vaga em vez de falhar."""
+    pool = get_parse_pool()
+    if pool.kind == "process":
+        # como em _run_parse: o buffer do upload (em disco acima de 1 MB) não
+        # atravessa processos
+        source = picklable_source(source)
+    return await pool.run_waiting(_parse_with_uc, source, fields)
+
+
+async def _batch_line(
+    index: int, item: BatchItem, fields: Fields, slots: asyncio.Semaphore
+) -> bytes:
+    filename, load = item
+    tag = b'"indice":%d,"arquivo":%s' % (index, to_json(filename))
+    async with slots:
+        source = None
         try:
-            return _parse_with_single(source, parser_cls())
+            source = load()
+            _check_header(source)
+            content = await _parse_waiting(source, fields)
+        except HTTPException as exc:
+            status, erro = exc.status_code, exc.detail
+        except OverloadedError as exc:
+            status, erro = 503, str(exc)
+        except (ExtractionLimitError, PayloadTooLargeError) as exc:
+            status, erro = 413, str(exc)
         except Exception as exc:
-            last_err = exc
-            continue
-    raise (
-        last_err
-        if last_err
-        else HTTPException(status_code=422, detail="Falha ao processar PDF.")
-    )
+            log.warning(f"⚠️ Falha no item {index} do lote ({filename}): {exc}")
+            status, erro = 422, f"Falha ao processar PDF: {exc}"
+        else:
+            return b'{%s,"documento":%s}\n' % (tag, content)
+        finally:
+            if is_file_like(source):
+                source.close()  # type: ignore[union-attr]
+    return b'{%s,"status":%d,"erro":%s}\n' % (tag, status, to_json(erro))
 
 
-def _run_parse_from_bytes(pdf_bytes: bytes) -> dict:
-    if not pdf_bytes:
-        raise HTTPException(status_code=400, detail="Arquivo vazio.")
-    if not pdf_bytes.startswith(b"%PDF"):
-        if not pdf_bytes.lstrip().startswith(b"%PDF"):
-            raise HTTPException(
-                status_code=415, detail="Conteúdo não parece ser um PDF válido."
+async def _batch_lines(items: List[BatchItem], fields: Fields) -> AsyncIterator[bytes]:
+    slots = asyncio.Semaphore(get_parse_pool().workers)
+    tasks = [
+        asyncio.ensure_future(_batch_line(i, item, fields, slots))
+        for i, item in enumerate(items)
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        # cliente desconectou: os itens que ainda nem começaram são descartados
+        for task in tasks:
+            task.cancel()
+
+
+async def _gzipped(lines: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """gzip em fluxo: cada linha sai comprimida assim que fica pronta."""
+    gz = zlib.compressobj(wbits=31)
+    async for line in lines:
+        yield gz.compress(line) + gz.flush(zlib.Z_SYNC_FLUSH)
+    yield gz.flush()
+
+
+def _batch_response(
+    items: List[BatchItem], fields: Fields, gzip: bool
+) -> StreamingResponse:
+    if not items:
+        raise HTTPException(status_code=400, detail="Lote vazio.")
+    if get_parse_pool().saturated:
+        raise _overloaded(
+            OverloadedError(
+                "Servidor ocupado: sem vaga para iniciar o lote.",
+                retry_after=get_parse_pool().retry_after,
             )
+        )
+    log.info(f"📦 Lote com {len(items)} documento(s)")
+    lines = _batch_lines(items, fields)
+    if not gzip:
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    return StreamingResponse(
+        _gzipped(lines),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "gzip"},
+    )
 
-    # 1) Tenta abrir direto por bytes (se extractor aceitar bytes)
-    try:
-        return _parse_with_uc(pdf_bytes)
-    except TypeError:
-        pass
 
-    # 2) Fallback Windows-safe: temp file delete=False + cleanup
-    tmp_path: str | None = None
+def _selected_fields(spec: Optional[str]) -> Fields:
+    """`?fields=` → seleção validada; caminho desconhecido → HTTP 400."""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            tmp.write(pdf_bytes)
-            tmp_path = tmp.name
-        return _parse_with_uc(tmp_path)
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
+        return parse_fields(spec)
+    except InvalidFieldsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# ex.: ?fields=declaracao.numero,situacao_atual,destino
+_FIELDS_QUERY = Query(
+    None,
+    description=(
+        "Seções/campos a devolver, separados por vírgula "
+        "(ex.: declaracao.numero,destino); as demais nem são calculadas"
+    ),
+)
+
+
+_GZIP_QUERY = Query(False, description="Resposta comprimida (Content-Encoding: gzip)")
 
 
 # -------- Endpoints --------
+@router.get("/cache/stats", summary="Estatísticas do cache de extração")
+def cache_stats():
+    cache = get_extraction_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/stats/stages", summary="Tempo por etapa (extração/classificação/parse)")
+def stage_stats():
+    return get_stage_metrics().stats()
+
+
+def _ratio(hits: float, misses: float) -> float:
+    lookups = hits + misses
+    return round(hits / lookups, 4) if lookups else 0.0
+
+
+def _prometheus_extras() -> List[str]:
+    """Caches, executor e jobs (estado já mantido por cada um) → Prometheus."""
+    lines: List[str] = []
+    cache = get_extraction_cache()
+    if cache is not None:
+        hits = cache.memory_hits + cache.disk_hits
+        lines += prometheus_lines(
+            "ws_docflow_extraction_cache_lookups_total",
+            "counter",
+            "Consultas ao cache de extração por resultado.",
+            [
+                ({"result": "memory_hit"}, cache.memory_hits),
+                ({"result": "disk_hit"}, cache.disk_hits),
+                ({"result": "miss"}, cache.misses),
+            ],
+        )
+        lines += prometheus_lines(
+            "ws_docflow_extraction_cache_hit_ratio",
+            "gauge",
+            "Fração das consultas ao cache de extração que acertaram.",
+            [({}, _ratio(hits, cache.misses))],
+        )
+
+    tables = intern_stats()
+    lines += prometheus_lines(
+        "ws_docflow_intern_lookups_total",
+        "counter",
+        "Consultas às tabelas de entidades compartilhadas por resultado.",
+        [
+            ({"table": table, "result": result}, st[key])
+            for table, st in tables.items()
+            for result, key in (("hit", "hits"), ("miss", "misses"))
+        ],
+    )
+    lines += prometheus_lines(
+        "ws_docflow_intern_hit_ratio",
+        "gauge",
+        "Fração das consultas a cada tabela de entidades que acertaram.",
+        [
+            ({"table": table}, _ratio(st["hits"], st["misses"]))
+            for table, st in tables.items()
+        ],
+    )
+
+    pool = get_parse_pool().stats()
+    lines += prometheus_lines(
+        "ws_docflow_parse_pool_tasks",
+        "gauge",
+        "Parses no executor agora: rodando (in_flight) e na fila (queued).",
+        [({"state": state}, pool[state]) for state in ("in_flight", "queued")],
+    )
+    lines += prometheus_lines(
+        "ws_docflow_parse_pool_tasks_total",
+        "counter",
+        "Parses encerrados no executor por resultado.",
+        [
+            ({"result": result}, pool[result])
+            for result in ("completed", "failed", "rejected")
+        ],
+    )
+
+    if get_job_runner.cache_info().currsize:
+        lines += prometheus_lines(
+            "ws_docflow_jobs",
+            "gauge",
+            "Jobs assíncronos na tabela, por estado.",
+            [({"estado": k}, v) for k, v in get_job_runner().store.stats().items()],
+        )
+    return lines
+
+
+@metrics_router.get(
+    "/metrics",
+    summary="Métricas no formato Prometheus",
+    response_class=PlainTextResponse,
+)
+def prometheus_metrics():
+    body = get_stage_metrics().prometheus()
+    body += "".join(f"{line}\n" for line in _prometheus_extras())
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/stats/interning", summary="Entidades de referência compartilhadas")
+def interning_stats():
+    return intern_stats()
+
+
+@router.get("/stats/pool", summary="Executor do parse: em andamento, fila, recusas")
+def pool_stats():
+    return get_parse_pool().stats()
+
+
+@router.get("/stats/jobs", summary="Jobs por estado")
+def jobs_stats():
+    if not get_job_runner.cache_info().currsize:
+        # fila ainda não iniciada: nada a contar (nem workers nem SQLite a criar)
+        return {estado: 0 for estado in ESTADOS}
+    return get_job_runner().store.stats()
+
+
 @router.post(
     "/parse",
     summary="Parse de PDF (multipart/form-data)",
     responses={200: {"description": "Extração OK ✅"}},
 )
-async def parse_pdf(file: UploadFile = File(...)):
-    if file.content_type not in ("application/pdf", "application/octet-stream"):
+async def parse_pdf(
+    file: UploadFile = File(...), fields: Optional[str] = _FIELDS_QUERY
+):
+    selected = _selected_fields(fields)
+    if file.content_type not in _PDF_CONTENT_TYPES:
         log.warning(f"⚠️ Content-Type inválido: {file.content_type}")
         raise HTTPException(
             status_code=415, detail="Envie um arquivo PDF válido (application/pdf)."
         )
     try:
-        content = await file.read()
-        data = _run_parse_from_bytes(content)
-        return JSONResponse(content=data)
+        check_size(file.size, _max_pdf_bytes())
+        return await _run_parse(file.file, fields=selected)
     except HTTPException:
         raise
+    except OverloadedError as exc:
+        raise _overloaded(exc)
+    except (ExtractionLimitError, PayloadTooLargeError) as exc:
+        log.warning(f"⚠️ Limite excedido: {exc}")
+        raise HTTPException(status_code=413, detail=str(exc))
     except Exception as exc:
         log.exception(f"❌ Erro no parse multipart: {exc}")
         raise HTTPException(status_code=422, detail=f"Falha ao processar PDF: {exc}")
@@ -128,15 +569,166 @@ async def parse_pdf(file: UploadFile = File(...)):
     summary="Parse de PDF (JSON base64)",
     responses={200: {"description": "Extração OK ✅"}},
 )
-def parse_pdf_base64(payload: ParseBase64Request):
+async def parse_pdf_base64(
+    payload: ParseBase64Request, fields: Optional[str] = _FIELDS_QUERY
+):
+    selected = _selected_fields(fields)
+    pdf = None
     try:
-        pdf_bytes = base64.b64decode(payload.content_base64, validate=True)
-        data = _run_parse_from_bytes(pdf_bytes)
-        return JSONResponse(content=data)
+        pdf = _decode_pdf_base64(payload.content_base64)
+        return await _run_parse(pdf, fields=selected)
     except HTTPException:
         raise
+    except OverloadedError as exc:
+        raise _overloaded(exc)
+    except (ExtractionLimitError, PayloadTooLargeError) as exc:
+        log.warning(f"⚠️ Limite excedido: {exc}")
+        raise HTTPException(status_code=413, detail=str(exc))
     except Exception as exc:
         log.exception(f"❌ Erro no parse base64: {exc}")
         raise HTTPException(
             status_code=422, detail=f"Falha ao processar PDF (base64): {exc}"
         )
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+@router.post(
+    "/parse-multi",
+    summary="Parse de PDF com várias declarações (multipart/form-data)",
+    responses={200: {"description": "Extração OK ✅ → {documentos: [...], total: n}"}},
+)
+async def parse_pdf_multi(
+    file: UploadFile = File(...), fields: Optional[str] = _FIELDS_QUERY
+):
+    selected = _selected_fields(fields)
+    if file.content_type not in _PDF_CONTENT_TYPES:
+        log.warning(f"⚠️ Content-Type inválido: {file.content_type}")
+        raise HTTPException(
+            status_code=415, detail="Envie um arquivo PDF válido (application/pdf)."
+        )
+    try:
+        check_size(file.size, _max_pdf_bytes())
+        return await _run_parse(file.file, parse=_parse_multi, fields=selected)
+    except HTTPException:
+        raise
+    except OverloadedError as exc:
+        raise _overloaded(exc)
+    except (ExtractionLimitError, PayloadTooLargeError) as exc:
+        log.warning(f"⚠️ Limite excedido: {exc}")
+        raise HTTPException(status_code=413, detail=str(exc))
+    except Exception as exc:
+        log.exception(f"❌ Erro no parse multi: {exc}")
+        raise HTTPException(status_code=422, detail=f"Falha ao processar PDF: {exc}")
+
+
+@router.post(
+    "/parse-batch",
+    summary="Parse de vários PDFs (multipart/form-data) → NDJSON",
+    responses={200: {"description": "Uma linha JSON por PDF, na ordem de conclusão"}},
+)
+async def parse_pdf_batch(
+    files: List[UploadFile] = File(...),
+    fields: Optional[str] = _FIELDS_QUERY,
+    gzip: bool = _GZIP_QUERY,
+):
+    selected = _selected_fields(fields)
+    items: List[BatchItem] = []
+    max_pdf = _max_pdf_bytes()
+    for file in files:
+        # os uploads são fechados antes do streaming da resposta: cada PDF
+        # aceitável é copiado (em blocos) para um buffer próprio do lote
+        source = None
+        if file.content_type in _PDF_CONTENT_TYPES and (
+            max_pdf is None or (file.size or 0) <= max_pdf
+        ):
+            source = await asyncio.to_thread(spool_copy, file.file)
+        load = partial(_pdf_upload, file.content_type, file.size, source)
+        items.append((file.filename, load))
+    return _batch_response(items, selected, gzip)
+
+
+@router.post(
+    "/parse-batch-b64",
+    summary="Parse de vários PDFs (JSON: lista de base64) → NDJSON",
+    responses={200: {"description": "Uma linha JSON por PDF, na ordem de conclusão"}},
+)
+async def parse_pdf_batch_base64(
+    payload: List[ParseBatchItem],
+    fields: Optional[str] = _FIELDS_QUERY,
+    gzip: bool = _GZIP_QUERY,
+):
+    selected = _selected_fields(fields)
+    items: List[BatchItem] = [
+        (doc.filename, partial(_decode_pdf_base64, doc.content_base64))
+        for doc in payload
+    ]
+    return _batch_response(items, selected, gzip)
+
+
+@router.post(
+    "/jobs",
+    summary="Enfileira o parse de um PDF (multipart/form-data) → id do job",
+    status_code=202,
+    responses={202: {"description": "Job na fila ✅ (acompanhe em /api/jobs/{id})"}},
+)
+async def submit_job(
+    file: UploadFile = File(...), fields: Optional[str] = _FIELDS_QUERY
+):
+    _selected_fields(fields)  # seleção inválida falha já, não no worker
+    if file.content_type not in _PDF_CONTENT_TYPES:
+        log.warning(f"⚠️ Content-Type inválido: {file.content_type}")
+        raise HTTPException(
+            status_code=415, detail="Envie um arquivo PDF válido (application/pdf)."
+        )
+    try:
+        check_size(file.size, _max_pdf_bytes())
+        # em blocos para um buffer próprio (limite checado a cada bloco) e
+        # dele, em blocos, para a tabela de jobs: o PDF nunca fica inteiro
+        # na memória
+        pdf = await asyncio.to_thread(spool_copy, file.file, _max_pdf_bytes())
+    except PayloadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    with pdf:
+        _check_header(pdf)
+        job = await asyncio.to_thread(
+            get_job_runner().submit, pdf, file.filename, fields or None
+        )
+    return Response(
+        content=job_json(job),
+        status_code=202,
+        media_type="application/json",
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+
+def _get_job(job_id: str) -> Job:
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"Job '{job_id}' não encontrado (ou expirado)."
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}", summary="Estado do job (e o documento, se concluído)")
+def job_status(job_id: str):
+    return Response(content=job_json(_get_job(job_id)), media_type="application/json")
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    summary="Só o documento do job concluído (mesmo JSON de /api/parse)",
+)
+def job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.estado == CONCLUIDO:
+        return Response(content=job.documento, media_type="application/json")
+    if job.estado == FALHOU:
+        raise HTTPException(status_code=job.status or 422, detail=job.erro)
+    raise HTTPException(
+        status_code=409,
+        detail=f"Job ainda não terminou (estado: {job.estado}).",
+        headers={"Retry-After": str(get_settings().retry_after)},
+    )
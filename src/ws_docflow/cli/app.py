@@ -1,14 +1,39 @@
 # src/ws_docflow/cli/app.py
 from __future__ import annotations
 
-import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List, Optional
+
 import typer
+from pydantic_core import to_json
 
-from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+from ws_docflow.core.domain.fields import parse_fields
+from ws_docflow.core.domain.models import set_strict_models
+from ws_docflow.core.domain.records import DocumentoRecord, resumo
+from ws_docflow.core.errors import InvalidFieldsError
+from ws_docflow.infra.metrics import StageMetrics
+from ws_docflow.infra.pdf.caching_extractor import ExtractionCache
+from ws_docflow.infra.pdf.factory import BACKENDS, build_extractor
+from ws_docflow.infra.pdf.word_extractor import PdfPlumberWordExtractor
+from ws_docflow.infra.resources import ResourceLimits
+from ws_docflow.infra.serialization import (
+    documento_json,
+    documentos_json,
+    record_json,
+)
 from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
 from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.classifier import LayoutClassifier
+from ws_docflow.infra.parsers.normalize import NormalizedText
+from ws_docflow.infra.parsers.splitter import split_declaracoes
+from ws_docflow.infra.parsers.br_dta_extrato_layout_parser import (
+    BrDtaExtratoLayoutParser,
+)
 from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.core.use_cases.extract_layout_data import ExtractLayoutDataUseCase
 
 # --- Logger (Rich) -----------------------------------------------------------
 try:
@@ -75,31 +100,169 @@ def parse_cmd(
     quiet: bool = typer.Option(
         False, "--quiet", "-q", help="Reduz verbosidade (WARNING)"
     ),
+    backend: str = typer.Option(
+        "pdfplumber",
+        "--backend",
+        "-b",
+        help=f"Backend de extração ({' | '.join(BACKENDS)})",
+    ),
+    early_stop: bool = typer.Option(
+        False,
+        "--early-stop",
+        help=(
+            "Para de ler páginas quando os blocos exigidos pelos parsers "
+            "já apareceram"
+        ),
+    ),
+    max_pages: Optional[int] = typer.Option(
+        None, "--max-pages", min=1, help="Máximo de páginas lidas do PDF"
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Processos p/ extrair páginas (e declarações, com --multi) em paralelo",
+    ),
+    parallel_min_pages: int = typer.Option(
+        16,
+        "--parallel-min-pages",
+        min=1,
+        help="Nº mínimo de páginas para usar o modo paralelo",
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None,
+        "--cache-dir",
+        help="Diretório do cache de extração em disco (compartilhado com a API)",
+    ),
+    multi: bool = typer.Option(
+        False,
+        "--multi",
+        help="PDF com várias declarações concatenadas: imprime uma lista JSON",
+    ),
+    words: bool = typer.Option(
+        False,
+        "--words",
+        help=(
+            "Extrato por coordenadas (palavras posicionadas); "
+            "cai para o texto se não casar"
+        ),
+    ),
+    memory_bounded: bool = typer.Option(
+        False,
+        "--memory-bounded",
+        help="Libera o layout de cada página logo após extrair o texto",
+    ),
+    page_limit: Optional[int] = typer.Option(
+        None, "--page-limit", min=1, help="Aborta se o PDF tiver mais páginas que isso"
+    ),
+    max_rss_mb: Optional[int] = typer.Option(
+        None, "--max-rss-mb", min=1, help="Aborta se a memória (RSS) passar disso (MB)"
+    ),
+    ocr: bool = typer.Option(
+        False, "--ocr", help="OCR (Tesseract) nas páginas sem camada de texto"
+    ),
+    ocr_lang: str = typer.Option("por", "--ocr-lang", help="Idioma(s) do Tesseract"),
+    ocr_workers: int = typer.Option(
+        2, "--ocr-workers", min=1, help="Processos dedicados ao OCR"
+    ),
+    ocr_page_timeout: float = typer.Option(
+        60.0, "--ocr-page-timeout", min=1, help="Tempo máximo de OCR por página (s)"
+    ),
+    classify: bool = typer.Option(
+        True,
+        "--classify/--no-classify",
+        help="Classifica o layout e despacha direto ao parser dele",
+    ),
+    strict_models: bool = typer.Option(
+        False,
+        "--strict-models",
+        help="Valida a saída dos parsers em modo strict (sem coerção de tipos)",
+    ),
+    pretty: bool = typer.Option(
+        False, "--pretty", help="JSON indentado (padrão: compacto, uma linha)"
+    ),
+    fields: Optional[str] = typer.Option(
+        None,
+        "--fields",
+        help="Só estas seções/campos, separados por vírgula "
+        "(ex.: declaracao.numero,destino); as demais nem são calculadas",
+    ),
 ):
     """
-    Lê o PDF, extrai texto com pdfplumber e tenta múltiplos parsers em fallback:
+    Lê o PDF, extrai texto (pdfplumber por padrão) e tenta múltiplos parsers
+    em fallback:
       1) Extrato: layout 'Dados Gerais / Via de Transporte/Situação'
       2) Clássico: layout 'Trânsito Aduaneiro - Extrato da Declaração de Trânsito'
-    Imprime JSON (sem campos None/vazios).
+    Imprime JSON compacto (sem campos None/vazios); `--pretty` indenta.
     """
     _set_level(verbose, quiet)
+    try:
+        selected = parse_fields(fields)
+    except InvalidFieldsError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--fields")
 
     try:
         log.info("[bold cyan]🚀 ws-docflow[/] iniciando parse")
         log.debug(f"Arquivo de entrada: {pdf_path}")
 
-        extractor = PdfPlumberExtractor()
+        set_strict_models(strict_models)
         parsers = [BrDtaExtratoParser(), BrDtaParser()]  # ordem importa!
-        uc = ExtractDataUseCase(extractor, parsers)
+        extractor = build_extractor(
+            backend,
+            parsers,
+            workers=workers,
+            parallel_min_pages=parallel_min_pages,
+            cache=(
+                ExtractionCache(max_entries=0, disk_dir=cache_dir)
+                if cache_dir
+                else None
+            ),
+            ocr=ocr,
+            ocr_lang=ocr_lang,
+            ocr_workers=ocr_workers,
+            ocr_page_timeout=ocr_page_timeout,
+            memory_bounded=memory_bounded,
+            limits=ResourceLimits.from_mb(page_limit, max_rss_mb),
+        )
+        metrics = StageMetrics()
+        uc = ExtractDataUseCase(
+            extractor,
+            parsers,
+            early_stop=early_stop,
+            max_pages=max_pages,
+            classifier=LayoutClassifier() if classify else None,
+            metrics=metrics,
+            fields=selected,
+            normalizer=NormalizedText,
+        )
 
-        doc = uc.run(pdf_path)
+        if multi:
+            docs = uc.run_many(pdf_path, split_declaracoes, workers=workers)
+            log.info(f"[green]✅[/] {len(docs)} declaração(ões) extraída(s)")
+            log.debug(f"⏱️ Tempo por etapa: {metrics.stats()}")
+            typer.echo(documentos_json(docs, pretty=pretty, fields=selected))
+            return
 
-        # serialização “limpa”: sem None/unset
-        data = doc.model_dump(mode="json", exclude_none=True, exclude_unset=True)
+        doc = None
+        if words:
+            layout_uc = ExtractLayoutDataUseCase(
+                PdfPlumberWordExtractor(),
+                BrDtaExtratoLayoutParser(),
+                early_stop=early_stop,
+                max_pages=max_pages,
+            )
+            try:
+                doc = layout_uc.run(pdf_path)
+            except ValueError as exc:
+                log.debug(f"Caminho por palavras não casou ({exc}); usando texto")
+        if doc is None:
+            doc = uc.run(pdf_path)
 
         log.info("[green]✅[/] Extração concluída com sucesso")
-        # garante floats/Decimal serializáveis no json.dumps
-        typer.echo(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+        log.debug(f"⏱️ Tempo por etapa: {metrics.stats()}")
+        # serialização “limpa” (sem None/unset), direto do modelo para JSON
+        typer.echo(documento_json(doc, pretty=pretty, fields=selected))
 
     except Exception as exc:
         # erro “legível” para o usuário, mantendo exit code != 0
@@ -117,5 +280,117 @@ def parse_cmd(
         raise typer.Exit(code=1)
 
 
+@app.command("parse-batch")
+def parse_batch_cmd(
+    directory: str = typer.Argument(
+        ..., help="Diretório com os PDFs (busca recursiva por *.pdf)"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Aumenta verbosidade (DEBUG)"
+    ),
+    quiet: bool = typer.Option(
+        False, "--quiet", "-q", help="Reduz verbosidade (WARNING)"
+    ),
+    backend: str = typer.Option(
+        "pdfplumber",
+        "--backend",
+        "-b",
+        help=f"Backend de extração ({' | '.join(BACKENDS)})",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Processos p/ o parse das declarações de cada PDF",
+    ),
+    classify: bool = typer.Option(
+        True,
+        "--classify/--no-classify",
+        help="Classifica o layout e despacha direto ao parser dele",
+    ),
+    fields: Optional[str] = typer.Option(
+        None,
+        "--fields",
+        help="Só estas seções/campos, separados por vírgula "
+        "(ex.: declaracao.numero,destino); as demais nem são calculadas",
+    ),
+    summary: bool = typer.Option(
+        False,
+        "--summary",
+        help="Em vez de uma linha por declaração, só o agregado do lote (JSON)",
+    ),
+):
+    """
+    Faz o parse de todos os PDFs do diretório (cada um pode ter várias
+    declarações concatenadas) e imprime NDJSON, uma linha por declaração:
+    {"arquivo": ..., "documento": {...}}. PDF que falha vira uma linha
+    {"arquivo": ..., "erro": ...} sem interromper o lote (exit code 1 no fim).
+    Os resultados ficam na forma compacta (core.domain.records); `--summary`
+    agrega o lote inteiro a partir dela.
+    """
+    _set_level(verbose, quiet)
+    try:
+        selected = parse_fields(fields)
+    except InvalidFieldsError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--fields")
+
+    pdfs = sorted(Path(directory).rglob("*.pdf"))
+    if not pdfs:
+        typer.secho(
+            f"❌ [ws-docflow] Nenhum PDF em '{directory}'",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+    parsers = [BrDtaExtratoParser(), BrDtaParser()]  # ordem importa!
+    uc = ExtractDataUseCase(
+        build_extractor(backend, parsers),
+        parsers,
+        classifier=LayoutClassifier() if classify else None,
+        fields=selected,
+        normalizer=NormalizedText,
+    )
+
+    records: List[DocumentoRecord] = []
+    erros = 0
+    # um pool para o lote inteiro, não um por PDF
+    pool = ProcessPoolExecutor(workers) if workers > 1 else nullcontext()
+    with pool as executor:
+        for pdf in pdfs:
+            arquivo = to_json(str(pdf))
+            try:
+                found = uc.run_many(
+                    str(pdf),
+                    split_declaracoes,
+                    workers,
+                    records=True,
+                    executor=executor,
+                )
+            except Exception as exc:
+                erros += 1
+                log.warning(f"⚠️ Falha ao processar '{pdf}': {exc}")
+                if not summary:
+                    typer.echo(
+                        b'{"arquivo":%s,"erro":%s}' % (arquivo, to_json(str(exc)))
+                    )
+                continue
+            if summary:
+                records.extend(found)
+                continue
+            for rec in found:
+                typer.echo(
+                    b'{"arquivo":%s,"documento":%s}'
+                    % (arquivo, record_json(rec, fields=selected))
+                )
+
+    log.info(f"[green]✅[/] {len(pdfs) - erros}/{len(pdfs)} PDF(s) processado(s)")
+    if summary:
+        typer.echo(to_json({**resumo(records), "erros": erros}))
+    if erros:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
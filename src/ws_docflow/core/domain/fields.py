@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import typing
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Type, Union
+
+from pydantic import BaseModel
+
+from ws_docflow.core.domain.models import DocumentoDados
+from ws_docflow.core.errors import InvalidFieldsError
+
+# ---------------------------------
+# Projeção de campos (`?fields=` / `--fields`)
+# ---------------------------------
+# Caminhos pontuados a partir do DocumentoDados: "destino",
+# "declaracao.numero", "origem.unidade_local.codigo"... None = documento
+# inteiro. Os parsers consultam `wants()` para não calcular as seções
+# que ninguém pediu; a saída é recortada com `include_of()`.
+
+Fields = Optional[FrozenSet[str]]
+
+
+def _submodel(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Modelo aninhado de um campo (desembrulha Optional[...])."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        found = _submodel(arg)
+        if found is not None:
+            return found
+    return None
+
+
+def _check_path(path: str) -> None:
+    model: Optional[Type[BaseModel]] = DocumentoDados
+    for name in path.split("."):
+        if model is None or name not in model.model_fields:
+            valid = ", ".join(DocumentoDados.model_fields)
+            raise InvalidFieldsError(
+                f"Campo desconhecido em fields: {path!r} (seções: {valid})"
+            )
+        model = _submodel(model.model_fields[name].annotation)
+
+
+def parse_fields(spec: Union[str, Iterable[str], None]) -> Fields:
+    """
+    "origem,destino" (ou lista de caminhos) → conjunto validado; vazio/None
+    → None (tudo). Caminho inexistente → InvalidFieldsError.
+    """
+    if spec is None:
+        return None
+    parts = spec.split(",") if isinstance(spec, str) else spec
+    paths = frozenset(p.strip() for p in parts if p and p.strip())
+    for path in paths:
+        _check_path(path)
+    return paths or None
+
+
+def wants(fields: Fields, section: str) -> bool:
+    """A seção de 1º nível (ex.: "totais_origem") foi pedida?"""
+    if fields is None:
+        return True
+    return any(p == section or p.startswith(section + ".") for p in fields)
+
+
+def include_of(fields: Fields) -> Optional[Dict[str, Any]]:
+    """Árvore `include` do pydantic para recortar a saída (None = tudo)."""
+    if fields is None:
+        return None
+    tree: Dict[str, Any] = {}
+    for path in sorted(fields, key=len):
+        node = tree
+        *parents, leaf = path.split(".")
+        for name in parents:
+            child = node.get(name)
+            if child is True:  # um ancestral já inclui tudo
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[leaf] = True
+    return tree
@@ -3,9 +3,39 @@ from __future__ import annotations
 import re
 from datetime import datetime
 from decimal import Decimal
-from typing import Annotated, List, Literal, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+M = TypeVar("M", bound=BaseModel)
+
+# ---------------------------------
+# Modo estrito da construção pelos parsers
+# ---------------------------------
+# Desligado (padrão): a árvore montada pelo parser passa por UMA validação
+# na fronteira do documento, com a coerção usual do pydantic. Ligado
+# (WS_DOCFLOW_STRICT_MODELS=1, --strict-models, fixture dos testes): a
+# mesma validação em modo strict, sem coerção de tipos — um str onde se
+# espera Decimal/datetime é erro.
+_STRICT = False
+
+
+def set_strict_models(enabled: bool) -> None:
+    global _STRICT
+    _STRICT = bool(enabled)
+
+
+def strict_models() -> bool:
+    return _STRICT
+
+
+def build_model(model: Type[M], data: Dict[str, Any]) -> M:
+    """
+    Árvore de dicts (e instâncias prontas) montada por um parser → `model`,
+    numa única validação (strict no modo estrito).
+    """
+    return model.model_validate(data, strict=_STRICT or None)
 
-from pydantic import BaseModel, Field, StringConstraints
 
 # ---------------------------------
 # Tipos / Constraints
@@ -26,6 +56,10 @@ DocIdBR = Annotated[
 # Modelos básicos
 # ---------------------------------
 class UnidadeLocal(BaseModel):
+    # imutável: a mesma instância é compartilhada entre documentos
+    # (infra.parsers.interning)
+    model_config = ConfigDict(frozen=True)
+
     codigo: Codigo7 = Field(..., description="Código de 7 dígitos da unidade local")
     descricao: str
 
@@ -39,6 +73,10 @@ class UnidadeLocal(BaseModel):
 
 
 class RecintoAduaneiro(BaseModel):
+    # imutável: a mesma instância é compartilhada entre documentos
+    # (infra.parsers.interning)
+    model_config = ConfigDict(frozen=True)
+
     codigo: Codigo7 = Field(..., description="Código de 7 dígitos do recinto")
     descricao: str
 
@@ -57,6 +95,10 @@ class Localidade(BaseModel):
 
 
 class Participante(BaseModel):
+    # imutável: a mesma instância é compartilhada entre documentos
+    # (infra.parsers.interning)
+    model_config = ConfigDict(frozen=True)
+
     documento: DocIdBR  # CNPJ/CPF mascarado
     nome: str
 
@@ -111,7 +153,10 @@ class DeclaracaoInfo(BaseModel):
 # ---------------------------------
 class DocumentoDados(BaseModel):
     # Compatibilidade retro: defaults permitem instanciar apenas com origem/destino
-    declaracao: DeclaracaoInfo = Field(default=DeclaracaoInfo(numero="", tipo=""))
+    # uma instância por documento (não compartilhada entre eles)
+    declaracao: DeclaracaoInfo = Field(
+        default_factory=lambda: DeclaracaoInfo(numero="", tipo="")
+    )
 
     # Campo livre (string) para status textual quando existir (ex.: “CONCESSAO ...”)
     situacao_atual: str = ""
@@ -125,3 +170,14 @@ class DocumentoDados(BaseModel):
     # Novos campos (opcionais; só aparecem no extrato quando existirem)
     transporte: Optional[Transporte] = None
     situacao: Optional[Situacao] = None
+
+    @classmethod
+    def from_parsed(cls, data: Dict[str, Any]) -> "DocumentoDados":
+        """
+        Caminho rápido dos parsers: a árvore inteira chega como dicts com os
+        valores já casados pelas regex e é validada uma única vez aqui (uma
+        chamada ao pydantic-core, `build_model`), em vez de um construtor por
+        bloco seguido de atribuições. Só as chaves presentes contam como
+        "set" (exclude_unset), como nas atribuições que substitui.
+        """
+        return build_model(cls, data)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from ws_docflow.core.domain.models import (
+    DeclaracaoInfo,
+    DocumentoDados,
+    Localidade,
+    Participante,
+    RecintoAduaneiro,
+    Situacao,
+    TotaisOrigem,
+    Transporte,
+    UnidadeLocal,
+)
+
+# ---------------------------------
+# Forma compacta (tuplas) do DocumentoDados, para lotes grandes
+# ---------------------------------
+# Um BaseModel carrega __dict__, o conjunto de campos preenchidos e o
+# estado do pydantic por instância; com centenas de milhares de documentos
+# em memória isso pesa. Aqui cada modelo vira uma NamedTuple com os mesmos
+# campos, na mesma ordem: campo não preenchido = UNSET (preserva o
+# exclude_unset na volta), listas viram tuplas. Os modelos imutáveis e
+# compartilhados (UnidadeLocal, RecintoAduaneiro, Participante — ver
+# infra.parsers.interning) entram por referência, sem cópia.
+
+
+class _Unset:
+    """Marca de campo não preenchido (singleton, sobrevive ao pickle)."""
+
+    _instance: Optional["_Unset"] = None
+
+    def __new__(cls) -> "_Unset":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "UNSET"
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        return "UNSET"
+
+
+UNSET: Any = _Unset()
+
+
+class DeclaracaoRecord(NamedTuple):
+    numero: str = UNSET
+    tipo: str = UNSET
+
+
+class LocalidadeRecord(NamedTuple):
+    unidade_local: UnidadeLocal = UNSET
+    recinto_aduaneiro: RecintoAduaneiro = UNSET
+
+
+class TotaisOrigemRecord(NamedTuple):
+    tipo: str = UNSET
+    valor_total_usd: Optional[Decimal] = UNSET
+    valor_total_brl: Optional[Decimal] = UNSET
+
+
+class TransporteRecord(NamedTuple):
+    via: Optional[str] = UNSET
+
+
+class SituacaoRecord(NamedTuple):
+    solicitada_em: Optional[datetime] = UNSET
+    solicitada_por_cpf: Optional[str] = UNSET
+    registrada_em: Optional[datetime] = UNSET
+    registrada_por_cpf: Optional[str] = UNSET
+    veiculos_informados: Optional[bool] = UNSET
+    dossies_vinculados: Tuple[str, ...] = UNSET
+
+
+class DocumentoRecord(NamedTuple):
+    declaracao: DeclaracaoRecord = UNSET
+    situacao_atual: str = UNSET
+    origem: LocalidadeRecord = UNSET
+    destino: LocalidadeRecord = UNSET
+    beneficiario: Optional[Participante] = UNSET
+    transportador: Optional[Participante] = UNSET
+    totais_origem: Optional[TotaisOrigemRecord] = UNSET
+    transporte: Optional[TransporteRecord] = UNSET
+    situacao: Optional[SituacaoRecord] = UNSET
+
+
+# valores: classes NamedTuple (_make/_fields), sem tipo comum no typing
+_RECORDS: Dict[Type[BaseModel], Type[Any]] = {
+    DocumentoDados: DocumentoRecord,
+    DeclaracaoInfo: DeclaracaoRecord,
+    Localidade: LocalidadeRecord,
+    TotaisOrigem: TotaisOrigemRecord,
+    Transporte: TransporteRecord,
+    Situacao: SituacaoRecord,
+}
+_RECORD_TYPES = frozenset(_RECORDS.values())
+
+
+def _pack(value: Any) -> Any:
+    record = _RECORDS.get(type(value))
+    if record is not None:
+        fields_set = value.model_fields_set
+        return record._make(
+            _pack(getattr(value, name)) if name in fields_set else UNSET
+            for name in record._fields
+        )
+    if isinstance(value, list):
+        return tuple(_pack(v) for v in value)
+    return value  # escalares e modelos imutáveis compartilhados
+
+
+def _unpack(value: Any) -> Any:
+    if type(value) in _RECORD_TYPES:
+        return {
+            name: _unpack(v) for name, v in zip(value._fields, value) if v is not UNSET
+        }
+    if isinstance(value, tuple):
+        return [_unpack(v) for v in value]
+    return value
+
+
+def record_to_dict(record: DocumentoRecord) -> Dict[str, Any]:
+    """Árvore de dicts só com os campos preenchidos (entrada do from_parsed)."""
+    return _unpack(record)
+
+
+def to_record(doc: DocumentoDados) -> DocumentoRecord:
+    """DocumentoDados → forma compacta (sem perdas, inclusive do que é unset)."""
+    return _pack(doc)
+
+
+def from_record(record: DocumentoRecord) -> DocumentoDados:
+    """Forma compacta → DocumentoDados igual ao original (mesmos campos set)."""
+    return DocumentoDados.from_parsed(record_to_dict(record))
+
+
+def resumo(records: Iterable[DocumentoRecord]) -> Dict[str, Any]:
+    """
+    Agregado de um lote, direto das tuplas (sem voltar ao pydantic): total de
+    documentos, contagem por tipo de declaração e por unidade de destino, e
+    soma dos totais na origem (USD/BRL, como string decimal).
+    """
+    total = 0
+    por_tipo: Counter = Counter()
+    por_destino: Counter = Counter()
+    usd = brl = Decimal(0)
+    for rec in records:
+        total += 1
+        # UNSET é falso: `if` cobre "não preenchido" e None de uma vez
+        if rec.declaracao and rec.declaracao.tipo:
+            por_tipo[rec.declaracao.tipo] += 1
+        if rec.destino:
+            por_destino[rec.destino.unidade_local.codigo] += 1
+        totais = rec.totais_origem
+        if totais:
+            usd += totais.valor_total_usd or 0
+            brl += totais.valor_total_brl or 0
+    return {
+        "documentos": total,
+        "por_tipo": dict(por_tipo.most_common()),
+        "por_destino": dict(por_destino.most_common()),
+        "valor_total_usd": str(usd),
+        "valor_total_brl": str(brl),
+    }
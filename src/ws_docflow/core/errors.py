@@ -0,0 +1,26 @@
+# src/ws_docflow/core/errors.py
+from __future__ import annotations
+
+
+class DocflowError(Exception):
+    """Erro base do ws-docflow (falhas esperadas, com mensagem para o usuário)."""
+
+
+class ExtractionLimitError(DocflowError):
+    """Documento excedeu um limite de recursos da extração (páginas/memória)."""
+
+
+class InvalidFieldsError(DocflowError, ValueError):
+    """Seleção de campos (`fields`) com caminho que não existe no documento."""
+
+
+class OverloadedError(DocflowError):
+    """Sem vaga para mais um parse agora; tentar de novo em `retry_after` s."""
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PayloadTooLargeError(DocflowError):
+    """Pedido/PDF acima do limite de tamanho configurado."""
@@ -0,0 +1,58 @@
+# src/ws_docflow/core/pages.py
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Pattern, Sequence, Union
+
+
+def join_pages(page_texts: Iterable[Optional[str]]) -> str:
+    """Junta os textos de página como o `extract` (ignora páginas vazias)."""
+    return "\n".join(text for text in page_texts if text).strip()
+
+
+def join_until(
+    page_texts: Iterable[Optional[str]],
+    anchor_sets: Sequence[Sequence[Union[Pattern[str], Any]]] = (),
+    max_pages: Optional[int] = None,
+    prepare: Optional[Callable[[str], Any]] = None,
+) -> str:
+    """
+    Consome os textos de página (preguiçosamente) e junta como `join_pages`,
+    parando assim que:
+      - algum conjunto de âncoras foi visto por completo; ou
+      - `max_pages` páginas foram lidas.
+
+    Cada âncora (qualquer objeto com `search(texto)`) é buscada na janela
+    "página anterior + página atual", o que cobre blocos quebrados na virada
+    de página sem re-varrer o texto todo. `prepare` (ex.: a normalização do
+    use case) é aplicado uma vez por janela, que todas as âncoras recebem
+    assim (e precisam aceitar).
+    Ao parar, um gerador de páginas é fechado na hora (libera o PDF aberto e
+    deixa o cache de extração gravar o que foi lido).
+    """
+    parts: List[str] = []
+    pending = [list(anchors) for anchors in anchor_sets if anchors]
+    prev = ""
+
+    try:
+        # islice evita sequer pedir (e extrair) a página além do orçamento
+        for raw in islice(page_texts, max_pages):
+            text = raw or ""
+            if text:
+                parts.append(text)
+
+            if pending:
+                window: Any = f"{prev}\n{text}" if prev else text
+                if prepare is not None:
+                    window = prepare(window)
+                for anchors in pending:
+                    anchors[:] = [a for a in anchors if not a.search(window)]
+                if any(not anchors for anchors in pending):
+                    break
+                prev = text or prev
+    finally:
+        close = getattr(page_texts, "close", None)
+        if close is not None:
+            close()
+
+    return "\n".join(parts).strip()
@@ -1,8 +1,34 @@
 from __future__ import annotations
 
-from typing import Protocol, Union, runtime_checkable, Dict, Any
+import mmap
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+    runtime_checkable,
+)
 
-SourceT = Union[str, bytes]
+# caminho, buffer em memória (lido sem cópia) ou arquivo binário aberto
+# (ex.: o arquivo temporário de um upload; o chamador continua dono dele)
+SourceT = Union[str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+
+class PositionedWord(NamedTuple):
+    """Palavra com a sua caixa na página (pontos PDF, origem no topo)."""
+
+    text: str
+    x0: float
+    x1: float
+    top: float
+    bottom: float
+    page: int = 0
 
 
 @runtime_checkable
@@ -19,6 +45,49 @@ class DocModel(Protocol):
 class TextExtractor(Protocol):
     def extract(self, source: SourceT) -> str: ...
 
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        """
+        Texto página a página, sob demanda (o consumidor pode parar antes do
+        fim). Padrão para extratores que só sabem o texto inteiro: uma única
+        "página" com o resultado de `extract`.
+        """
+        yield self.extract(source)
+
 
 class DocParser(Protocol):
+    """
+    Texto → documento. Parsers que aceitam uma projeção declaram
+    `parse(text, fields=None)` (ver core.domain.fields) e não calculam as
+    seções fora dela; o use case só passa `fields` quando há seleção.
+    """
+
     def parse(self, text: str) -> DocModel: ...
+
+
+class WordExtractor(Protocol):
+    """Extrai palavras posicionadas (sem reconstruir o texto em layout)."""
+
+    def extract_words(self, source: SourceT) -> List[PositionedWord]: ...
+
+
+class LayoutParser(Protocol):
+    """Parser que localiza os campos pela geometria das palavras."""
+
+    def parse_words(self, words: List[PositionedWord]) -> DocModel: ...
+
+
+class LayoutClassifierPort(Protocol):
+    """Identifica o layout do texto: (layout ou None, confiança 0.0–1.0)."""
+
+    def classify(self, text: str) -> Tuple[Optional[str], float]: ...
+
+
+class MetricsSink(Protocol):
+    """
+    Recebe a duração (segundos) de cada etapa: open, extract, classify,
+    parse. Opcionalmente (chamados só se existirem) também `record(name,
+    value)`, um valor por documento (ex.: pdf_pages), e `count(name,
+    **labels)`, contadores (tentativas por parser, fallbacks).
+    """
+
+    def observe(self, stage: str, seconds: float) -> None: ...
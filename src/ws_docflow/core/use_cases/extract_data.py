@@ -1,22 +1,166 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence, Union, Optional
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Sequence,
+    Union,
+    Optional,
+    overload,
+)
 
-from ws_docflow.core.ports import TextExtractor, DocParser, DocModel
+from ws_docflow.core.domain.records import DocumentoRecord, to_record
+from ws_docflow.core.pages import join_until
+from ws_docflow.core.ports import (
+    TextExtractor,
+    DocParser,
+    DocModel,
+    LayoutClassifierPort,
+    MetricsSink,
+    SourceT,
+)
 
-SourceT = Union[str, bytes]
+# abaixo disso (texto do PDF inteiro) o parse serial — ~100 µs por
+# declaração — sai mais barato que subir processos e trafegar os trechos
+PARALLEL_MIN_CHARS = 1024 * 1024
+
+
+def _count(metrics: Optional[MetricsSink], name: str, **labels: str) -> None:
+    """Contador no sink, se ele souber contar (`count` é opcional)."""
+    count = getattr(metrics, "count", None)
+    if count is not None:
+        count(name, **labels)
+
+
+def _parse_with(
+    parsers: Sequence[DocParser],
+    text: Any,
+    fields: Optional[FrozenSet[str]] = None,
+    metrics: Optional[MetricsSink] = None,
+) -> DocModel:
+    """
+    Tenta os parsers em ordem; relança o último erro se nenhum casar.
+    `fields` só é repassado quando há seleção (parsers sem o parâmetro
+    seguem aceitos na cadeia). `metrics` conta as tentativas de cada parser
+    e as quedas ao parser seguinte.
+    """
+    last_err: Optional[Exception] = None
+
+    for parser in parsers:
+        name = type(parser).__name__
+        if last_err is not None:
+            _count(metrics, "fallbacks", reason="parser")
+        try:
+            if fields is None:
+                doc = parser.parse(text)
+            else:
+                doc = parser.parse(text, fields=fields)  # type: ignore[call-arg]
+        except Exception as exc:
+            _count(metrics, "parser_attempts", parser=name, result="failed")
+            last_err = exc
+            continue
+        _count(metrics, "parser_attempts", parser=name, result="matched")
+        return doc
+
+    if last_err:
+        raise last_err
+    raise RuntimeError("Nenhum parser configurado.")
+
+
+def _parse_record(
+    parsers: Sequence[DocParser],
+    text: Any,
+    fields: Optional[FrozenSet[str]] = None,
+    metrics: Optional[MetricsSink] = None,
+) -> DocumentoRecord:
+    """Como `_parse_with`, já na forma compacta (é ela que volta do worker)."""
+    doc = _parse_with(parsers, text, fields, metrics)
+    return to_record(doc)  # type: ignore[arg-type]
+
+
+def _layout_parsers(
+    parsers: Sequence[DocParser],
+    layout: Optional[str],
+    confidence: float,
+    min_confidence: float,
+) -> Optional[List[DocParser]]:
+    """Só o parser do layout classificado, ou None (vale a cadeia inteira)."""
+    chosen = [p for p in parsers if getattr(p, "layout", None) == layout]
+    if layout is None or confidence < min_confidence or not chosen:
+        return None
+    return chosen[:1]
+
+
+def _parse_segment(
+    parsers: Sequence[DocParser],
+    classifier: Optional[LayoutClassifierPort],
+    min_confidence: float,
+    normalizer: Optional[Callable[[str], Any]],
+    fields: Optional[FrozenSet[str]],
+    records: bool,
+    segment: str,
+) -> Any:
+    """
+    Um trecho de `run_many` inteiro no worker: normaliza uma vez, classifica
+    e faz o parse com o mesmo documento (o processo pai só divide o texto).
+    """
+    doc = normalizer(segment) if normalizer is not None else segment
+    chain: Optional[List[DocParser]] = None
+    if classifier is not None:
+        chain = _layout_parsers(parsers, *classifier.classify(doc), min_confidence)
+    parse = _parse_record if records else _parse_with
+    return parse(chain or parsers, doc, fields)
 
 
 class ExtractDataUseCase:
     """
     Orquestra a extração de texto e o parsing.
     Aceita um único parser OU uma sequência de parsers (fallback).
+
+    O PDF é consumido página a página (`iter_pages`, quando o extrator o
+    tem) e a leitura pode parar cedo:
+      - early_stop: quando as âncoras exigidas pelos parsers
+        (`required_anchors`) já foram vistas;
+      - max_pages: ao atingir o orçamento máximo de páginas.
+    Assim o texto além do necessário (ex.: a cauda "Cargas" de extratos
+    enormes) nunca chega a ser extraído nem mantido em memória. Os parsers
+    recebem o texto já juntado: sem parada, ele é o documento inteiro.
+
+    Com um `classifier`, o layout é identificado antes do parse: confiança
+    >= `min_confidence` despacha direto ao parser daquele layout (atributo
+    `layout`); abaixo disso, vale a cadeia de fallback. `metrics` recebe a
+    duração de cada etapa (extract, classify, parse) separadamente e, se
+    souber contar, as tentativas por parser e os fallbacks.
+
+    `fields` (projeção, ver core.domain.fields) chega aos parsers, que deixam
+    de calcular as seções não pedidas.
+
+    `normalizer` (ex.: infra.parsers.normalize.NormalizedText) prepara o texto
+    uma vez por documento; o resultado é o que classificador e parsers
+    recebem (etapa "normalize" nas métricas). Sem ele, recebem o texto cru.
     """
 
     def __init__(
         self,
         extractor: TextExtractor,
         parser_or_parsers: Union[DocParser, Sequence[DocParser]],
+        *,
+        early_stop: bool = False,
+        max_pages: Optional[int] = None,
+        classifier: Optional[LayoutClassifierPort] = None,
+        min_confidence: float = 0.5,
+        metrics: Optional[MetricsSink] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        normalizer: Optional[Callable[[str], Any]] = None,
     ) -> None:
         self.extractor = extractor
         # normaliza para lista interna
@@ -26,18 +170,156 @@ class ExtractDataUseCase:
             self.parsers: List[DocParser] = list(parser_or_parsers)
         else:
             self.parsers = [parser_or_parsers]  # um único parser
+        self.early_stop = early_stop
+        self.max_pages = max_pages
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        self.metrics = metrics
+        self.fields = fields
+        self.normalizer = normalizer
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        if self.metrics is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics.observe(stage, time.perf_counter() - start)
+
+    def _anchor_sets(self) -> list:
+        """
+        Âncoras de cada parser. Se algum parser não declarar as suas, não dá
+        para saber quando parar com segurança: nenhuma âncora é usada.
+        """
+        if not self.early_stop:
+            return []
+        sets = [tuple(getattr(p, "required_anchors", ())) for p in self.parsers]
+        return sets if all(sets) else []
+
+    def _extract(self, source: SourceT) -> str:
+        anchor_sets = self._anchor_sets()
+        iter_pages = getattr(self.extractor, "iter_pages", None)
+        if iter_pages is None:
+            return self.extractor.extract(source)
+        return join_until(
+            iter_pages(source), anchor_sets, self.max_pages, self.normalizer
+        )
+
+    def _prepare(self, text: str) -> Any:
+        """Texto → documento compartilhado por classificador e parsers."""
+        if self.normalizer is None:
+            return text
+        with self._timed("normalize"):
+            return self.normalizer(text)
+
+    def _select(self, text: Any) -> List[DocParser]:
+        """
+        Parsers a tentar para o texto: só o do layout classificado (confiança
+        suficiente e parser disponível) ou a cadeia inteira.
+        """
+        if self.classifier is None:
+            return self.parsers
+        with self._timed("classify"):
+            layout, confidence = self.classifier.classify(text)
+        chosen = _layout_parsers(self.parsers, layout, confidence, self.min_confidence)
+        if chosen is None:
+            _count(self.metrics, "fallbacks", reason="classifier")
+            return self.parsers
+        return chosen
 
     def run(self, source: SourceT) -> DocModel:
-        text = self.extractor.extract(source)
-        last_err: Optional[Exception] = None
-
-        for parser in self.parsers:
-            try:
-                return parser.parse(text)
-            except Exception as exc:
-                last_err = exc
-                continue
-
-        if last_err:
-            raise last_err
-        raise RuntimeError("Nenhum parser configurado.")
+        with self._timed("extract"):
+            text = self._extract(source)
+        doc = self._prepare(text)
+        parsers = self._select(doc)
+        with self._timed("parse"):
+            return _parse_with(parsers, doc, self.fields, self.metrics)
+
+    @overload
+    def run_many(
+        self,
+        source: SourceT,
+        splitter: Callable[[str], List[str]],
+        workers: int = ...,
+        *,
+        records: Literal[False] = ...,
+        parallel_min_chars: int = ...,
+        executor: Optional[Executor] = ...,
+    ) -> List[DocModel]: ...
+
+    @overload
+    def run_many(
+        self,
+        source: SourceT,
+        splitter: Callable[[str], List[str]],
+        workers: int = ...,
+        *,
+        records: Literal[True],
+        parallel_min_chars: int = ...,
+        executor: Optional[Executor] = ...,
+    ) -> List[DocumentoRecord]: ...
+
+    def run_many(
+        self,
+        source: SourceT,
+        splitter: Callable[[str], List[str]],
+        workers: int = 1,
+        *,
+        records: bool = False,
+        parallel_min_chars: int = PARALLEL_MIN_CHARS,
+        executor: Optional[Executor] = None,
+    ) -> List[Any]:
+        """
+        PDFs com várias declarações concatenadas: extrai o texto inteiro (sem
+        parada antecipada, que cortaria as declarações seguintes), divide com
+        `splitter` e faz o parse de cada trecho, em `workers` processos quando
+        houver mais de um trecho e o texto tiver ao menos `parallel_min_chars`
+        caracteres (abaixo disso, serial). A ordem do documento é preservada.
+
+        Em paralelo, cada trecho vai cru ao worker, que normaliza, classifica
+        e faz o parse (ver `_parse_segment`). `executor` é um pool de
+        processos já aberto, reaproveitado entre chamadas (ex.: o da API);
+        sem ele, um pool de `workers` processos é aberto só para esta chamada.
+
+        `records=True` devolve a forma compacta (core.domain.records), que
+        também é o que trafega entre os processos (pickle menor).
+        """
+        with self._timed("extract"):
+            text = self.extractor.extract(source)
+        segments = splitter(text)
+        serial = workers <= 1 or len(segments) < 2 or len(text) < parallel_min_chars
+
+        if serial:
+            # classificação por trecho: cada declaração tem o seu layout
+            docs = [self._prepare(seg) for seg in segments]
+            chains = [self._select(doc) for doc in docs]
+            parse = _parse_record if records else _parse_with
+            with self._timed("parse"):
+                return [
+                    parse(chain, doc, self.fields, self.metrics)
+                    for chain, doc in zip(chains, docs)
+                ]
+
+        with self._timed("parse"):
+            # nos processos do pool não há sink: etapas e tentativas não são
+            # contadas
+            work = partial(
+                _parse_segment,
+                self.parsers,
+                self.classifier,
+                self.min_confidence,
+                self.normalizer,
+                self.fields,
+                records,
+            )
+            n = min(workers, len(segments))
+            # lotes de trechos por envio: um trecho por vez pagaria o IPC a cada
+            # ~100 µs de parse
+            chunksize = max(1, len(segments) // (n * 4))
+            if executor is not None:
+                return list(executor.map(work, segments, chunksize=chunksize))
+            with ProcessPoolExecutor(max_workers=n) as pool:
+                return list(pool.map(work, segments, chunksize=chunksize))
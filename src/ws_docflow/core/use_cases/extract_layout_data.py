@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import List, Optional
+
+from ws_docflow.core.ports import (
+    DocModel,
+    LayoutParser,
+    PositionedWord,
+    SourceT,
+    WordExtractor,
+)
+
+
+class ExtractLayoutDataUseCase:
+    """
+    Variante do ExtractDataUseCase para o caminho por coordenadas:
+    palavras posicionadas (WordExtractor) → LayoutParser.parse_words.
+
+    Com extratores que leem página a página (`iter_page_words`):
+      - early_stop: para na primeira página em que o parser se declara
+        satisfeito (`is_complete`);
+      - max_pages: orçamento máximo de páginas.
+    """
+
+    def __init__(
+        self,
+        extractor: WordExtractor,
+        parser: LayoutParser,
+        *,
+        early_stop: bool = False,
+        max_pages: Optional[int] = None,
+    ) -> None:
+        self.extractor = extractor
+        self.parser = parser
+        self.early_stop = early_stop
+        self.max_pages = max_pages
+
+    def _words(self, source: SourceT) -> List[PositionedWord]:
+        iter_page_words = getattr(self.extractor, "iter_page_words", None)
+        if iter_page_words is None:
+            return self.extractor.extract_words(source)
+
+        is_complete = (
+            getattr(self.parser, "is_complete", None) if self.early_stop else None
+        )
+        words: List[PositionedWord] = []
+        for page in islice(iter_page_words(source), self.max_pages):
+            words.extend(page)
+            if is_complete is not None and is_complete(page):
+                break
+        return words
+
+    def run(self, source: SourceT) -> DocModel:
+        return self.parser.parse_words(self._words(source))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from ws_docflow.core.errors import OverloadedError
+
+T = TypeVar("T")
+
+# -----------------------
+# Pool de parse fora do event loop, com fila limitada
+# -----------------------
+# Extração + parse são CPU (pdfplumber é Python puro): rodar isso direto numa
+# rota `async` trava o event loop do worker uvicorn inteiro — health checks
+# inclusive — enquanto um PDF grande é lido. Aqui o trabalho vai para um
+# executor (threads ou processos) com `workers` vagas e uma fila de espera
+# de até `max_queue` pedidos; além disso o pedido é recusado na hora
+# (OverloadedError → HTTP 503 + Retry-After) em vez de se acumular.
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# quem espera vaga (`run_waiting`): o loop dele e o future que o acorda
+_Waiter = Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():  # pode ter sido cancelado enquanto esperava
+        waiter.set_result(None)
+
+
+class ParsePool:
+    """
+    Executor limitado: `workers` tarefas rodando + até `max_queue`
+    esperando. `run` recusa com OverloadedError quando não há lugar;
+    `run_waiting` espera até uma tarefa terminar e liberar lugar.
+    Com kind="process", função e argumentos precisam ser picklable
+    (o upload vai como bytes) e `initializer` prepara cada processo.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 8,
+        *,
+        kind: str = "thread",
+        retry_after: int = 2,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(
+                f"Executor desconhecido: {kind!r} (use {', '.join(EXECUTOR_KINDS)})"
+            )
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # admitidos e ainda não terminados
+        self._waiters: List[_Waiter] = []
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        # criado no 1º uso: importar a API não sobe threads/processos
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, initializer=self._initializer
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        self.workers,
+                        thread_name_prefix="ws-docflow-parse",
+                        initializer=self._initializer,
+                    )
+            return self._executor
+
+    @property
+    def executor(self) -> Executor:
+        """
+        O executor em si, sem fila nem recusa: para trabalho de quem já foi
+        admitido e só o reparte (ex.: os trechos de `run_many`).
+        """
+        return self._get_executor()
+
+    @property
+    def saturated(self) -> bool:
+        """Sem vaga nem lugar na fila: o próximo `run` seria recusado."""
+        with self._lock:
+            return self._pending >= self.workers + self.max_queue
+
+    def _admit(self, waiter: Optional[_Waiter] = None) -> bool:
+        """
+        Ocupa um lugar. Lotado: sem `waiter`, OverloadedError; com ele, o
+        registra para ser acordado na próxima vaga e devolve False.
+        """
+        with self._lock:
+            if self._pending < self.workers + self.max_queue:
+                self._pending += 1
+                return True
+            if waiter is not None:
+                self._waiters.append(waiter)
+                return False
+            self.rejected += 1
+        raise OverloadedError(
+            f"Servidor ocupado: {self.workers} parse(s) em andamento e "
+            f"{self.max_queue} na fila. Tente novamente em "
+            f"{self.retry_after}s.",
+            retry_after=self.retry_after,
+        )
+
+    def _free(self) -> None:
+        """Devolve um lugar (com o lock) e acorda quem espera vaga."""
+        self._pending -= 1
+        # acorda todos: quem perder a vaga para outro pedido volta a esperar
+        waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._free()
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def _submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Roda no executor um pedido já admitido; o lugar volta ao terminar."""
+        try:
+            future = self._get_executor().submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self._free()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        `fn(*args, **kwargs)` no executor; OverloadedError se lotado. A vaga
+        só é liberada quando a tarefa termina de fato (um cliente que
+        desiste não abre lugar para outra tarefa rodar em paralelo).
+        """
+        self._admit()
+        return await self._submit(fn, *args, **kwargs)
+
+    async def run_waiting(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Como `run`, mas lotado espera vaga em vez de recusar: acordado por
+        `_release` quando uma tarefa termina (sem polling). A espera não
+        conta como recusa em `stats()`.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter: "asyncio.Future[None]" = loop.create_future()
+            if self._admit((loop, waiter)):
+                break
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+        return await self._submit(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(pending, self.workers),
+                "queued": max(pending - self.workers, 0),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import io
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic_core import to_json
+
+from ws_docflow.core.domain.fields import Fields, parse_fields
+from ws_docflow.core.errors import ExtractionLimitError, OverloadedError
+from ws_docflow.infra.logging import logger as log
+
+# -----------------------
+# Jobs assíncronos: tabela SQLite local + workers
+# -----------------------
+# O pedido só grava o PDF na tabela e responde na hora (id do job); os
+# workers pegam os jobs pendentes em ordem de chegada, rodam o parse e
+# gravam o JSON do documento (ou o erro). Tudo fica no arquivo SQLite:
+# jobs pendentes sobrevivem a um restart. Cada job em processamento tem um
+# dono (o JobStore do processo que o pegou) e um lease renovado pelo
+# heartbeat do runner; só os leases vencidos (dono morto ou travado) voltam
+# para a fila (`recover`) — os jobs dos outros workers vivos ficam com eles.
+# Resultados expiram `ttl` segundos depois de concluídos; o PDF de entrada é
+# apagado assim que o job termina.
+
+PENDENTE = "pendente"
+PROCESSANDO = "processando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+ESTADOS = (PENDENTE, PROCESSANDO, CONCLUIDO, FALHOU)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    estado TEXT NOT NULL,
+    arquivo TEXT,
+    fields TEXT,
+    pdf BLOB,
+    documento BLOB,
+    status INTEGER,
+    erro TEXT,
+    criado_em REAL NOT NULL,
+    iniciado_em REAL,
+    concluido_em REAL,
+    expira_em REAL,
+    dono TEXT,
+    lease_ate REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_fila ON jobs (estado, criado_em);
+"""
+
+# bloco de cópia do PDF (arquivo → blob da tabela)
+_BLOB_CHUNK = 1024 * 1024
+
+_COLUMNS = (
+    "id, estado, arquivo, documento, status, erro, "
+    "criado_em, iniciado_em, concluido_em, expira_em"
+)
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    estado: str
+    arquivo: Optional[str]
+    documento: Optional[bytes]  # JSON pronto (concluído)
+    status: Optional[int]  # código HTTP do erro (falhou)
+    erro: Optional[str]
+    criado_em: float
+    iniciado_em: Optional[float] = None
+    concluido_em: Optional[float] = None
+    expira_em: Optional[float] = None
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in (CONCLUIDO, FALHOU)
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+def job_json(job: Job) -> bytes:
+    """Job → JSON (metadados + documento ou erro; campos vazios omitidos)."""
+    meta = {
+        "id": job.id,
+        "estado": job.estado,
+        "arquivo": job.arquivo,
+        "criado_em": _iso(job.criado_em),
+        "iniciado_em": _iso(job.iniciado_em),
+        "concluido_em": _iso(job.concluido_em),
+        "expira_em": _iso(job.expira_em),
+        "status": job.status,
+        "erro": job.erro,
+    }
+    body = to_json({k: v for k, v in meta.items() if v is not None})
+    if job.documento is None:
+        return body
+    return body[:-1] + b',"documento":' + job.documento + b"}"
+
+
+class JobStore:
+    """
+    Tabela de jobs num arquivo SQLite (thread-safe; vários processos podem
+    abrir o mesmo arquivo: `claim` é uma transação IMMEDIATE).
+
+    `owner` identifica esta instância (host, pid e um sufixo aleatório): o
+    job pego por `claim` fica com ela por `lease` segundos, prazo estendido
+    por `renew`. `finish`/`fail` só valem para o dono atual.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = 86400,
+        *,
+        lease: float = 60,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._clock = clock
+        self._lock = threading.Lock()
+        if self.path.parent != Path("."):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit (isolation_level=None): transações explícitas no claim
+        self._db = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _job(self, row: Tuple) -> Job:
+        return Job(*row)
+
+    def submit(
+        self,
+        pdf: Union[bytes, BinaryIO],
+        filename: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Job:
+        """
+        Novo job pendente. `pdf` em arquivo (ex.: o upload já em disco) vai
+        para a tabela em blocos (`zeroblob` + `blobopen`), sem passar inteiro
+        pela memória; o job só aparece para `claim` com o PDF completo.
+        """
+        job = Job(
+            id=uuid.uuid4().hex,
+            estado=PENDENTE,
+            arquivo=filename,
+            documento=None,
+            status=None,
+            erro=None,
+            criado_em=self._clock(),
+        )
+        blobopen = getattr(self._db, "blobopen", None)  # Python >= 3.11
+        if isinstance(pdf, bytes) or blobopen is None:
+            data = pdf if isinstance(pdf, bytes) else pdf.read()
+            with self._lock:
+                self._db.execute(
+                    "INSERT INTO jobs (id, estado, arquivo, fields, pdf, criado_em) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, job.estado, filename, fields, data, job.criado_em),
+                )
+            return job
+
+        size = pdf.seek(0, io.SEEK_END)
+        pdf.seek(0)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._db.execute(
+                    "INSERT INTO jobs (id, estado, arquivo, fields, pdf, criado_em) "
+                    "VALUES (?, ?, ?, ?, zeroblob(?), ?)",
+                    (job.id, job.estado, filename, fields, size, job.criado_em),
+                )
+                with blobopen("jobs", "pdf", cursor.lastrowid) as blob:
+                    for chunk in iter(lambda: pdf.read(_BLOB_CHUNK), b""):
+                        blob.write(chunk)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job pelo id; None se não existe ou se o resultado já expirou."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ? "
+                "AND (expira_em IS NULL OR expira_em > ?)",
+                (job_id, self._clock()),
+            ).fetchone()
+        return None if row is None else self._job(row)
+
+    def claim(self) -> Optional[Tuple[str, bytes, Optional[str]]]:
+        """Próximo job pendente → em processamento por este dono: (id, pdf, fields)."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id, pdf, fields FROM jobs WHERE estado = ? "
+                    "ORDER BY criado_em LIMIT 1",
+                    (PENDENTE,),
+                ).fetchone()
+                if row is not None:
+                    now = self._clock()
+                    self._db.execute(
+                        "UPDATE jobs SET estado = ?, iniciado_em = ?, dono = ?, "
+                        "lease_ate = ? WHERE id = ?",
+                        (PROCESSANDO, now, self.owner, now + self.lease, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return row
+
+    def _finish(self, job_id: str, estado: str, **values: object) -> bool:
+        now = self._clock()
+        columns = ", ".join(f"{name} = ?" for name in values)
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE jobs SET estado = ?, {columns}, pdf = NULL, "
+                "concluido_em = ?, expira_em = ?, dono = NULL, lease_ate = NULL "
+                "WHERE id = ? AND estado = ? AND dono = ?",
+                (
+                    estado,
+                    *values.values(),
+                    now,
+                    now + self.ttl,
+                    job_id,
+                    PROCESSANDO,
+                    self.owner,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id: str, documento: bytes) -> bool:
+        """Grava o resultado; False se o job já não é deste dono (lease vencido)."""
+        return self._finish(job_id, CONCLUIDO, documento=documento)
+
+    def fail(self, job_id: str, status: int, erro: str) -> bool:
+        return self._finish(job_id, FALHOU, status=status, erro=erro)
+
+    def renew(self) -> int:
+        """Heartbeat: estende o lease dos jobs em processamento deste dono."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET lease_ate = ? WHERE estado = ? AND dono = ?",
+                (self._clock() + self.lease, PROCESSANDO, self.owner),
+            )
+        return cursor.rowcount
+
+    def recover(self) -> int:
+        """
+        Jobs em processamento com o lease vencido (dono morto ou travado) →
+        pendentes. Os de donos vivos, que renovam o lease, ficam com eles.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET estado = ?, iniciado_em = NULL, dono = NULL, "
+                "lease_ate = NULL WHERE estado = ? AND lease_ate <= ?",
+                (PENDENTE, PROCESSANDO, self._clock()),
+            )
+        return cursor.rowcount
+
+    def purge(self) -> int:
+        """Apaga os jobs com o resultado expirado."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM jobs WHERE expira_em <= ?", (self._clock(),)
+            )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT estado, COUNT(*) FROM jobs GROUP BY estado"
+            ).fetchall()
+        return {estado: 0 for estado in ESTADOS} | dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobRunner:
+    """
+    `workers` threads que consomem a fila do JobStore com `run(pdf, fields)`
+    (bytes do PDF → JSON do documento). Acordam a cada `submit` ou, sem
+    aviso (outro processo no mesmo arquivo), a cada `poll` segundos; ociosas,
+    devolvem à fila os jobs de leases vencidos. Uma thread de heartbeat
+    renova o lease dos jobs em andamento a cada terço do prazo.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run: Callable[[bytes, Fields], bytes],
+        workers: int = 1,
+        poll: float = 1.0,
+    ) -> None:
+        self.store = store
+        self._run = run
+        self.workers = max(1, workers)
+        self.poll = poll
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _recover(self) -> None:
+        recovered = self.store.recover()
+        if recovered:
+            log.info(f"♻️ {recovered} job(s) interrompido(s) de volta à fila")
+
+    def start(self) -> None:
+        self._recover()
+        self.store.purge()
+        targets = [(self._heartbeat, "ws-docflow-job-heartbeat")] + [
+            (self._loop, f"ws-docflow-job-{i}") for i in range(self.workers)
+        ]
+        for target, name in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self,
+        pdf: Union[bytes, BinaryIO],
+        filename: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Job:
+        job = self.store.submit(pdf, filename, fields)
+        log.info(f"📥 Job {job.id} na fila ({filename})")
+        self._wake.set()
+        return job
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.store.lease / 3):
+            try:
+                self.store.renew()
+            except sqlite3.Error as exc:
+                log.warning(f"⚠️ Heartbeat da fila de jobs falhou: {exc}")
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self.store.claim()
+            except sqlite3.Error as exc:
+                log.warning(f"⚠️ Fila de jobs indisponível: {exc}")
+                claimed = None
+            if claimed is None:
+                self._recover()
+                self.store.purge()
+                self._wake.wait(self.poll)
+                self._wake.clear()
+                continue
+            self._process(*claimed)
+
+    def _process(self, job_id: str, pdf: bytes, spec: Optional[str]) -> None:
+        start = time.perf_counter()
+        try:
+            documento = self._run(pdf, parse_fields(spec))
+        except ExtractionLimitError as exc:
+            owned = self.store.fail(job_id, 413, str(exc))
+        except OverloadedError as exc:
+            owned = self.store.fail(job_id, 503, str(exc))
+        except Exception as exc:
+            log.warning(f"⚠️ Job {job_id} falhou: {exc}")
+            owned = self.store.fail(job_id, 422, f"Falha ao processar PDF: {exc}")
+        else:
+            owned = self.store.finish(job_id, documento)
+            if owned:
+                dur_ms = (time.perf_counter() - start) * 1000
+                log.info(f"✅ Job {job_id} concluído ⏱️ {dur_ms:.1f} ms")
+        if not owned:
+            log.warning(f"⚠️ Job {job_id}: lease vencido, resultado descartado")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Para os workers (o job em andamento termina; o resto fica na fila)."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
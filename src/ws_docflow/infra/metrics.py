@@ -0,0 +1,229 @@
+# src/ws_docflow/infra/metrics.py
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ws_docflow.core.ports import MetricsSink
+
+# -----------------------
+# Buckets dos histogramas (formato Prometheus: limite superior inclusivo)
+# -----------------------
+# duração das etapas (s): de uma serialização (ms) a um PDF enorme com OCR
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+VALUE_BUCKETS: Dict[str, Tuple[float, ...]] = {
+    "pdf_pages": (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+    "input_bytes": tuple(float(4**k * 16 * 1024) for k in range(8)),  # 16 KB…256 MB
+}
+_DEFAULT_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000)
+
+_HELP = {
+    "stage_seconds": (
+        "Duração de cada etapa "
+        "(open, extract, normalize, classify, parse, serialize)."
+    ),
+    "pdf_pages": "Páginas por PDF aberto.",
+    "input_bytes": "Tamanho (bytes) de cada PDF recebido.",
+    "parser_attempts": "Tentativas de parse por parser e resultado (matched/failed).",
+    "fallbacks": (
+        "Quedas para a cadeia de parsers (classifier) "
+        "ou ao parser seguinte (parser)."
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class _Histogram:
+    buckets: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)  # por faixa (não cumulativo)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)  # + faixa "+Inf"
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+class StageMetrics:
+    """
+    Coletor em memória (MetricsSink): durações por etapa, valores por
+    documento (páginas, bytes de entrada) e contadores com rótulos
+    (tentativas por parser, fallbacks), todos como histogramas/contadores
+    exportáveis no formato texto do Prometheus. Thread-safe (rotas da API e
+    workers do ParsePool gravam em paralelo).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Histogram] = {}
+        self._values: Dict[str, _Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = _Histogram(LATENCY_BUCKETS)
+            hist.add(seconds)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def record(self, name: str, value: float) -> None:
+        """Um valor por documento (ex.: pdf_pages, input_bytes)."""
+        with self._lock:
+            hist = self._values.get(name)
+            if hist is None:
+                buckets = VALUE_BUCKETS.get(name, _DEFAULT_BUCKETS)
+                hist = self._values[name] = _Histogram(buckets)
+            hist.add(value)
+
+    def count(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "count": st.count,
+                    "total_ms": round(st.total * 1000, 3),
+                    "avg_ms": round(st.total * 1000 / st.count, 3),
+                    "max_ms": round(st.max * 1000, 3),
+                }
+                for name, st in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._values.clear()
+            self._counters.clear()
+
+    def prometheus(self, prefix: str = "ws_docflow") -> str:
+        """Tudo o que foi coletado, no formato texto do Prometheus (0.0.4)."""
+        with self._lock:
+            stages = {k: _copy(h) for k, h in self._stages.items()}
+            values = {k: _copy(h) for k, h in self._values.items()}
+            counters = dict(self._counters)
+
+        lines: List[str] = []
+        if stages:
+            _histogram_header(lines, f"{prefix}_stage_seconds", "stage_seconds")
+            for stage, hist in sorted(stages.items()):
+                _histogram_lines(lines, f"{prefix}_stage_seconds", hist, stage=stage)
+        for name, hist in sorted(values.items()):
+            _histogram_header(lines, f"{prefix}_{name}", name)
+            _histogram_lines(lines, f"{prefix}_{name}", hist)
+
+        by_name: Dict[str, List[Tuple[Labels, float]]] = {}
+        for (name, labels), value in sorted(counters.items()):
+            by_name.setdefault(name, []).append((labels, value))
+        for name, samples in by_name.items():
+            lines += prometheus_lines(
+                f"{prefix}_{name}_total",
+                "counter",
+                _HELP.get(name, name),
+                ((dict(labels), value) for labels, value in samples),
+            )
+        return "".join(f"{line}\n" for line in lines)
+
+
+def _copy(hist: _Histogram) -> _Histogram:
+    clone = _Histogram(hist.buckets)
+    clone.counts = list(hist.counts)
+    clone.count, clone.total, clone.max = hist.count, hist.total, hist.max
+    return clone
+
+
+# -----------------------
+# Formato texto do Prometheus
+# -----------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def prometheus_lines(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[Tuple[Mapping[str, str], float]],
+) -> List[str]:
+    """# HELP/# TYPE + uma linha por amostra (gauge/counter)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples]
+    return lines
+
+
+def _histogram_header(lines: List[str], name: str, help_key: str) -> None:
+    lines.append(f"# HELP {name} {_HELP.get(help_key, help_key)}")
+    lines.append(f"# TYPE {name} histogram")
+
+
+def _histogram_lines(
+    lines: List[str], name: str, hist: _Histogram, **labels: str
+) -> None:
+    cumulative = 0
+    for bound, n in zip((*hist.buckets, float("inf")), hist.counts):
+        cumulative += n
+        le = _labels({**labels, "le": _number(bound)})
+        lines.append(f"{name}_bucket{le} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(hist.total)}")
+    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+
+# -----------------------
+# Atalhos para sinks opcionais
+# -----------------------
+# Extratores e use case recebem um MetricsSink opcional; sinks de terceiros
+# podem implementar só `observe` (o protocolo original), então `record` e
+# `count` são chamados apenas quando existem.
+
+
+@contextmanager
+def timed(sink: Optional[MetricsSink], stage: str) -> Iterator[None]:
+    if sink is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sink.observe(stage, time.perf_counter() - start)
+
+
+def record(sink: Optional[MetricsSink], name: str, value: float) -> None:
+    method = getattr(sink, "record", None)
+    if method is not None:
+        method(name, value)
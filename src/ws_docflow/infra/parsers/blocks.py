@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterator, Optional, Union
+
+from ws_docflow.infra.parsers.normalize import NormalizedText, normalized
+
+# -----------------------
+# Blocos de linhas com custo linear
+# -----------------------
+# Substituem regex multi-linha com repetições aninhadas de linhas em branco
+# ((?:\s*\r?\n)*) e `.+?` com DOTALL, que retrocedem muito em textos longos
+# ou malformados. Aqui cada regex só vê UMA linha (sem quantificadores
+# aninhados) e os saltos de linhas em branco são feitos uma vez, em avanço,
+# sem volta.
+#
+# Os padrões são escritos para o texto normalizado (normalize.py): minúsculas
+# sem acento, um espaço entre palavras, linhas sem espaços nas pontas. Os
+# grupos devolvidos saem do texto original (verbatim).
+
+_BLANK = re.compile(r"[ \n]*")
+
+
+def _skip_blank(text: str, pos: int) -> int:
+    """Primeira posição a partir de `pos` que não é espaço nem fim de linha."""
+    m = _BLANK.match(text, pos)
+    return m.end() if m else pos
+
+
+def _line_end(text: str, pos: int) -> int:
+    end = text.find("\n", pos)
+    return len(text) if end == -1 else end
+
+
+def _at_line_start(rx: re.Pattern, text: str, pos: int = 0) -> Iterator[re.Match]:
+    """
+    Matches de `rx` que começam uma linha. Mais rápido que `^` + MULTILINE:
+    sem a âncora, o padrão começa por um literal e o `re` pula direto às
+    ocorrências dele em vez de testar cada posição do texto.
+    """
+    for m in rx.finditer(text, pos):
+        start = m.start()
+        if start == 0 or text[start - 1] == "\n":
+            yield m
+
+
+class LineStart:
+    """
+    Título no início de uma linha (ex.: "Cargas"). `search(text)` devolve o
+    match no texto normalizado, ou None: serve de âncora de parada antecipada
+    escrita, como as demais, para o texto normalizado.
+    """
+
+    def __init__(self, header: str, flags: int = 0) -> None:
+        self._header = re.compile(header, flags)
+
+    def search(self, text: Union[str, NormalizedText]) -> Optional[re.Match]:
+        return next(_at_line_start(self._header, normalized(text).text), None)
+
+
+class LineBlock:
+    """
+    Título numa linha própria seguido de linhas não vazias consecutivas
+    (linhas em branco entre elas são ignoradas), cada uma casada com o seu
+    padrão. `search(text)` devolve os grupos nomeados de todas as linhas do
+    primeiro bloco completo (grupo opcional que não casou vem como ""), ou
+    None. Serve também de âncora de parada antecipada (só `search` é usado).
+    """
+
+    def __init__(self, header: str, *lines: str, flags: int = 0) -> None:
+        self._header = re.compile(rf"{header}$", flags | re.MULTILINE)
+        self._lines = [re.compile(pattern, flags) for pattern in lines]
+
+    def _match_after(self, doc: NormalizedText, pos: int) -> Optional[Dict[str, str]]:
+        text = doc.text
+        groups: Dict[str, str] = {}
+        for rx in self._lines:
+            pos = _skip_blank(text, pos)
+            if pos >= len(text):
+                return None
+            end = _line_end(text, pos)
+            m = rx.match(text, pos, end)
+            if not m:
+                return None
+            for name in m.re.groupindex:
+                groups[name] = doc.group(m, name) or ""
+            pos = end
+        return groups
+
+    def search(self, text: Union[str, NormalizedText]) -> Optional[Dict[str, str]]:
+        doc = normalized(text)
+        for header in _at_line_start(self._header, doc.text):
+            found = self._match_after(doc, header.end())
+            if found is not None:
+                return found
+        return None
+
+
+class TextAfter:
+    """
+    Texto livre (verbatim) depois de um título (ex.: "Situação Atual"):
+      - até o fim da linha onde o texto começa (`to_line_end`); ou
+      - até a próxima linha que começa com `until` (ou o fim do texto).
+    Com `line_start`, o título só vale no início de uma linha. Espaços/linhas
+    em branco logo após o título são pulados.
+    """
+
+    def __init__(
+        self,
+        header: str,
+        *,
+        until: Optional[str] = None,
+        to_line_end: bool = False,
+        line_start: bool = False,
+        flags: int = 0,
+    ) -> None:
+        self._header = re.compile(header, flags | re.MULTILINE)
+        self._until = re.compile(until, flags | re.MULTILINE) if until else None
+        self._to_line_end = to_line_end
+        self._line_start = line_start
+
+    def search(self, text: Union[str, NormalizedText]) -> Optional[str]:
+        doc = normalized(text)
+        if self._line_start:
+            header = next(_at_line_start(self._header, doc.text), None)
+        else:
+            header = self._header.search(doc.text)
+        if not header:
+            return None
+        start = _skip_blank(doc.text, header.end())
+        if start >= len(doc.text):
+            return None
+        if self._to_line_end:
+            return doc.verbatim(start, _line_end(doc.text, start))
+        end = None
+        if self._until:
+            end = next(_at_line_start(self._until, doc.text, start + 1), None)
+        return doc.verbatim(start, end.start() if end else len(doc.text))
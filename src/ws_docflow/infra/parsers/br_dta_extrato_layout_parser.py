@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ws_docflow.core.ports import LayoutParser, PositionedWord
+from ws_docflow.core.domain.models import DocumentoDados
+from ws_docflow.infra.parsers.interning import (
+    PARTICIPANTES,
+    RECINTOS,
+    UNIDADES_LOCAIS,
+)
+from ws_docflow.infra.parsers.br_dta_extrato_parser import (
+    BrDtaExtratoParser,
+    _participante,
+    _split_code_desc,
+    parse_money_ptbr,
+)
+
+# -----------------------
+# Geometria → linhas → pares rótulo/valor
+# -----------------------
+
+# títulos de seção (linha inteira, já normalizada)
+_SECTIONS = {
+    "dados gerais",
+    "via de transporte/situacao",
+    "origem",
+    "destino",
+    "beneficiario/transportador",
+    "tratamento na origem/totais",
+    "situacao atual",
+    "cargas",
+}
+_SIT_ATUAL = "situacao atual"
+_END = "cargas"  # nada que o parser usa vem depois
+
+
+def _norm(s: str) -> str:
+    """Sem acentos, casefold e espaços colapsados (comparação de rótulos)."""
+    decomposed = unicodedata.normalize("NFKD", s)
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(plain.casefold().split())
+
+
+def group_lines(
+    words: Iterable[PositionedWord], y_tolerance: float = 3.0
+) -> List[List[PositionedWord]]:
+    """
+    Agrupa palavras em linhas visuais: mesma página e `top` dentro da
+    tolerância; cada linha sai ordenada da esquerda para a direita.
+    """
+    lines: List[List[PositionedWord]] = []
+    current: List[PositionedWord] = []
+    for w in sorted(words, key=lambda w: (w.page, w.top, w.x0)):
+        if (
+            current
+            and w.page == current[0].page
+            and abs(w.top - current[0].top) <= y_tolerance
+        ):
+            current.append(w)
+            continue
+        if current:
+            lines.append(sorted(current, key=lambda w: w.x0))
+        current = [w]
+    if current:
+        lines.append(sorted(current, key=lambda w: w.x0))
+    return lines
+
+
+def _line_text(line: List[PositionedWord]) -> str:
+    return " ".join(w.text for w in line)
+
+
+def _split_label(
+    line: List[PositionedWord],
+) -> Optional[Tuple[str, List[PositionedWord]]]:
+    """
+    Separa "Rótulo : valor" pelo primeiro token com dois-pontos
+    (":" solto, "Rótulo:" ou ":valor"). Horários ("16:30:23") não contam.
+    """
+    for i, w in enumerate(line):
+        if w.text == ":":
+            label, value = line[:i], line[i + 1 :]
+        elif w.text.endswith(":"):
+            label = line[:i] + [w._replace(text=w.text[:-1])]
+            value = line[i + 1 :]
+        elif w.text.startswith(":") and i > 0:
+            label = line[:i]
+            value = [w._replace(text=w.text[1:])] + line[i + 1 :]
+        else:
+            continue
+        if label:
+            return _line_text(label), [v for v in value if v.text]
+    return None
+
+
+@dataclass
+class _Field:
+    words: List[PositionedWord]
+    # coluna onde o valor começa: linhas seguintes indentadas até ela
+    # são continuação (valor quebrado em mais de uma linha)
+    value_x0: float
+
+    @property
+    def value(self) -> str:
+        return _line_text(self.words).strip()
+
+
+@dataclass
+class _Layout:
+    # (seção, rótulo normalizado) → campo; vale a 1ª ocorrência
+    fields: Dict[Tuple[str, str], _Field] = field(default_factory=dict)
+    # linhas sem rótulo, por seção
+    free: Dict[str, List[str]] = field(default_factory=dict)
+    # texto das linhas, por seção (para os campos em forma de frase)
+    text: Dict[str, List[str]] = field(default_factory=dict)
+
+    def get(self, label: str, *sections: str) -> str:
+        """Valor do rótulo nas seções dadas (ou em qualquer uma)."""
+        for (section, lbl), fld in self.fields.items():
+            if lbl == label and (not sections or section in sections):
+                return fld.value
+        return ""
+
+
+def read_layout(
+    words: Iterable[PositionedWord],
+    y_tolerance: float = 3.0,
+    x_tolerance: float = 2.0,
+) -> _Layout:
+    layout = _Layout()
+    section = ""
+    last: Optional[_Field] = None
+
+    for line in group_lines(words, y_tolerance):
+        text = _line_text(line)
+        key = _norm(text)
+
+        if key in _SECTIONS or key.startswith(_SIT_ATUAL):
+            section = _SIT_ATUAL if key.startswith(_SIT_ATUAL) else key
+            last = None
+            if section == _END:
+                break
+            rest = text.split(None, 2)[2:] if section == _SIT_ATUAL else []
+            if rest:
+                layout.free.setdefault(section, []).append(rest[0])
+            continue
+
+        layout.text.setdefault(section, []).append(text)
+        split = _split_label(line) if section != _SIT_ATUAL else None
+        if split:
+            label, value = split
+            value_x0 = value[0].x0 if value else line[-1].x1
+            last = _Field(list(value), value_x0)
+            layout.fields.setdefault((section, _norm(label)), last)
+        elif last is not None and line[0].x0 >= last.value_x0 - x_tolerance:
+            last.words.extend(line)
+        else:
+            layout.free.setdefault(section, []).append(text)
+            last = None
+
+    return layout
+
+
+# -----------------------
+# Parser
+# -----------------------
+
+
+class BrDtaExtratoLayoutParser(BrDtaExtratoParser, LayoutParser):
+    """
+    Variante do BrDtaExtratoParser que lê o extrato a partir de palavras
+    posicionadas (PdfPlumberWordExtractor), sem texto em layout:
+      - linhas = palavras agrupadas pelo `top`;
+      - seções = linhas-título (Origem, Destino, Totais...);
+      - campos = pares rótulo/valor separados pelos dois-pontos; linhas
+        seguintes indentadas até a coluna do valor são continuação dele
+        (descrições longas quebradas não são truncadas).
+    Os campos em forma de frase (situação/veículos/dossiês) reaproveitam as
+    regras do parser de texto sobre as linhas da seção. `parse(text)`
+    continua disponível (herdado).
+    """
+
+    def is_complete(self, page_words: List[PositionedWord]) -> bool:
+        """A página traz o título "Cargas"? Então nada além dela é necessário."""
+        return any(_norm(_line_text(line)) == _END for line in group_lines(page_words))
+
+    def parse_words(self, words: List[PositionedWord]) -> DocumentoDados:
+        layout = read_layout(words)
+
+        raws = [
+            layout.get("unidade local", "origem"),
+            layout.get("recinto aduaneiro", "origem"),
+            layout.get("unidade local", "destino"),
+            layout.get("recinto aduaneiro", "destino"),
+        ]
+        if not all(raws):
+            raise ValueError("Blocos Origem/Destino não encontrados no layout.")
+        orig_ul, orig_ra, dest_ul, dest_ra = raws
+        oul = UNIDADES_LOCAIS.get(orig_ul, _split_code_desc)
+        ora = RECINTOS.get(orig_ra, _split_code_desc)
+        dul = UNIDADES_LOCAIS.get(dest_ul, _split_code_desc)
+        dra = RECINTOS.get(dest_ra, _split_code_desc)
+
+        data: Dict[str, Any] = {
+            "declaracao": {
+                "numero": re.sub(r"\D", "", layout.get("no. da declaracao")),
+                "tipo": layout.get("tipo", "", "dados gerais"),
+            },
+            "situacao_atual": "",
+            "origem": {"unidade_local": oul, "recinto_aduaneiro": ora},
+            "destino": {"unidade_local": dul, "recinto_aduaneiro": dra},
+        }
+
+        for attr, papel in (
+            ("beneficiario", "beneficiario"),
+            ("transportador", "transportador"),
+        ):
+            documento = layout.get(f"cnpj/cpf do {papel}")
+            nome = layout.get(f"nome do {papel}")
+            participante = PARTICIPANTES.get(f"{documento} - {nome}", _participante)
+            if documento and nome and participante:
+                data[attr] = participante
+
+        totais = "tratamento na origem/totais"
+        tipo = layout.get("tipo", totais)
+        usd_raw = layout.get("valor total do transito em dolar", totais)
+        brl_raw = layout.get("valor total do transito na moeda nacional", totais)
+        if tipo and usd_raw and brl_raw:
+            usd = brl = None
+            try:
+                usd = parse_money_ptbr(usd_raw)
+                brl = parse_money_ptbr(brl_raw)
+            except Exception:
+                pass
+            data["totais_origem"] = {
+                "tipo": "ARMAZENAMENTO" if "ARMAZEN" in tipo.upper() else "OUTRO",
+                "valor_total_usd": usd,
+                "valor_total_brl": brl,
+            }
+
+        lines_text = "\n".join(ln for lines in layout.text.values() for ln in lines)
+        transp_blk, sit_blk = self._parse_via_situacao(lines_text)
+        if transp_blk:
+            data["transporte"] = transp_blk
+        if sit_blk:
+            data["situacao"] = sit_blk
+
+        sit_atual = layout.free.get(_SIT_ATUAL)
+        if sit_atual:
+            bloco = re.sub(r"javascript:history\.back\(\);\s*", "", sit_atual[0])
+            data["situacao_atual"] = bloco.strip()
+
+        return DocumentoDados.from_parsed(data)
@@ -3,22 +3,23 @@ from __future__ import annotations
 import re
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Literal, Optional
+from itertools import islice
+from typing import Any, Dict, Literal, Optional, Union
 
 from zoneinfo import ZoneInfo
 
 from ws_docflow.core.ports import DocParser
-from ws_docflow.core.domain.models import (
-    DocumentoDados,
-    Localidade,
-    UnidadeLocal,
-    RecintoAduaneiro,
-    Participante,
-    TotaisOrigem,
-    DeclaracaoInfo,
-    Transporte,
-    Situacao,
+from ws_docflow.infra.parsers.blocks import LineBlock, LineStart, TextAfter
+from ws_docflow.infra.parsers.classifier import LAYOUT_EXTRATO
+from ws_docflow.infra.parsers.interning import (
+    PARTICIPANTES,
+    RECINTOS,
+    UNIDADES_LOCAIS,
 )
+from ws_docflow.infra.parsers.label_index import LabelIndex, label_index
+from ws_docflow.infra.parsers.normalize import NormalizedText, fold, normalized
+from ws_docflow.core.domain.fields import Fields, wants
+from ws_docflow.core.domain.models import DocumentoDados
 
 TZ = ZoneInfo("America/Sao_Paulo")
 
@@ -41,6 +42,14 @@ def _split_code_desc(raw: str) -> Dict[str, str]:
     return {"codigo": m.group(1), "descricao": m.group(2)}
 
 
+def _participante(raw: str) -> Optional[Dict[str, str]]:
+    """ "documento - nome" → campos do Participante (máscara casada uma vez)."""
+    m = DOC_MASK.match(raw)
+    if not m:
+        return None
+    return {"documento": m.group(1), "nome": m.group(2)}
+
+
 def parse_money_ptbr(raw: str) -> Decimal:
     s = (raw or "").strip().replace(".", "").replace(",", ".")
     return Decimal(s)
@@ -54,81 +63,50 @@ def _dt_brs_to_iso(d: str, t: str) -> datetime:
 # -----------------------
 # Regex (line-based) — layout "Dados Gerais"
 # -----------------------
-
-# Cabeçalho da declaração
-_DECL_NUM_RE = re.compile(r"No\.\s*da\s*Declara[çc][ãa]o\s*:\s*(.+)", re.IGNORECASE)
-_TIPO_RE = re.compile(r"Tipo\s*:\s*(.+)", re.IGNORECASE)
+# Campos "Rótulo : valor" vêm do LabelIndex (uma passada pelo texto); as
+# regex abaixo só rodam sobre a linha já localizada por ele. Todas casam o
+# texto normalizado (normalize.py): minúsculo, sem acentos, um espaço entre
+# as palavras — sem IGNORECASE nem alternâncias de acento.
 
 # Bloco Via de Transporte/Situação
-_VIA_RE = re.compile(r"Via\s+de\s+Transporte\s*:\s*([A-ZÇÃ]+)", re.IGNORECASE)
+_VIA_RE = re.compile(r"[a-z]+")  # sobre o valor dobrado (mesmos offsets)
 _SOL_RE = re.compile(
-    r"Declara[çc][ãa]o\s+solicitada\s+em\s+(\d{2}/\d{2}/\d{4})\s+às\s+(\d{2}:\d{2}:\d{2})\s*hs,\s*pelo\s*CPF\s*:\s*([\d\.\-]+)",
-    re.IGNORECASE,
+    r"declaracao solicitada em (\d{2}/\d{2}/\d{4}) as (\d{2}:\d{2}:\d{2}) ?hs, ?"
+    r"pelo ?cpf ?: ?([\d.\-]+)"
 )
 _REG_RE = re.compile(
-    r"Declara[çc][ãa]o\s+registrada\s+em\s+(\d{2}/\d{2}/\d{4})\s+às\s+(\d{2}:\d{2}:\d{2})\s*hs,\s*pelo\s*CPF\s*:\s*([\d\.\-]+)",
-    re.IGNORECASE,
-)
-_SEM_VEIC_RE = re.compile(
-    r"Esta\s+declara[çc][ãa]o\s+ainda\s+n[aã]o\s+tem\s+ve[ií]culo\(s\)\s+informado\(s\)",
-    re.IGNORECASE,
-)
-_TEM_VEIC_RE = re.compile(
-    r"Esta\s+declara[çc][ãa]o\s+tem\s+ve[ií]culo\(s\)\s+informado\(s\)",
-    re.IGNORECASE,
-)
-_DOSS_RE = re.compile(
-    r"dossi[êe]\(s\)\s+vinculado\(s\)\s*:\s*([0-9\-\s,;]+)",
-    re.IGNORECASE,
-)
-
-# Origem/Destino
-_ORIG_DEST_RE = re.compile(
-    r"""
-    ^\s*Origem\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Unidade\s+Local\s*:\s*(?P<orig_ul>[^\r\n]+)\r?\n
-    ^\s*Recinto\s+Aduaneiro\s*:\s*(?P<orig_ra>[^\r\n]+)\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Destino\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Unidade\s+Local\s*:\s*(?P<dest_ul>[^\r\n]+)\r?\n
-    ^\s*Recinto\s+Aduaneiro\s*:\s*(?P<dest_ra>[^\r\n]+)
-    """,
-    re.IGNORECASE | re.MULTILINE | re.VERBOSE,
-)
-
-# Participantes (linhas separadas no Extrato "Dados Gerais")
-_BENEF_DOC_RE = re.compile(
-    r"CNPJ/CPF\s+do\s+Benefici[aá]rio\s*:\s*([^\r\n]+)", re.IGNORECASE
-)
-_BENEF_NOME_RE = re.compile(
-    r"Nome\s+do\s+Benefici[aá]rio\s*:\s*([^\r\n]+)", re.IGNORECASE
-)
-_TRANSP_DOC_RE = re.compile(
-    r"CNPJ/CPF\s+do\s+Transportador\s*:\s*([^\r\n]+)", re.IGNORECASE
+    r"declaracao registrada em (\d{2}/\d{2}/\d{4}) as (\d{2}:\d{2}:\d{2}) ?hs, ?"
+    r"pelo ?cpf ?: ?([\d.\-]+)"
 )
-_TRANSP_NOME_RE = re.compile(
-    r"Nome\s+do\s+Transportador\s*:\s*([^\r\n]+)", re.IGNORECASE
+_SEM_VEIC_RE = re.compile(r"esta declaracao ainda nao tem veiculo\(s\) informado\(s\)")
+_TEM_VEIC_RE = re.compile(r"esta declaracao tem veiculo\(s\) informado\(s\)")
+_DOSS_RE = re.compile(r"dossie\(s\) vinculado\(s\) ?: ?([0-9\-\s,;]+)")
+# linhas de continuação da lista de dossiês (só números e separadores)
+_DOSS_CONT_RE = re.compile(r"[0-9\- ,;]+")
+
+# Blocos multi-linha: casados linha a linha, em tempo linear (LineBlock)
+_ORIG_DEST = LineBlock(
+    r"origem",
+    r"unidade local ?: ?(?P<orig_ul>.+)",
+    r"recinto aduaneiro ?: ?(?P<orig_ra>.+)",
+    r"destino$",
+    r"unidade local ?: ?(?P<dest_ul>.+)",
+    r"recinto aduaneiro ?: ?(?P<dest_ra>.+)",
 )
 
 # Totais
-_TOTAIS_RE = re.compile(
-    r"""
-    ^\s*Tratamento\s+na\s+Origem/Totais\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Tipo\s*:\s*(?P<tipo>[^\r\n]+)\r?\n
-    ^\s*Valor\s+Total\s+do\s+Tr[aâ]nsito\s+em\s+D[oó]lar\s*:\s*(?P<usd>[0-9\.\,]+)\r?\n
-    ^\s*Valor\s+Total\s+do\s+Tr[aâ]nsito\s+na\s+Moeda\s+Nacional\s*:\s*(?P<brl>[0-9\.\,]+)
-    """,
-    re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+_TOTAIS = LineBlock(
+    r"tratamento na origem/totais",
+    r"tipo ?: ?(?P<tipo>.+)",
+    r"valor total do transito em dolar ?: ?(?P<usd>[0-9.,]+)",
+    r"valor total do transito na moeda nacional ?: ?(?P<brl>[0-9.,]+)",
 )
 
-# Situação Atual (quando existir no final — opcional)
-_SIT_ATUAL_RE = re.compile(
-    r"^\s*Situa[çc][ãa]o\s+Atual\s*(.+?)(?:\n\s*Cargas\b|$)",
-    re.IGNORECASE | re.DOTALL | re.MULTILINE,
-)
+# Situação Atual (quando existir no final — opcional): o resto da linha
+_SIT_ATUAL = TextAfter(r"situacao atual", to_line_end=True, line_start=True)
+
+# Início da seção "Cargas": tudo que os parsers usam vem antes dela
+_CARGAS = LineStart(r"cargas\b")
 
 # -----------------------
 # Parser
@@ -148,113 +126,149 @@ class BrDtaExtratoParser(DocParser):
     Todos os campos de 'situacao' e 'transporte' são opcionais.
     """
 
-    def _try_decl_num(self, text: str) -> str:
-        m = _DECL_NUM_RE.search(text)
-        if not m:
-            return ""
-        return re.sub(r"\D", "", m.group(1).strip())
-
-    def _try_tipo(self, text: str) -> str:
-        m = _TIPO_RE.search(text)
-        return m.group(1).strip() if m else ""
+    # Âncoras para parada antecipada da extração: depois de ver o bloco
+    # Origem/Destino e o início de "Cargas", o restante do PDF é descartável.
+    required_anchors = (_ORIG_DEST, _CARGAS)
+    # layout reconhecido pelo LayoutClassifier (despacho direto)
+    layout = LAYOUT_EXTRATO
+
+    def can_parse(self, text: str) -> bool:
+        """Checagem barata: o texto contém o bloco obrigatório Origem/Destino?"""
+        return _ORIG_DEST.search(text) is not None
+
+    def _try_decl_num(self, text: Union[str, NormalizedText]) -> str:
+        return re.sub(r"\D", "", label_index(text).get("No. da Declaração"))
+
+    def _try_tipo(self, text: Union[str, NormalizedText]) -> str:
+        return label_index(text).get("Tipo")
+
+    @staticmethod
+    def _search_lines(idx: LabelIndex, head: str, rx: re.Pattern):
+        """Regex só nas linhas que começam por `head` (1º match)."""
+        for line_no in idx.line_numbers(head):
+            m = rx.search(idx.folded[line_no])
+            if m:
+                return m
+        return None
+
+    @staticmethod
+    def _search_doss(idx: LabelIndex):
+        """Lista de dossiês: a linha da frase + continuações só numéricas."""
+        for head in ("Esta declaração possui", "Esta declaração tem"):
+            for line_no in idx.line_numbers(head):
+                block = [idx.folded[line_no]]
+                for nxt in islice(idx.folded, line_no + 1, None):
+                    if not _DOSS_CONT_RE.fullmatch(nxt):
+                        break
+                    block.append(nxt)
+                m = _DOSS_RE.search("\n".join(block))
+                if m:
+                    return m
+        return None
 
     def _parse_via_situacao(
-        self, text: str
-    ) -> tuple[Optional[Transporte], Optional[Situacao]]:
-        transp = Transporte()
-        sit = Situacao()
-
-        mv = _VIA_RE.search(text)
-        if mv:
-            transp.via = mv.group(1).upper()
-
-        ms = _SOL_RE.search(text)
+        self, text: Union[str, NormalizedText], fields: Fields = None
+    ) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Blocos Transporte e Situação como dicts (validados junto com o
+        documento); só os campos encontrados entram (exclude_unset). Um
+        bloco fora de `fields` nem é procurado.
+        """
+        transp: Dict[str, Any] = {}
+        sit: Dict[str, Any] = {}
+        idx = label_index(text)
+
+        if wants(fields, "transporte"):
+            via = idx.get("Via de Transporte")
+            mv = _VIA_RE.match(fold(via))
+            if mv:
+                transp["via"] = via[: mv.end()].upper()
+        if not wants(fields, "situacao"):
+            return transp or None, None
+
+        ms = self._search_lines(idx, "Declaração solicitada em", _SOL_RE)
         if ms:
-            sit.solicitada_em = _dt_brs_to_iso(ms.group(1), ms.group(2))
-            sit.solicitada_por_cpf = ms.group(3)
+            sit["solicitada_em"] = _dt_brs_to_iso(ms.group(1), ms.group(2))
+            sit["solicitada_por_cpf"] = ms.group(3)
 
-        mr = _REG_RE.search(text)
+        mr = self._search_lines(idx, "Declaração registrada em", _REG_RE)
         if mr:
-            sit.registrada_em = _dt_brs_to_iso(mr.group(1), mr.group(2))
-            sit.registrada_por_cpf = mr.group(3)
+            sit["registrada_em"] = _dt_brs_to_iso(mr.group(1), mr.group(2))
+            sit["registrada_por_cpf"] = mr.group(3)
 
-        if _SEM_VEIC_RE.search(text):
-            sit.veiculos_informados = False
-        elif _TEM_VEIC_RE.search(text):
-            sit.veiculos_informados = True
-        # se nenhum dos dois casar, permanece None
+        if self._search_lines(idx, "Esta declaração ainda", _SEM_VEIC_RE):
+            sit["veiculos_informados"] = False
+        elif self._search_lines(idx, "Esta declaração tem", _TEM_VEIC_RE):
+            sit["veiculos_informados"] = True
+        # se nenhum dos dois casar, fica de fora (None)
 
-        md = _DOSS_RE.search(text)
+        md = self._search_doss(idx)
         if md:
             raw = md.group(1).strip()
             tokens = re.split(r"[,\s;]+", raw)
-            sit.dossies_vinculados = [t for t in tokens if t]
+            sit["dossies_vinculados"] = [t for t in tokens if t]
 
         # Se ambos vazios, retorna None para não criar blocos em branco
-        transp_out = transp if transp.via is not None else None
-        has_sit = any(
-            v is not None and (v != [] if isinstance(v, list) else True)
-            for v in [
-                sit.solicitada_em,
-                sit.solicitada_por_cpf,
-                sit.registrada_em,
-                sit.registrada_por_cpf,
-                sit.veiculos_informados,
-                getattr(sit, "dossies_vinculados", []),
-            ]
-        )
-        sit_out = sit if has_sit else None
-        return transp_out, sit_out
-
-    def parse(self, text: str) -> DocumentoDados:
-        # Nº e Tipo da Declaração
-        decl_num = self._try_decl_num(text)
-        tipo = self._try_tipo(text)
+        has_sit = any(v != [] for v in sit.values())
+        return transp or None, sit if has_sit else None
+
+    def parse(
+        self, text: Union[str, NormalizedText], fields: Fields = None
+    ) -> DocumentoDados:
+        """
+        `fields` (ver core.domain.fields) limita as seções calculadas; o
+        bloco Origem/Destino é sempre lido: é ele que reconhece o layout.
+        O texto é normalizado uma vez (ou já chega normalizado do caso de
+        uso) e o mesmo documento vai aos blocos e ao LabelIndex.
+        """
+        doc = normalized(text)
 
         # Origem/Destino
-        m = _ORIG_DEST_RE.search(text)
+        m = _ORIG_DEST.search(doc)
         if not m:
             raise ValueError("Blocos Origem/Destino não encontrados no texto.")
 
-        oul = UnidadeLocal(**_split_code_desc(m.group("orig_ul")))
-        ora = RecintoAduaneiro(**_split_code_desc(m.group("orig_ra")))
-        dul = UnidadeLocal(**_split_code_desc(m.group("dest_ul")))
-        dra = RecintoAduaneiro(**_split_code_desc(m.group("dest_ra")))
+        # a árvore é montada em dicts e validada uma vez só, no fim
+        # (DocumentoDados.from_parsed); códigos e máscaras já casaram aqui
+        data: Dict[str, Any] = {
+            "origem": {
+                "unidade_local": UNIDADES_LOCAIS.get(m["orig_ul"], _split_code_desc),
+                "recinto_aduaneiro": RECINTOS.get(m["orig_ra"], _split_code_desc),
+            },
+            "destino": {
+                "unidade_local": UNIDADES_LOCAIS.get(m["dest_ul"], _split_code_desc),
+                "recinto_aduaneiro": RECINTOS.get(m["dest_ra"], _split_code_desc),
+            },
+        }
 
-        doc = DocumentoDados(
-            declaracao=DeclaracaoInfo(numero=decl_num, tipo=tipo),
-            # 'situacao_atual' pode aparecer em um bloco separado; preenchido adiante
-            situacao_atual="",
-            origem=Localidade(unidade_local=oul, recinto_aduaneiro=ora),
-            destino=Localidade(unidade_local=dul, recinto_aduaneiro=dra),
-        )
+        # Nº e Tipo da Declaração
+        if wants(fields, "declaracao"):
+            data["declaracao"] = {
+                "numero": self._try_decl_num(doc),
+                "tipo": self._try_tipo(doc),
+            }
+        # 'situacao_atual' pode aparecer em um bloco separado; preenchido adiante
+        if wants(fields, "situacao_atual"):
+            data["situacao_atual"] = ""
 
         # Beneficiário/Transportador — no "Dados Gerais" vêm em linhas separadas
-        bdoc = _BENEF_DOC_RE.search(text)
-        bnome = _BENEF_NOME_RE.search(text)
-        if bdoc and bnome:
-            benef_raw = f"{bdoc.group(1).strip()} - {bnome.group(1).strip()}"
-            if DOC_MASK.match(benef_raw):
-                doc.beneficiario = Participante.from_raw(benef_raw)
-
-        tdoc = _TRANSP_DOC_RE.search(text)
-        tnome = _TRANSP_NOME_RE.search(text)
-        if tdoc and tnome:
-            transp_raw = f"{tdoc.group(1).strip()} - {tnome.group(1).strip()}"
-            if DOC_MASK.match(transp_raw):
-                doc.transportador = Participante.from_raw(transp_raw)
+        for attr, papel in (
+            ("beneficiario", "Beneficiário"),
+            ("transportador", "Transportador"),
+        ):
+            if not wants(fields, attr):
+                continue
+            idx = label_index(doc)
+            documento = idx.get(f"CNPJ/CPF do {papel}")
+            nome = idx.get(f"Nome do {papel}")
+            participante = PARTICIPANTES.get(f"{documento} - {nome}", _participante)
+            if documento and nome and participante:
+                data[attr] = participante
 
         # Totais
-        t = _TOTAIS_RE.search(text)
+        t = _TOTAIS.search(doc) if wants(fields, "totais_origem") else None
         if t:
-            tipo_raw = (t.group("tipo") or "").strip().upper()
-
-            def _normalize_tipo(v: str) -> str:
-                if "ARMAZEN" in v:
-                    return "ARMAZENAMENTO"
-                if not v or v in {"N/A", "-"}:
-                    return "DESCONHECIDO"
-                return "OUTRO"
+            tipo_raw = (t["tipo"] or "").strip().upper()
 
             def _norm_tipo_totais(v: str | None) -> TipoTotais:
                 if not v:
@@ -267,30 +281,30 @@ class BrDtaExtratoParser(DocParser):
 
             usd = brl = None
             try:
-                usd = parse_money_ptbr(t.group("usd"))
-                brl = parse_money_ptbr(t.group("brl"))
+                usd = parse_money_ptbr(t["usd"])
+                brl = parse_money_ptbr(t["brl"])
             except Exception:
                 pass
 
-            doc.totais_origem = TotaisOrigem(
-                tipo=_norm_tipo_totais(tipo_raw),
-                valor_total_usd=usd,
-                valor_total_brl=brl,
-            )
+            data["totais_origem"] = {
+                "tipo": _norm_tipo_totais(tipo_raw),
+                "valor_total_usd": usd,
+                "valor_total_brl": brl,
+            }
 
         # Via de Transporte / Situação (opcional)
-        transp_blk, sit_blk = self._parse_via_situacao(text)
-        if transp_blk:
-            doc.transporte = transp_blk
-        if sit_blk:
-            doc.situacao = sit_blk
+        if wants(fields, "transporte") or wants(fields, "situacao"):
+            transp_blk, sit_blk = self._parse_via_situacao(doc, fields)
+            if transp_blk:
+                data["transporte"] = transp_blk
+            if sit_blk:
+                data["situacao"] = sit_blk
 
         # Situação Atual (texto livre — opcional, quando existir neste layout)
-        ms = _SIT_ATUAL_RE.search(text)
-        if ms:
-            bloco = ms.group(1).strip()
-            # limpeza básica
-            bloco = re.sub(r"javascript:history\.back\(\);\s*", "", bloco)
-            doc.situacao_atual = re.sub(r"[ \t]+$", "", bloco, flags=re.MULTILINE)
+        sit_atual = _SIT_ATUAL.search(doc) if "situacao_atual" in data else None
+        if sit_atual:
+            # o boilerplate (javascript:history.back()) já saiu na normalização
+            bloco = sit_atual.strip()
+            data["situacao_atual"] = re.sub(r"[ \t]+$", "", bloco, flags=re.MULTILINE)
 
-        return doc
+        return DocumentoDados.from_parsed(data)
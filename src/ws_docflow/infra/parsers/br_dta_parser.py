@@ -3,18 +3,20 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal
-from typing import Dict, Literal
+from typing import Any, Dict, Literal, Optional, Union
 
 from ws_docflow.core.ports import DocParser
-from ws_docflow.core.domain.models import (
-    DocumentoDados,
-    Localidade,
-    UnidadeLocal,
-    RecintoAduaneiro,
-    Participante,
-    TotaisOrigem,
-    DeclaracaoInfo,
+from ws_docflow.infra.parsers.blocks import LineBlock, LineStart, TextAfter
+from ws_docflow.infra.parsers.classifier import LAYOUT_CLASSICO
+from ws_docflow.infra.parsers.interning import (
+    PARTICIPANTES,
+    RECINTOS,
+    UNIDADES_LOCAIS,
 )
+from ws_docflow.infra.parsers.label_index import label_index
+from ws_docflow.infra.parsers.normalize import NormalizedText, normalized
+from ws_docflow.core.domain.fields import Fields, wants
+from ws_docflow.core.domain.models import DocumentoDados
 
 # -----------------------
 # Utilidades / helpers
@@ -35,6 +37,14 @@ def _split_code_desc(raw: str) -> Dict[str, str]:
     return {"codigo": m.group(1), "descricao": m.group(2)}
 
 
+def _participante(raw: str) -> Optional[Dict[str, str]]:
+    """ "documento - nome" → campos do Participante (máscara casada uma vez)."""
+    m = DOC_MASK.match(raw.strip())
+    if not m:
+        return None
+    return {"documento": m.group(1), "nome": m.group(2)}
+
+
 def parse_money_ptbr(raw: str) -> Decimal:
     s = raw.strip().replace(".", "").replace(",", ".")
     return Decimal(s)
@@ -53,44 +63,27 @@ def _normalize_tipo_totais(valor: str) -> TipoTotais:
 # Regex (line-based)
 # -----------------------
 
-_DECL_NUM_RE = re.compile(r"N[ºo]\s*da\s*Declara[çc][ãa]o:\s*(.+)", re.IGNORECASE)
-_TIPO_RE = re.compile(r"Tipo:\s*(.+)", re.IGNORECASE)
-_SIT_ATUAL_RE = re.compile(
-    r"Situa[çc][ãa]o\s*Atual\s*(.+?)(?:\n\s*Cargas\b|$)", re.IGNORECASE | re.DOTALL
-)
+# Blocos multi-linha: casados linha a linha, em tempo linear (blocks.py),
+# sobre o texto normalizado (normalize.py: minúsculo, sem acentos, um espaço)
+_SIT_ATUAL = TextAfter(r"situacao ?atual", until=r"cargas\b")
 
-_ORIG_DEST_REGEX = re.compile(
-    r"""
-    ^\s*Origem\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Unidade\s+Local:\s*(?P<orig_ul>[^\r\n]+)\r?\n
-    ^\s*Recinto\s+Aduaneiro:\s*(?P<orig_ra>[^\r\n]+)\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Destino\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Unidade\s+Local:\s*(?P<dest_ul>[^\r\n]+)\r?\n
-    ^\s*Recinto\s+Aduaneiro:\s*(?P<dest_ra>[^\r\n]+)
-    """,
-    re.IGNORECASE | re.MULTILINE | re.VERBOSE,
-)
+# Início da seção "Cargas": tudo que os parsers usam vem antes dela
+_CARGAS = LineStart(r"cargas\b")
 
-_PARTICIPANTES_REGEX = re.compile(
-    r"""
-    ^\s*CNPJ/CPF\s+do\s+Benefici[aá]rio:\s*(?P<benef>[^\r\n]+)\r?\n
-    ^\s*CNPJ/CPF\s+do\s+Transportador:\s*(?P<transp>[^\r\n]+)
-    """,
-    re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+_ORIG_DEST = LineBlock(
+    r"origem",
+    r"unidade local: ?(?P<orig_ul>.+)",
+    r"recinto aduaneiro: ?(?P<orig_ra>.+)",
+    r"destino$",
+    r"unidade local: ?(?P<dest_ul>.+)",
+    r"recinto aduaneiro: ?(?P<dest_ra>.+)",
 )
 
-_TOTAIS_REGEX = re.compile(
-    r"""
-    ^\s*Tratamento\s+na\s+Origem\s+Totais\s*\r?\n
-    (?:\s*\r?\n)*
-    ^\s*Tipo:\s*(?P<tipo>[^\r\n]+)\r?\n
-    ^\s*Valor\s+Total\s+do\s+Tr[aâ]nsito\s+em\s+D[oó]lar\s+Americano:\s*(?P<usd>[0-9\.\,]+)\r?\n
-    ^\s*Valor\s+Total\s+do\s+Tr[aâ]nsito\s+em\s+Real:\s*(?P<brl>[0-9\.\,]+)
-    """,
-    re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+_TOTAIS = LineBlock(
+    r"tratamento na origem totais",
+    r"tipo: ?(?P<tipo>.+)",
+    r"valor total do transito em dolar americano: ?(?P<usd>[0-9.,]+)",
+    r"valor total do transito em real: ?(?P<brl>[0-9.,]+)",
 )
 
 
@@ -110,71 +103,94 @@ class BrDtaParser(DocParser):
     - Totais na origem
     """
 
-    def parse(self, text: str) -> DocumentoDados:
-        # Declaração
-        decl_num = ""
-        tipo = ""
-        situacao_atual = ""
-
-        m_num = _DECL_NUM_RE.search(text)
-        if m_num:
-            decl_num = re.sub(r"\D", "", m_num.group(1).strip())
-
-        m_tipo = _TIPO_RE.search(text)
-        if m_tipo:
-            tipo = m_tipo.group(1).strip()
-
-        m_sit = _SIT_ATUAL_RE.search(text)
-        if m_sit:
-            bloco = m_sit.group(1).strip()
-            bloco = re.sub(r"javascript:history\.back\(\);\s*", "", bloco)
-            situacao_atual = re.sub(r"[ \t]+$", "", bloco, flags=re.MULTILINE)
+    # Âncoras para parada antecipada da extração: depois de ver o bloco
+    # Origem/Destino e o início de "Cargas", o restante do PDF é descartável.
+    required_anchors = (_ORIG_DEST, _CARGAS)
+    # layout reconhecido pelo LayoutClassifier (despacho direto)
+    layout = LAYOUT_CLASSICO
+
+    def can_parse(self, text: str) -> bool:
+        """Checagem barata: o texto contém o bloco obrigatório Origem/Destino?"""
+        return _ORIG_DEST.search(text) is not None
+
+    def parse(
+        self, text: Union[str, NormalizedText], fields: Fields = None
+    ) -> DocumentoDados:
+        """
+        `fields` (ver core.domain.fields) limita as seções calculadas; o
+        bloco Origem/Destino é sempre lido: é ele que reconhece o layout.
+        O texto é normalizado uma vez (ou já chega normalizado do caso de
+        uso) e o mesmo documento vai aos blocos e ao LabelIndex.
+        """
+        doc = normalized(text)
 
         # Origem/Destino
-        m = _ORIG_DEST_REGEX.search(text)
+        m = _ORIG_DEST.search(doc)
         if not m:
             raise ValueError("Blocos Origem/Destino não encontrados no texto.")
 
-        oul = UnidadeLocal(**_split_code_desc(m.group("orig_ul")))
-        ora = RecintoAduaneiro(**_split_code_desc(m.group("orig_ra")))
-        dul = UnidadeLocal(**_split_code_desc(m.group("dest_ul")))
-        dra = RecintoAduaneiro(**_split_code_desc(m.group("dest_ra")))
-
-        doc = DocumentoDados(
-            declaracao=DeclaracaoInfo(numero=decl_num, tipo=tipo),
-            situacao_atual=situacao_atual,
-            origem=Localidade(unidade_local=oul, recinto_aduaneiro=ora),
-            destino=Localidade(unidade_local=dul, recinto_aduaneiro=dra),
-        )
-
-        # Participantes
-        p = _PARTICIPANTES_REGEX.search(text)
-        if p:
-            benef_raw = p.group("benef").strip()
-            transp_raw = p.group("transp").strip()
-            if DOC_MASK.match(benef_raw):
-                doc.beneficiario = Participante.from_raw(benef_raw)
-            if DOC_MASK.match(transp_raw):
-                doc.transportador = Participante.from_raw(transp_raw)
+        # árvore em dicts, validada uma vez só no fim (DocumentoDados.from_parsed)
+        data: Dict[str, Any] = {
+            "origem": {
+                "unidade_local": UNIDADES_LOCAIS.get(m["orig_ul"], _split_code_desc),
+                "recinto_aduaneiro": RECINTOS.get(m["orig_ra"], _split_code_desc),
+            },
+            "destino": {
+                "unidade_local": UNIDADES_LOCAIS.get(m["dest_ul"], _split_code_desc),
+                "recinto_aduaneiro": RECINTOS.get(m["dest_ra"], _split_code_desc),
+            },
+        }
+
+        # Declaração — campos "Rótulo: valor": uma passada pelo texto (LabelIndex)
+        if wants(fields, "declaracao"):
+            idx = label_index(doc)
+            data["declaracao"] = {
+                # "Nº" e "No" têm a mesma chave normalizada
+                "numero": re.sub(r"\D", "", idx.get("Nº da Declaração")),
+                "tipo": idx.get("Tipo"),
+            }
+
+        if wants(fields, "situacao_atual"):
+            situacao_atual = ""
+            sit_atual = _SIT_ATUAL.search(doc)
+            if sit_atual:
+                # o boilerplate (javascript:history.back()) já saiu na normalização
+                bloco = sit_atual.strip()
+                situacao_atual = re.sub(r"[ \t]+$", "", bloco, flags=re.MULTILINE)
+            data["situacao_atual"] = situacao_atual
+
+        # Participantes: beneficiário e, na linha seguinte, o transportador
+        benef = transp = None
+        if wants(fields, "beneficiario") or wants(fields, "transportador"):
+            idx = label_index(doc)
+            benef = idx.entry("CNPJ/CPF do Beneficiário")
+            transp = idx.entry("CNPJ/CPF do Transportador")
+        if benef and transp and transp.line_no == benef.line_no + 1:
+            beneficiario = PARTICIPANTES.get(benef.value, _participante)
+            transportador = PARTICIPANTES.get(transp.value, _participante)
+            if beneficiario and wants(fields, "beneficiario"):
+                data["beneficiario"] = beneficiario
+            if transportador and wants(fields, "transportador"):
+                data["transportador"] = transportador
 
         # Totais
-        t = _TOTAIS_REGEX.search(text)
+        t = _TOTAIS.search(doc) if wants(fields, "totais_origem") else None
         if t:
-            tipo_raw = t.group("tipo").strip()
+            tipo_raw = t["tipo"].strip()
             tipo_tot: TipoTotais = _normalize_tipo_totais(tipo_raw)
 
             usd = brl = None
             try:
-                usd = parse_money_ptbr(t.group("usd"))
-                brl = parse_money_ptbr(t.group("brl"))
+                usd = parse_money_ptbr(t["usd"])
+                brl = parse_money_ptbr(t["brl"])
             except Exception:
                 # mantém None se parsing falhar
                 pass
 
-            doc.totais_origem = TotaisOrigem(
-                tipo=tipo_tot,
-                valor_total_usd=usd,
-                valor_total_brl=brl,
-            )
+            data["totais_origem"] = {
+                "tipo": tipo_tot,
+                "valor_total_usd": usd,
+                "valor_total_brl": brl,
+            }
 
-        return doc
+        return DocumentoDados.from_parsed(data)
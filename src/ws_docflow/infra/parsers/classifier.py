@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ws_docflow.infra.parsers.normalize import NormalizedText, normalized
+
+# -----------------------
+# Assinaturas por layout
+# -----------------------
+# Âncoras baratas (uma busca cada) que só aparecem num dos layouts. Pesos
+# somam 1.0 por layout; casam o texto da extração (pdfplumber/pypdf/OCR) já
+# normalizado (normalize.py): minúsculo, sem acentos, um espaço entre
+# palavras e linhas sem espaços nas pontas.
+
+LAYOUT_EXTRATO = "extrato"
+LAYOUT_CLASSICO = "classico"
+
+_SIGNATURES: Dict[str, Tuple[Tuple[re.Pattern, float], ...]] = {
+    LAYOUT_EXTRATO: (
+        (re.compile(r"^dados gerais$", re.M), 0.3),
+        (re.compile(r"no\. ?da ?declaracao :"), 0.3),
+        (re.compile(r"^tratamento na origem/totais", re.M), 0.2),
+        (re.compile(r"^unidade local :", re.M), 0.2),
+    ),
+    LAYOUT_CLASSICO: (
+        (re.compile(r"no ?da ?declaracao:"), 0.3),
+        (re.compile(r"^tratamento na origem totais", re.M), 0.3),
+        (re.compile(r"^unidade local:", re.M), 0.2),
+        (re.compile(r"^recinto aduaneiro:", re.M), 0.2),
+    ),
+}
+
+# as âncoras ficam no início (1ª–2ª página); a cauda "Cargas" não é varrida
+_HEAD_CHARS = 6_000
+
+
+class LayoutGuess(NamedTuple):
+    """Layout provável (None = nenhuma âncora) e a confiança, de 0.0 a 1.0."""
+
+    layout: Optional[str]
+    confidence: float
+
+
+class LayoutClassifier:
+    """
+    Classificador rápido de layout por assinaturas: pontua cada layout pelas
+    âncoras encontradas e devolve o melhor com confiança = vantagem sobre o
+    segundo colocado (1.0 = todas as âncoras de um, nenhuma do outro).
+    Serve para despachar direto ao parser certo (atributo `layout` dos
+    parsers), deixando a cadeia de fallback só para os casos duvidosos.
+    """
+
+    def __init__(
+        self,
+        signatures: Optional[Dict[str, Sequence[Tuple[re.Pattern, float]]]] = None,
+        head_chars: int = _HEAD_CHARS,
+    ) -> None:
+        self.signatures = signatures or _SIGNATURES
+        self.head_chars = head_chars
+
+    def scores(self, text: Union[str, NormalizedText]) -> Dict[str, float]:
+        head = normalized(text).text[: self.head_chars]
+        return {
+            layout: round(sum(w for rx, w in anchors if rx.search(head)), 6)
+            for layout, anchors in self.signatures.items()
+        }
+
+    def classify(self, text: Union[str, NormalizedText]) -> LayoutGuess:
+        ranked = sorted(self.scores(text).items(), key=lambda kv: kv[1], reverse=True)
+        if not ranked or ranked[0][1] <= 0:
+            return LayoutGuess(None, 0.0)
+        best, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        return LayoutGuess(best, round(score - runner_up, 6))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from ws_docflow.core.domain.models import (
+    Participante,
+    RecintoAduaneiro,
+    UnidadeLocal,
+    build_model,
+)
+from ws_docflow.infra.lru import LruCache
+
+M = TypeVar("M", bound=BaseModel)
+
+# -----------------------
+# Entidades de referência compartilhadas entre documentos
+# -----------------------
+# Num lote (ou num worker de vida longa) as mesmas poucas dezenas de
+# unidades locais/recintos ("1017700 - PORTO DE RIO GRANDE") e os
+# participantes frequentes se repetem em milhares de DTAs. Em vez de um
+# modelo validado novo (e strings novas) por documento, cada texto bruto
+# vira UMA instância imutável (modelos frozen), reaproveitada por todos:
+# o acerto pula a regex e a validação, e o DocumentoDados só guarda a
+# referência (o pydantic não revalida instâncias já construídas).
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class Interner(Generic[M]):
+    """
+    Texto bruto ("código - descrição") → instância compartilhada de `model`,
+    num LRU limitado (`max_entries`; 0 desliga o compartilhamento).
+    Contadores de acerto/erro são aproximados sob concorrência.
+    """
+
+    def __init__(self, model: Type[M], max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.model = model
+        self._cache: LruCache[str, M] = LruCache(max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, raw: str, parse: Callable[[str], Optional[Dict[str, Any]]]
+    ) -> Optional[M]:
+        """
+        Instância para `raw`; num erro de cache, `parse` separa os campos
+        (None = formato não reconhecido → None, nada é guardado).
+        """
+        found = self._cache.get(raw)
+        if found is not None:
+            self.hits += 1
+            return found
+        fields = parse(raw)
+        if fields is None:
+            return None
+        self.misses += 1
+        instance = build_model(self.model, fields)
+        self._cache.put(raw, instance)
+        return instance
+
+    def resize(self, max_entries: int) -> None:
+        self._cache = LruCache(max_entries)
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+UNIDADES_LOCAIS: Interner[UnidadeLocal] = Interner(UnidadeLocal)
+RECINTOS: Interner[RecintoAduaneiro] = Interner(RecintoAduaneiro)
+PARTICIPANTES: Interner[Participante] = Interner(Participante)
+
+_ALL: Dict[str, Interner[Any]] = {
+    "unidades_locais": UNIDADES_LOCAIS,
+    "recintos": RECINTOS,
+    "participantes": PARTICIPANTES,
+}
+
+
+def set_intern_limit(max_entries: int) -> None:
+    """Limite de entradas de cada tabela (esvazia as tabelas)."""
+    for interner in _ALL.values():
+        interner.resize(max_entries)
+
+
+def intern_stats() -> Dict[str, Dict[str, int]]:
+    return {name: interner.stats() for name, interner in _ALL.items()}
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from functools import cached_property, lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from ws_docflow.infra.parsers.normalize import NormalizedText, fold, normalized
+
+# -----------------------
+# Índice rótulo → valor, montado numa única passada pelo texto
+# -----------------------
+# A varredura é feita sobre o texto normalizado (normalize.py: sem acentos,
+# minúsculo, um espaço entre palavras); os valores saem do original.
+
+# título da seção que encerra a varredura: tudo que os parsers usam vem
+# antes de "Cargas" (a cauda com milhares de linhas nunca é indexada)
+_STOP_HEAD = "cargas"
+
+# nº de palavras do "início de linha" indexado (frases sem dois-pontos,
+# ex.: "Declaração solicitada em ...", "Esta declaração tem ...")
+_HEAD_WORDS = 3
+
+
+@lru_cache(maxsize=1024)
+def label_key(label: str) -> str:
+    """Chave do rótulo: sem acentos (º → o), minúsculo e sem espaços."""
+    return "".join(fold(label).split())
+
+
+def _head_key(line: str) -> str:
+    """Chave das primeiras palavras de uma linha já normalizada."""
+    return "".join(line.split(" ", _HEAD_WORDS)[:_HEAD_WORDS])
+
+
+def _separator(line: str) -> int:
+    """
+    Posição dos dois-pontos que separam rótulo e valor: o primeiro que não
+    está entre dígitos (horários como "16:30:23" não contam). -1 se não há.
+    """
+    i = line.find(":")
+    while i != -1:
+        if not (
+            0 < i < len(line) - 1 and line[i - 1].isdigit() and line[i + 1].isdigit()
+        ):
+            return i
+        i = line.find(":", i + 1)
+    return -1
+
+
+def _is_stop(line: str, head: str) -> bool:
+    """Linha-título `head` (ex.: "Cargas", "Cargas (3)")?"""
+    n = len(head)
+    return line.startswith(head) and (len(line) == n or not line[n].isalnum())
+
+
+class Entry(NamedTuple):
+    """Valor (sem espaços nas pontas), offset do início da linha e nº da linha."""
+
+    value: str
+    offset: int
+    line_no: int
+
+
+class LabelIndex:
+    """
+    Percorre o texto uma vez e indexa:
+      - linhas "Rótulo : valor" → 1ª ocorrência de cada rótulo (chave
+        normalizada: acentos, caixa e espaços não importam);
+      - as primeiras palavras de cada linha → linhas que começam assim
+        (frases sem rótulo).
+    A varredura para na linha-título `stop_head` ("Cargas"): o custo cresce
+    com o cabeçalho do documento, não com a cauda de cargas nem com o
+    número de campos. Os parsers leem os campos daqui em O(1), em vez de
+    uma busca por regex no texto inteiro para cada campo.
+
+    `folded` guarda as linhas normalizadas (para as regex simples dos
+    parsers); `lines`, as mesmas linhas como estão no original.
+    """
+
+    def __init__(
+        self, text: Union[str, NormalizedText], stop_head: Optional[str] = _STOP_HEAD
+    ) -> None:
+        doc = normalized(text)
+        self._doc = doc
+        self._spans: List[Tuple[int, int]] = []
+        self.folded: List[str] = []
+        self._labels: Dict[str, Entry] = {}
+        self._heads: Dict[str, List[int]] = {}
+
+        norm = doc.text
+        offset = 0
+        size = len(norm)
+        while offset <= size:
+            end = norm.find("\n", offset)
+            if end == -1:
+                end = size
+            line = norm[offset:end]
+            if line:
+                if stop_head and _is_stop(line, stop_head):
+                    break
+                line_no = len(self.folded)
+                self._heads.setdefault(_head_key(line), []).append(line_no)
+                sep = _separator(line)
+                if sep > 0:
+                    key = line[:sep].replace(" ", "")
+                    if key not in self._labels:
+                        value = doc.verbatim(offset + sep + 1, end).strip()
+                        self._labels[key] = Entry(
+                            value, doc.to_original(offset), line_no
+                        )
+            self._spans.append((offset, end))
+            self.folded.append(line)
+            offset = end + 1
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """Linhas como estão no original (montadas só se alguém pedir)."""
+        return [self._doc.verbatim(start, end) for start, end in self._spans]
+
+    def entry(self, label: str) -> Optional[Entry]:
+        return self._labels.get(label_key(label))
+
+    def get(self, label: str, default: str = "") -> str:
+        """Valor da 1ª linha com esse rótulo (ou `default`)."""
+        found = self._labels.get(label_key(label))
+        return found.value if found else default
+
+    def line_numbers(self, head: str) -> List[int]:
+        """Linhas que começam pelas palavras dadas (até 3, normalizadas)."""
+        return self._heads.get(_head_key(" ".join(fold(head).split())), [])
+
+    def line(self, head: str) -> Optional[str]:
+        """1ª linha que começa pelas palavras dadas (ou None)."""
+        found = self.line_numbers(head)
+        return self.lines[found[0]].strip() if found else None
+
+
+def label_index(text: Union[str, NormalizedText]) -> LabelIndex:
+    """
+    Índice do documento, guardado no próprio NormalizedText: na cadeia de
+    fallback o mesmo documento passa por mais de um parser e é varrido uma
+    vez só (com `str`, o índice é montado de novo a cada chamada).
+    """
+    doc = normalized(text)
+    idx = doc.derived.get("label_index")
+    if idx is None:
+        idx = doc.derived["label_index"] = LabelIndex(doc)
+    return idx
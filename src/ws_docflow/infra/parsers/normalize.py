@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# -----------------------
+# Texto normalizado (uma vez por documento) + mapa de offsets
+# -----------------------
+# Os parsers casam padrões simples sobre uma versão canônica do texto:
+#   - caixa e acentos dobrados ("Declaração" → "declaracao", "Nº" → "no");
+#   - fim de linha "\n" (CRLF/CR), espaços nas pontas das linhas removidos
+#     e sequências de espaços/tabs/NBSP reduzidas a um espaço;
+#   - boilerplate da página ("javascript:history.back();") removido.
+# Sem `re.IGNORECASE`, sem alternâncias de acento e sem folga `\s*`/`\r?`.
+# Os valores continuam saindo do texto ORIGINAL: o mapa de offsets leva
+# qualquer trecho do texto normalizado de volta ao trecho equivalente
+# (mesma caixa, acentos e espaçamento internos).
+
+_BOILERPLATE = "javascript:history.back();"
+
+# sequências de 2+ espaços (tabs e afins já viraram espaço no `fold`)
+_RUNS = re.compile(r"  +")  # prefixo literal: busca rápida
+_CR = re.compile(r"\r")
+_BOILERPLATE_RE = re.compile(re.escape(_BOILERPLATE))
+
+
+class _FoldTable(dict):
+    """Caractere → um caractere dobrado (tamanho preservado), sob demanda."""
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        decomposed = unicodedata.normalize("NFKD", ch)
+        plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+        plain = plain.lower()
+        if len(plain) != 1 or (code < 256 and ord(plain) >= 256):
+            lower = ch.lower()
+            plain = lower if len(lower) == 1 else ch
+        if plain.isspace() and plain not in "\r\n":
+            plain = " "
+        self[code] = plain
+        return plain
+
+
+# "°" (grau) aparece no lugar de "º" em PDFs e OCR
+_FOLD = _FoldTable({ord("°"): "o"})
+for _tab in "\t\f\v":
+    _FOLD[ord(_tab)] = " "
+
+# caminho rápido (texto em Latin-1, o caso comum em PT-BR): a mesma tabela
+# como bytes.translate, que roda em C sem criar um objeto por caractere
+_LATIN1 = bytes(ord(_FOLD[c]) for c in range(256))
+
+
+def fold(text: str) -> str:
+    """
+    Caixa e acentos dobrados e tabs/NBSP como espaço, caractere a caractere
+    (mesmo tamanho: o offset num é o offset no outro).
+    """
+    try:
+        raw = text.encode("latin-1")
+    except UnicodeEncodeError:
+        return text.translate(_FOLD)
+    return raw.translate(_LATIN1).decode("latin-1")
+
+
+def _edge_spaces(folded: str, line_break: str) -> List[Tuple[int, int]]:
+    """Espaço único colado a uma quebra de linha (as sequências vêm de _RUNS)."""
+    spans = []
+    after = folded.find(line_break + " ")
+    while after != -1:
+        if folded[after + 2 : after + 3] != " ":
+            spans.append((after + 1, after + 2))
+        after = folded.find(line_break + " ", after + 1)
+    before = folded.find(" " + line_break)
+    while before != -1:
+        if not before or folded[before - 1] != " ":
+            spans.append((before, before + 1))
+        before = folded.find(" " + line_break, before + 1)
+    return spans
+
+
+def _edits(folded: str) -> List[Tuple[int, int]]:
+    """
+    Trechos a editar, em ordem (o mesmo espaço pode vir duas vezes, de
+    buscas diferentes; o chamador ignora a repetição). Cada tipo é achado por
+    uma busca literal própria (uma regex com alternância varreria o texto
+    caractere a caractere, dezenas de vezes mais devagar em 6 MB).
+    """
+    spans = _edge_spaces(folded, "\n")
+    if "  " in folded:
+        spans += [m.span() for m in _RUNS.finditer(folded)]
+    if "\r" in folded:
+        spans += [m.span() for m in _CR.finditer(folded)]
+        spans += _edge_spaces(folded, "\r")
+    if _BOILERPLATE in folded:
+        spans += [m.span() for m in _BOILERPLATE_RE.finditer(folded)]
+    size = len(folded)
+    if folded[:1] == " " and folded[1:2] != " ":
+        spans.append((0, 1))
+    if folded[-1:] == " " and folded[-2:-1] != " ":
+        spans.append((size - 1, size))
+    return sorted(spans)
+
+
+class NormalizedText:
+    """
+    `text`: forma canônica do `original` (ver acima). Internamente, trechos
+    alternados: cópia (índices pares, mesmo tamanho no original) e edição
+    (ímpares) — um espaço no lugar de vários, "\\n" no lugar de um CR
+    isolado, ou nada: espaços nas pontas das linhas (que `verbatim` devolve
+    quando estão no meio do trecho pedido), o CR do CRLF e o boilerplate
+    (esses dois descartados de vez).
+
+    `derived` guarda estruturas montadas a partir do documento (ex.: o
+    LabelIndex): vivem e morrem com ele, sem cache global.
+    """
+
+    __slots__ = ("original", "text", "derived", "_starts", "_orig", "_orig_end")
+
+    def __init__(self, original: str) -> None:
+        self.original = original
+        self.derived: Dict[str, Any] = {}
+        folded = fold(original)
+        size = len(folded)
+        parts: List[str] = []
+        orig: List[int] = []
+        orig_end: List[int] = []
+        pos = 0
+        for start, end in _edits(folded):
+            if start < pos:
+                continue  # o mesmo espaço achado por duas buscas
+            parts.append(folded[pos:start])
+            orig.append(pos)
+            orig_end.append(start)
+            first = folded[start]
+            if first == "\r":
+                if folded[end : end + 1] == "\n":
+                    replacement, start = "", end  # CRLF → LF
+                else:
+                    replacement = "\n"
+            elif first == "j":
+                replacement, start = "", end  # boilerplate
+            elif (
+                start == 0
+                or folded[start - 1] in "\r\n"
+                or end == size
+                or folded[end] in "\r\n"
+            ):
+                replacement = ""  # espaços na ponta da linha
+            else:
+                replacement = " "
+            parts.append(replacement)
+            orig.append(start)
+            orig_end.append(end)
+            pos = end
+        parts.append(folded[pos:])
+        orig.append(pos)
+        orig_end.append(size)
+
+        self.text = "".join(parts)
+        self._starts = [0, *accumulate(map(len, parts))]
+        # sentinela: o fim do texto normalizado aponta para o fim do original
+        orig.append(size)
+        orig_end.append(size)
+        self._orig, self._orig_end = orig, orig_end
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def _piece(self, pos: int) -> int:
+        return bisect_right(self._starts, pos) - 1
+
+    def to_original(self, pos: int) -> int:
+        """Offset no texto normalizado → offset equivalente no original."""
+        k = self._piece(min(max(pos, 0), len(self.text)))
+        if k % 2 == 0:
+            return self._orig[k] + (pos - self._starts[k])
+        return self._orig[k]
+
+    def verbatim(self, start: int, end: int) -> str:
+        """
+        Trecho [start, end) do texto normalizado, como está no original:
+        caixa, acentos e espaços internos preservados (os espaços das pontas
+        do trecho e o boilerplate ficam de fora; fim de linha sempre "\\n").
+        """
+        end = min(end, len(self.text))
+        if start >= end:
+            return ""
+        first = self._piece(start)
+        if first % 2 == 0 and end <= self._starts[first + 1]:
+            # caso comum: o trecho cai inteiro numa cópia (fatia direta)
+            delta = self._orig[first] - self._starts[first]
+            return self.original[start + delta : end + delta]
+        last = self._piece(end - 1)
+        chunks = []
+        for k in range(first, last + 1):
+            if k % 2 == 0:
+                a = self._orig[k] + max(start - self._starts[k], 0)
+                b = self._orig[k] + min(end, self._starts[k + 1]) - self._starts[k]
+            else:
+                a, b = self._orig[k], self._orig_end[k]
+            chunk = self.original[a:b]
+            chunks.append("\n" if chunk == "\r" else chunk)
+        return "".join(chunks)
+
+    def group(self, m: re.Match, name: Union[int, str] = 0) -> Optional[str]:
+        """Grupo de um match feito sobre `text`, como está no original."""
+        start, end = m.span(name)
+        return None if start == -1 else self.verbatim(start, end)
+
+
+def normalized(text: Union[str, NormalizedText]) -> NormalizedText:
+    """
+    Forma normalizada do texto. Quem já tem o documento normalizado (caso de
+    uso, parser) o repassa adiante: classificador, parsers da cadeia de
+    fallback e LabelIndex trabalham sobre a mesma instância, sem refazer a
+    normalização e sem cache global (que prenderia documentos inteiros).
+    """
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(text)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+# Cabeçalho que abre cada declaração (extrato: "No. da Declaração :",
+# clássico: "Nº da Declaração:"), com o número até o fim da linha
+_DECL_HEADER_RE = re.compile(
+    r"^[ \t]*N(?:o\.?|º|°)\s*da\s*Declara[çc][ãa]o\s*:(?P<numero>[^\r\n]*)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_NON_DIGITS = re.compile(r"\D+")
+# Títulos que antecedem o cabeçalho e pertencem à mesma declaração
+_TITLE_RE = re.compile(
+    r"^[ \t]*(?:Dados\s+Gerais|.*Extrato\s+da\s+Declara[çc][ãa]o.*)[ \t]*\r?\n"
+    r"(?:[ \t]*\r?\n)*\Z",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_declaracoes(text: str) -> List[str]:
+    """
+    Divide o texto de um PDF com várias declarações concatenadas em um
+    trecho por declaração, cortando antes de cada cabeçalho "Nº da
+    Declaração" (e do título logo acima dele, se houver). Trechos com o
+    mesmo número (o cabeçalho repetido numa página de continuação) são
+    juntados no primeiro deles. Com zero ou uma declaração, devolve o texto
+    inteiro.
+    """
+    headers = list(_DECL_HEADER_RE.finditer(text))
+    if len(headers) < 2:
+        return [text]
+
+    cuts = [0]
+    for header in headers[1:]:
+        start = header.start()
+        # o título ("Dados Gerais"...) imediatamente acima vai junto
+        title = _TITLE_RE.search(text, cuts[-1], start)
+        cuts.append(title.start() if title else start)
+    cuts.append(len(text))
+
+    parts: List[str] = []
+    by_numero: Dict[str, int] = {}
+    for header, a, b in zip(headers, cuts, cuts[1:]):
+        part = text[a:b].strip()
+        if not part:
+            continue
+        numero = _NON_DIGITS.sub("", header.group("numero"))
+        if numero and numero in by_numero:
+            i = by_numero[numero]
+            parts[i] = f"{parts[i]}\n{part}"
+            continue
+        if numero:
+            by_numero[numero] = len(parts)
+        parts.append(part)
+    return parts
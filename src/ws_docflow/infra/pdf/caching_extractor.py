@@ -0,0 +1,240 @@
+# src/ws_docflow/infra/pdf/caching_extractor.py
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ws_docflow.core.ports import SourceT, TextExtractor
+from ws_docflow.infra.logging import logger as log
+from ws_docflow.infra.lru import LruCache
+from ws_docflow.infra.pdf.sources import iter_source_chunks
+
+# muda quando o formato do que é gravado no cache mudar
+CACHE_FORMAT = "1"
+# separa as páginas nas entradas gravadas pelo `iter_pages`
+PAGE_BREAK = "\f"
+# 1º trecho da entrada paginada: leitura até o fim ou só o início lido
+_COMPLETE, _PARTIAL = "completo", "parcial"
+
+
+def _pack_pages(pages: List[str], complete: bool) -> str:
+    """Páginas → entrada do cache: "<estado>:<nº de páginas>" + páginas."""
+    head = f"{_COMPLETE if complete else _PARTIAL}:{len(pages)}"
+    return PAGE_BREAK.join([head, *pages])
+
+
+def _unpack_pages(text: str) -> Tuple[List[str], bool]:
+    head, _, body = text.partition(PAGE_BREAK)
+    state, _, count = head.partition(":")
+    pages = body.split(PAGE_BREAK) if int(count) else []
+    return pages, state == _COMPLETE
+
+
+class DiskCache:
+    """
+    Armazém de textos em disco, compartilhável entre processos (API/CLI):
+      - escrita atômica (arquivo temporário + os.replace);
+      - tamanho total limitado a `max_bytes`, descartando os arquivos
+        menos recentemente usados (mtime é renovado a cada leitura).
+
+    O total é acompanhado a cada gravação; o diretório só é listado na
+    abertura e quando o total estimado passa do limite (a listagem então
+    corrige a estimativa com o que outros processos gravaram).
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total = sum(size for _mtime, size, _f in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)
+            return text
+        except OSError:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp.write(text)
+            size = os.path.getsize(tmp.name)
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp.name, path)
+            with self._lock:
+                self._total += size - replaced
+                over = self._total > self.max_bytes
+            if over:
+                self._evict()
+        except OSError as exc:
+            log.warning(f"⚠️ Falha ao gravar cache em disco ({path}): {exc}")
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for f in self.directory.glob("*/*.txt"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue  # removido por outro processo
+            entries.append((st.st_mtime, st.st_size, f))
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _mtime, size, _f in entries)
+        if total > self.max_bytes:
+            for _mtime, size, f in sorted(entries):
+                try:
+                    f.unlink()
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        with self._lock:
+            self._total = total
+
+
+class ExtractionCache:
+    """
+    Cache de textos extraídos, endereçado pelo conteúdo:
+    chave = SHA-256(versão do extrator + bytes do PDF).
+
+    Dois níveis: LRU em memória (por processo) e, opcionalmente, disco
+    (compartilhado). Mantém contadores de acertos/erros.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        disk_dir: Optional[Union[str, Path]] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.memory: LruCache[str, str] = LruCache(max_entries)
+        self.disk = DiskCache(disk_dir, disk_max_bytes) if disk_dir else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        text = self.memory.get(key)
+        if text is not None:
+            self._count("memory_hits")
+            return text
+        if self.disk is not None:
+            text = self.disk.get(key)
+            if text is not None:
+                self._count("disk_hits")
+                self.memory.put(key, text)
+                return text
+        self._count("misses")
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        self.memory.put(key, text)
+        if self.disk is not None:
+            self.disk.put(key, text)
+
+    def stats(self) -> Dict[str, object]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+        }
+
+
+def _source_digest(source: SourceT, prefix: str) -> str:
+    h = hashlib.sha256(prefix.encode("utf-8") + b"\0")
+    for chunk in iter_source_chunks(source):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def extractor_version(extractor: TextExtractor) -> str:
+    """Identifica o extrator no cache: classe + `version` (quando houver)."""
+    return f"{type(extractor).__name__}/{getattr(extractor, 'version', '0')}"
+
+
+class CachingExtractor(TextExtractor):
+    """
+    Decorator de TextExtractor que consulta o ExtractionCache antes de extrair.
+
+    O `iter_pages` tem entradas próprias, com as páginas separadas por
+    PAGE_BREAK: um acerto devolve as mesmas páginas, uma a uma (o
+    consumidor que para cedo — `max_pages`, âncoras — lê o mesmo texto que
+    leria sem cache). Num erro, repassa as páginas do extrator interno e
+    grava o que foi lido quando o consumidor termina ou para cedo (fecha o
+    gerador): uma leitura parcial fica marcada como tal e, se um consumidor
+    seguinte quiser mais páginas que as gravadas, o resto vem do extrator
+    interno e a entrada cresce.
+    """
+
+    def __init__(self, inner: TextExtractor, cache: ExtractionCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.version = extractor_version(inner)
+
+    def cache_key(self, source: SourceT, paged: bool = False) -> str:
+        layout = "pages" if paged else "text"
+        return _source_digest(source, f"{CACHE_FORMAT}|{layout}|{self.version}")
+
+    def extract(self, source: SourceT) -> str:
+        key = self.cache_key(source)
+        text = self.cache.get(key)
+        if text is None:
+            text = self.inner.extract(source)
+            self.cache.put(key, text)
+        return text
+
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        key = self.cache_key(source, paged=True)
+        text = self.cache.get(key)
+        pages: List[str] = []
+        if text is not None:
+            pages, complete = _unpack_pages(text)
+            yield from pages
+            if complete:
+                return
+        cached = len(pages)
+        complete = False
+        try:
+            # parcial: o que já foi lido não é repassado de novo
+            for page in islice(self.inner.iter_pages(source), cached, None):
+                # vazias também: contam no `max_pages` do consumidor; um form
+                # feed dentro da página viraria quebra de página
+                pages.append((page or "").replace(PAGE_BREAK, "\n"))
+                yield page
+            complete = True
+        finally:
+            # também quando o consumidor para cedo (close → GeneratorExit)
+            if complete or len(pages) > cached:
+                self.cache.put(key, _pack_pages(pages, complete))
@@ -0,0 +1,84 @@
+# src/ws_docflow/infra/pdf/factory.py
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+from ws_docflow.core.ports import DocParser, MetricsSink, TextExtractor
+from ws_docflow.infra.pdf.caching_extractor import CachingExtractor, ExtractionCache
+from ws_docflow.infra.pdf.fallback_extractor import FallbackExtractor, parsers_accept
+from ws_docflow.infra.pdf.ocr_extractor import OcrFallbackExtractor
+from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+from ws_docflow.infra.pdf.pypdf_extractor import PypdfExtractor
+from ws_docflow.infra.resources import ResourceLimits
+
+BACKENDS = ("pdfplumber", "pypdf", "auto")
+
+
+def build_extractor(
+    backend: str = "pdfplumber",
+    parsers: Sequence[DocParser] = (),
+    *,
+    workers: int = 1,
+    parallel_min_pages: int = 16,
+    cache: Optional[ExtractionCache] = None,
+    ocr: bool = False,
+    ocr_lang: str = "por",
+    ocr_workers: int = 2,
+    ocr_page_timeout: float = 60.0,
+    memory_bounded: bool = False,
+    limits: Optional[ResourceLimits] = None,
+    metrics: Optional[MetricsSink] = None,
+) -> TextExtractor:
+    """
+    Monta o extrator de texto para o backend escolhido:
+      - pdfplumber: layout completo (mais lento, referência)
+      - pypdf:      texto "cru" (rápido)
+      - auto:       pypdf primeiro; pdfplumber se os parsers não acharem âncoras
+    `workers`/`parallel_min_pages` configuram a extração paralela do pdfplumber;
+    com `ocr`, o pdfplumber (backends pdfplumber/auto) passa a reconhecer via
+    Tesseract as páginas sem camada de texto (extração sempre serial, OCR no
+    pool do processo, de `ocr_workers` processos, compartilhado pelas
+    extrações);
+    `memory_bounded`/`limits` valem para o pdfplumber (com ou sem OCR);
+    com `cache`, o extrator resultante é envolvido por um CachingExtractor;
+    `metrics` recebe o tempo de abertura e o nº de páginas de cada PDF.
+    """
+    if ocr:
+        plumber: TextExtractor = OcrFallbackExtractor(
+            lang=ocr_lang,
+            workers=ocr_workers,
+            page_timeout=ocr_page_timeout,
+            memory_bounded=memory_bounded,
+            limits=limits,
+            metrics=metrics,
+        )
+    else:
+        plumber = PdfPlumberExtractor(
+            workers=workers,
+            parallel_min_pages=parallel_min_pages,
+            memory_bounded=memory_bounded,
+            limits=limits,
+            metrics=metrics,
+        )
+    extractor = _build_backend(backend, parsers, plumber, metrics)
+    return CachingExtractor(extractor, cache) if cache is not None else extractor
+
+
+def _build_backend(
+    backend: str,
+    parsers: Sequence[DocParser],
+    plumber: TextExtractor,
+    metrics: Optional[MetricsSink] = None,
+) -> TextExtractor:
+    name = (backend or "pdfplumber").strip().lower()
+    if name == "pdfplumber":
+        return plumber
+    if name == "pypdf":
+        return PypdfExtractor(metrics)
+    if name == "auto":
+        return FallbackExtractor(
+            PypdfExtractor(metrics), plumber, accept=parsers_accept(parsers)
+        )
+    raise ValueError(
+        f"Backend de extração desconhecido: {backend!r} (use {', '.join(BACKENDS)})"
+    )
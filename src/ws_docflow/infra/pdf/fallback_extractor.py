@@ -0,0 +1,102 @@
+# src/ws_docflow/infra/pdf/fallback_extractor.py
+from __future__ import annotations
+
+from typing import Callable, Iterator, List, Sequence
+
+from ws_docflow.core.pages import join_pages
+from ws_docflow.core.ports import DocParser, SourceT, TextExtractor
+from ws_docflow.infra.logging import logger as log
+
+
+def parsers_accept(parsers: Sequence[DocParser]) -> Callable[[str], bool]:
+    """
+    Monta o critério de aceite do texto "rápido": aceita quando ao menos um
+    parser encontra suas âncoras (via `can_parse`). Parsers sem `can_parse`
+    aceitam qualquer texto não vazio.
+    """
+
+    def _accept(text: str) -> bool:
+        if not text.strip():
+            return False
+        if not parsers:
+            return True
+        for parser in parsers:
+            can_parse = getattr(parser, "can_parse", None)
+            if can_parse is None or can_parse(text):
+                return True
+        return False
+
+    # entra na versão do FallbackExtractor (e assim na chave do cache)
+    names = "+".join(type(p).__name__ for p in parsers) or "*"
+    _accept.version = f"parsers:{names}"  # type: ignore[attr-defined]
+    return _accept
+
+
+class FallbackExtractor(TextExtractor):
+    """
+    Tenta primeiro o extrator rápido (`primary`) e só recorre ao `fallback`
+    quando o texto obtido não é aceito (ex.: âncoras dos parsers ausentes)
+    ou quando o extrator rápido falha.
+    """
+
+    def __init__(
+        self,
+        primary: TextExtractor,
+        fallback: TextExtractor,
+        accept: Callable[[str], bool],
+    ) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.accept = accept
+        # o texto escolhido depende do aceite: outros parsers, outra chave
+        criterion = getattr(accept, "version", getattr(accept, "__qualname__", "?"))
+        self.version = (
+            "+".join(
+                f"{type(ex).__name__}/{getattr(ex, 'version', '0')}"
+                for ex in (primary, fallback)
+            )
+            + f"|{criterion}"
+        )
+        # contadores simples (úteis em benchmark/observabilidade)
+        self.primary_hits = 0
+        self.fallbacks = 0
+
+    def extract(self, source: SourceT) -> str:
+        return self._select(source, lambda ex: ex.extract(source))
+
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        """
+        O aceite depende do texto inteiro do backend rápido, então ele é lido
+        por completo (é barato); só o fallback é consumido sob demanda.
+        """
+        pages: List[str] = []
+
+        def _fast(ex: TextExtractor) -> str:
+            pages.extend(ex.iter_pages(source))
+            return join_pages(pages)
+
+        if self._try_primary(_fast) is not None:
+            yield from pages
+        else:
+            yield from self.fallback.iter_pages(source)
+
+    def _select(self, source: SourceT, run: Callable[[TextExtractor], str]) -> str:
+        text = self._try_primary(run)
+        return text if text is not None else run(self.fallback)
+
+    def _try_primary(self, run: Callable[[TextExtractor], str]) -> str | None:
+        """Texto do backend rápido se aceito; None quando é preciso o fallback."""
+        try:
+            text = run(self.primary)
+        except TypeError:
+            raise
+        except Exception as exc:
+            log.debug(f"⚠️ Extrator rápido falhou, usando fallback: {exc}")
+            text = ""
+
+        if text and self.accept(text):
+            self.primary_hits += 1
+            return text
+
+        self.fallbacks += 1
+        return None
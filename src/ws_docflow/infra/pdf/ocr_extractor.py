@@ -0,0 +1,347 @@
+# src/ws_docflow/infra/pdf/ocr_extractor.py
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+)
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+import pdfplumber
+from ws_docflow.core.pages import join_pages
+from ws_docflow.core.ports import MetricsSink, SourceT, TextExtractor
+from ws_docflow.infra.logging import logger as log
+from ws_docflow.infra.lru import LruCache
+from ws_docflow.infra.pdf.pdfplumber_extractor import _open_measured, _open_pdf
+from ws_docflow.infra.pdf.sources import picklable_source
+from ws_docflow.infra.resources import ResourceLimits
+
+# cache de OCR do processo, compartilhado entre instâncias (a API monta um
+# extrator por requisição): chave = hash do conteúdo das imagens da página
+_PAGE_CACHE: LruCache[str, str] = LruCache(512)
+
+
+def page_fingerprint(page, prefix: str = "") -> Optional[str]:
+    """
+    Hash do conteúdo da página para o cache de OCR: bytes brutos de cada
+    imagem + dimensões. None quando a página não tem imagens (página em
+    branco: não há o que reconhecer).
+    """
+    images = getattr(page, "images", None) or []
+    if not images:
+        return None
+    h = hashlib.sha256(f"{prefix}|{page.width}x{page.height}".encode("utf-8"))
+    for img in images:
+        stream = img.get("stream")
+        raw = stream.get_rawdata() if stream is not None else None
+        if not raw:
+            return None  # sem bytes para endereçar: não cacheia
+        h.update(len(raw).to_bytes(8, "big"))
+        h.update(raw)
+    return h.hexdigest()
+
+
+# -----------------------
+# Worker de OCR
+# -----------------------
+# A tarefa leva o caminho do PDF (upload em memória vai a um arquivo
+# temporário, uma vez por documento) e o índice da página. Cada processo
+# mantém aberto o último PDF que leu: as páginas seguintes do mesmo documento
+# não o reabrem.
+_WORKER_DOC: Tuple[str, Any] = ("", None)
+
+
+def _worker_pdf(path: str):
+    global _WORKER_DOC
+    current, pdf = _WORKER_DOC
+    if current != path or pdf is None:
+        if pdf is not None:
+            pdf.close()
+        _WORKER_DOC = (path, _open_pdf(path))
+    return _WORKER_DOC[1]
+
+
+def _ocr_page(
+    path: str, page_index: int, resolution: int, lang: str, timeout: float
+) -> str:
+    """Worker: rasteriza uma página e roda o Tesseract sobre ela."""
+    import pytesseract  # type: ignore[import-untyped]
+
+    page = _worker_pdf(path).pages[page_index]
+    try:
+        image = page.to_image(resolution=resolution).original
+    finally:
+        page.close()  # libera o cache de layout: o PDF segue aberto no worker
+    return pytesseract.image_to_string(image, lang=lang, timeout=timeout) or ""
+
+
+def _spill(source: SourceT) -> str:
+    """Caminho do PDF para os workers (fonte em memória → arquivo temporário)."""
+    if isinstance(source, str):
+        return source
+    fd, path = tempfile.mkstemp(prefix="ws-docflow-ocr-", suffix=".pdf")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(cast(bytes, picklable_source(source)))
+    return path
+
+
+# -----------------------
+# Pool de OCR do processo
+# -----------------------
+class OcrPool:
+    """
+    Processos de OCR compartilhados pelas extrações do processo: N requisições
+    simultâneas dividem os mesmos `workers` processos (a fila fica no pool)
+    em vez de subir N × workers. O executor é criado no 1º envio.
+
+    Página que estoura o prazo já rodando não pode ser cancelada: `recycle`
+    mata os processos do executor dela (Tesseract/rasterização travados não
+    seguem ocupando a vaga) e os envios seguintes vão a um executor novo.
+    """
+
+    def __init__(self, workers: int = 2) -> None:
+        self.workers = max(1, workers)
+        self._executor: Optional[Executor] = None
+        self._owners: Dict[Future, Executor] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Páginas enviadas e ainda não terminadas (de todas as extrações)."""
+        with self._lock:
+            return len(self._owners)
+
+    def submit(self, fn: Callable[..., str], *args: Any) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            future = self._executor.submit(fn, *args)
+            self._owners[future] = self._executor
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._owners.pop(future, None)
+
+    def recycle(self, future: Future) -> None:
+        """
+        Mata os processos do executor que roda `future` (se ainda for o atual).
+        As outras páginas dele falham com BrokenExecutor/CancelledError e são
+        reenviadas por quem as esperava (ver OcrFallbackExtractor._resolve).
+        """
+        with self._lock:
+            executor = self._owners.get(future)
+            if executor is None or executor is not self._executor:
+                return
+            self._executor = None
+        # ProcessPoolExecutor não expõe como matar os workers
+        processes = getattr(executor, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# um pool por nº de workers (na prática, um só: o das configurações)
+_POOLS: Dict[int, OcrPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_ocr_pool(workers: int) -> OcrPool:
+    """Pool de OCR do processo com `workers` processos."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = OcrPool(workers)
+        return pool
+
+
+class _Task(NamedTuple):
+    """Página enviada ao OCR, esperando a vez de ser entregue."""
+
+    future: Future
+    page: int
+    key: Optional[str]
+    deadline: float
+    path: str
+    retried: bool = False
+
+
+# item da fila de saída: texto pronto OU página em OCR
+_Pending = Union[str, _Task]
+
+
+class OcrFallbackExtractor(TextExtractor):
+    """
+    Extrator pdfplumber com OCR apenas nas páginas sem camada de texto.
+
+    - Páginas com texto seguem o caminho rápido (extract_text), sem OCR.
+    - Páginas vazias que contêm imagens são rasterizadas e enviadas ao
+      Tesseract no pool de OCR do processo (`pool`; padrão: o compartilhado
+      de `workers` processos, ver OcrPool); no máximo `workers * 2` páginas
+      de cada documento ficam em voo ao mesmo tempo.
+    - Cada página tem um tempo máximo (`page_timeout`), contado a partir do
+      envio ao pool (mais uma rodada por fila de `workers` páginas à frente
+      dela no pool); estourou, a página sai vazia, o worker preso é morto e
+      a extração continua.
+    - Resultados ficam num LRU endereçado pelo hash das imagens da página,
+      então o mesmo scan não é reconhecido duas vezes.
+    A ordem das páginas é sempre preservada. `memory_bounded`/`limits` têm o
+    mesmo efeito que no PdfPlumberExtractor, assim como `metrics`.
+    """
+
+    version = f"pdfplumber-{pdfplumber.__version__}+ocr"
+    # margem sobre o timeout do próprio Tesseract (abrir PDF, rasterizar...)
+    result_grace = 5.0
+
+    def __init__(
+        self,
+        lang: str = "por",
+        workers: int = 2,
+        page_timeout: float = 60.0,
+        resolution: int = 300,
+        cache: Optional[LruCache[str, str]] = None,
+        memory_bounded: bool = False,
+        limits: Optional[ResourceLimits] = None,
+        metrics: Optional[MetricsSink] = None,
+        pool: Optional[OcrPool] = None,
+    ) -> None:
+        self.lang = lang
+        self.workers = max(1, workers)
+        self.page_timeout = page_timeout
+        self.resolution = resolution
+        self.cache = cache if cache is not None else _PAGE_CACHE
+        self.memory_bounded = memory_bounded
+        self.limits = limits or ResourceLimits()
+        self.metrics = metrics
+        self.pool = pool if pool is not None else shared_ocr_pool(self.workers)
+        self.version = f"{type(self).version}-{lang}-{resolution}dpi"
+        self.ocr_pages = 0
+        self.ocr_cache_hits = 0
+        self.ocr_timeouts = 0
+
+    def extract(self, source: SourceT) -> str:
+        return join_pages(self.iter_pages(source))
+
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        path: Optional[str] = None
+        pending: Deque[_Pending] = deque()
+        max_in_flight = self.workers * 2
+        try:
+            with _open_measured(source, self.metrics, _open_pdf) as pdf:
+                self.limits.check_pages(len(pdf.pages))
+                for index, page in enumerate(pdf.pages):
+                    text = page.extract_text() or ""
+                    key = None if text.strip() else self._cache_key(page)
+                    if self.memory_bounded:
+                        page.close()
+                    self.limits.check_rss(index + 1)
+                    cached = self.cache.get(key) if key else None
+
+                    if key is None:
+                        pending.append(text)
+                    elif cached is not None:
+                        self.ocr_cache_hits += 1
+                        pending.append(cached)
+                    else:
+                        if path is None:
+                            path = _spill(source)
+                        pending.append(self._submit(path, index, key))
+
+                    # entrega o que já está pronto, na ordem
+                    while pending and self._ready(pending[0]):
+                        yield self._resolve(pending.popleft())
+                    # limita páginas em voo (e imagens esperando o consumidor)
+                    while self._in_flight(pending) >= max_in_flight:
+                        yield self._resolve(pending.popleft())
+
+            while pending:
+                yield self._resolve(pending.popleft())
+        finally:
+            for item in pending:
+                if not isinstance(item, str):
+                    item.future.cancel()
+            if path is not None and path != source:
+                with contextlib.suppress(OSError):
+                    os.unlink(path)
+
+    def _submit(
+        self, path: str, index: int, key: Optional[str], retried: bool = False
+    ) -> _Task:
+        ahead = self.pool.in_flight
+        future = self.pool.submit(
+            _ocr_page, path, index, self.resolution, self.lang, self.page_timeout
+        )
+        deadline = time.monotonic() + self._budget(ahead)
+        return _Task(future, index, key, deadline, path, retried)
+
+    def _budget(self, ahead: int) -> float:
+        """Prazo de uma página com `ahead` outras em voo à frente dela."""
+        rounds = 1 + ahead // self.workers
+        return rounds * (self.page_timeout + self.result_grace)
+
+    def _cache_key(self, page) -> Optional[str]:
+        return page_fingerprint(page, prefix=self.version)
+
+    @staticmethod
+    def _ready(item: _Pending) -> bool:
+        return isinstance(item, str) or item.future.done()
+
+    @staticmethod
+    def _in_flight(pending: Deque[_Pending]) -> int:
+        return sum(1 for item in pending if not isinstance(item, str))
+
+    def _resolve(self, item: _Pending) -> str:
+        if isinstance(item, str):
+            return item
+        page = item.page + 1
+        try:
+            text = item.future.result(timeout=max(item.deadline - time.monotonic(), 0))
+        except FutureTimeout:
+            self.ocr_timeouts += 1
+            if not item.future.cancel():
+                self.pool.recycle(item.future)  # já rodando: mata o worker
+            log.warning(f"⏱️ OCR excedeu {self.page_timeout}s na página {page}")
+            return ""
+        except (BrokenExecutor, CancelledError) as exc:
+            # executor reciclado pelo timeout de outra página: reenvia uma vez
+            if item.retried:
+                log.warning(f"⚠️ OCR falhou na página {page}: {exc!r}")
+                return ""
+            return self._resolve(self._submit(item.path, item.page, item.key, True))
+        except Exception as exc:
+            log.warning(f"⚠️ OCR falhou na página {page}: {exc}")
+            return ""
+
+        self.ocr_pages += 1
+        if item.key:
+            self.cache.put(item.key, text)
+        return text
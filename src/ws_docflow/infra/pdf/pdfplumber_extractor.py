@@ -1,38 +1,156 @@
 # src/ws_docflow/infra/pdf/pdfplumber_extractor.py
 from __future__ import annotations
 
-import io
-from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union, cast
 
 import pdfplumber
-from ws_docflow.core.ports import TextExtractor
+from ws_docflow.core.pages import join_pages
+from ws_docflow.core.ports import MetricsSink, SourceT, TextExtractor
+from ws_docflow.infra.metrics import record, timed
+from ws_docflow.infra.pdf.sources import pdf_input, picklable_source
+from ws_docflow.infra.resources import ResourceLimits
 
-SourceT = Union[str, bytes]
+
+def _open_pdf(source: SourceT):
+    # o pdfplumber lê qualquer arquivo binário com seek (os tipos dele pedem
+    # BufferedReader/BytesIO): BufferReader, upload, SpooledTemporaryFile...
+    stream = cast(Union[str, BytesIO], pdf_input(source, "PdfPlumberExtractor"))
+    return pdfplumber.open(stream)
+
+
+def _open_measured(
+    source: SourceT,
+    metrics: Optional[MetricsSink],
+    open_pdf: Optional[Callable[[SourceT], Any]] = None,
+):
+    """Abre o PDF medindo a etapa "open" (inclui ler a árvore de páginas)."""
+    with timed(metrics, "open"):
+        pdf = (open_pdf or _open_pdf)(source)
+        n_pages = len(pdf.pages)
+    record(metrics, "pdf_pages", n_pages)
+    return pdf
+
+
+def _page_texts(
+    pages: Iterable,
+    memory_bounded: bool = False,
+    limits: ResourceLimits = ResourceLimits(),
+    first_number: int = 1,
+) -> Iterator[str]:
+    """
+    Texto de cada página. Com `memory_bounded`, os objetos de layout da
+    página (chars, linhas, textmap...) são liberados logo após a extração,
+    em vez de ficarem vivos até o PDF ser fechado.
+    """
+    for number, page in enumerate(pages, first_number):
+        text = page.extract_text() or ""
+        if memory_bounded:
+            page.close()
+        limits.check_rss(number)
+        yield text
+
+
+def _extract_page_range(
+    source: SourceT,
+    start: int,
+    stop: int,
+    memory_bounded: bool = False,
+    limits: ResourceLimits = ResourceLimits(),
+) -> List[str]:
+    """Worker: abre o documento e extrai o texto das páginas [start, stop)."""
+    with _open_pdf(source) as pdf:
+        pages = pdf.pages[start:stop]
+        return list(_page_texts(pages, memory_bounded, limits, start + 1))
 
 
 class PdfPlumberExtractor(TextExtractor):
+    """
+    Extrator de referência (layout completo via pdfplumber).
+
+    Com `workers > 1`, documentos com pelo menos `parallel_min_pages` páginas
+    são divididos em fatias contíguas extraídas em processos separados; o
+    resultado é costurado na ordem original (saída idêntica ao modo serial).
+
+    Com `memory_bounded`, o cache de layout de cada página é descartado assim
+    que o texto dela é lido (pico de memória deixa de crescer com o nº de
+    páginas). `limits` impõe teto de páginas (ExtractionLimitError) e de RSS
+    do processo (OverloadedError) e aborta quando estourado. `metrics` recebe o tempo de
+    abertura ("open") e o nº de páginas de cada PDF.
+    """
+
+    # identifica a saída no cache de extração (muda com a lib ou com a lógica)
+    version = f"pdfplumber-{pdfplumber.__version__}"
+
+    def __init__(
+        self,
+        workers: int = 1,
+        parallel_min_pages: int = 16,
+        memory_bounded: bool = False,
+        limits: Optional[ResourceLimits] = None,
+        metrics: Optional[MetricsSink] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.parallel_min_pages = parallel_min_pages
+        self.memory_bounded = memory_bounded
+        self.limits = limits or ResourceLimits()
+        self.metrics = metrics
+
+    def _open(self, source: SourceT):
+        return _open_measured(source, self.metrics)
+
     def extract(self, source: SourceT) -> str:
         """
         Extrai texto de um PDF a partir de:
           - caminho de arquivo (str)
-          - conteúdo bruto em bytes
+          - buffer em memória (bytes, bytearray, memoryview, mmap), sem cópia
+          - arquivo binário aberto (lido a partir do início; não é fechado)
         """
-        parts: list[str] = []
-
-        if isinstance(source, bytes):
-            pdf_stream = io.BytesIO(source)
-            pdf = pdfplumber.open(pdf_stream)
-        elif isinstance(source, str):
-            pdf = pdfplumber.open(source)
-        else:
-            raise TypeError(
-                f"Tipo de entrada inválido para PdfPlumberExtractor: {type(source)}"
-            )
+        return join_pages(self.iter_pages(source))
+
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        """
+        Texto página a página, extraído sob demanda: se o consumidor parar
+        (ex.: parada antecipada do use case), as páginas seguintes nem chegam
+        a ter o layout reconstruído. Documentos grandes com `workers > 1`
+        são extraídos por fatias em paralelo, entregues na ordem; ao parar,
+        as fatias ainda não iniciadas são canceladas.
+        """
+        with self._open(source) as pdf:
+            n_pages = len(pdf.pages)
+            self.limits.check_pages(n_pages)
+            if self.workers <= 1 or n_pages < self.parallel_min_pages:
+                yield from self._page_texts(pdf.pages)
+                return
+
+        # o documento é fechado antes: cada worker abre a sua própria cópia
+        yield from self._iter_parallel(source, n_pages)
 
-        with pdf:
-            for page in pdf.pages:
-                text = page.extract_text() or ""
-                if text:
-                    parts.append(text)
+    def _iter_parallel(self, source: SourceT, n_pages: int) -> Iterator[str]:
+        # fatias contíguas; 2 por worker para equilibrar páginas "pesadas"
+        n_chunks = min(n_pages, self.workers * 2)
+        step = -(-n_pages // n_chunks)
+        starts = list(range(0, n_pages, step))
+        stops = [min(s + step, n_pages) for s in starts]
+
+        # buffers/arquivos viram bytes uma única vez para ir aos workers
+        shared = picklable_source(source)
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            chunks = pool.map(
+                _extract_page_range,
+                repeat(shared),
+                starts,
+                stops,
+                repeat(self.memory_bounded),
+                repeat(self.limits),
+            )
+            for chunk in chunks:
+                yield from chunk
+        finally:
+            pool.shutdown(cancel_futures=True)
 
-        return "\n".join(parts).strip()
+    def _page_texts(self, pages: Iterable) -> Iterator[str]:
+        return _page_texts(pages, self.memory_bounded, self.limits)
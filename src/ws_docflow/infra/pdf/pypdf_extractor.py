@@ -0,0 +1,46 @@
+# src/ws_docflow/infra/pdf/pypdf_extractor.py
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+import pypdf
+from ws_docflow.core.pages import join_pages
+from ws_docflow.core.ports import MetricsSink, SourceT, TextExtractor
+from ws_docflow.infra.metrics import record, timed
+from ws_docflow.infra.pdf.sources import pdf_input
+
+
+class PypdfExtractor(TextExtractor):
+    """
+    Extrator "rápido" baseado no pypdf.
+
+    Não reconstrói o layout como o pdfplumber (bem mais barato), então o texto
+    pode divergir em espaçamentos/quebras. Use em conjunto com o
+    FallbackExtractor para recorrer ao pdfplumber quando necessário.
+    `metrics` recebe o tempo de abertura ("open") e o nº de páginas.
+    """
+
+    version = f"pypdf-{pypdf.__version__}"
+
+    def __init__(self, metrics: Optional[MetricsSink] = None) -> None:
+        self.metrics = metrics
+
+    def _reader(self, source: SourceT):
+        with timed(self.metrics, "open"):
+            reader = pypdf.PdfReader(pdf_input(source, "PypdfExtractor"))
+            n_pages = len(reader.pages)
+        record(self.metrics, "pdf_pages", n_pages)
+        return reader
+
+    def extract(self, source: SourceT) -> str:
+        """
+        Extrai texto de um PDF a partir de:
+          - caminho de arquivo (str)
+          - buffer em memória ou arquivo binário aberto (ver PdfPlumberExtractor)
+        """
+        return join_pages(self.iter_pages(source))
+
+    def iter_pages(self, source: SourceT) -> Iterator[str]:
+        reader = self._reader(source)
+        for page in reader.pages:
+            yield page.extract_text() or ""
@@ -0,0 +1,135 @@
+# src/ws_docflow/infra/pdf/sources.py
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from typing import BinaryIO, Iterator, Optional, Union
+
+from ws_docflow.core.ports import SourceT
+
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+_CHUNK = 1024 * 1024
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Leitor binário somente-leitura sobre um buffer (bytes, bytearray,
+    memoryview, mmap). Lê fatias da própria memória do buffer: o documento
+    inteiro nunca é copiado para um BytesIO.
+    """
+
+    def __init__(self, buffer) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}
+        self._pos = max(0, base[whence] + offset)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._pos : self._pos + len(b)]
+        n = len(chunk)
+        memoryview(b).cast("B")[:n] = chunk
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        data = self._view[self._pos : end].tobytes()
+        self._pos += len(data)
+        return data
+
+    readall = read
+
+
+def is_file_like(source: object) -> bool:
+    return hasattr(source, "read") and not isinstance(source, _BUFFER_TYPES)
+
+
+def pdf_input(source: SourceT, owner: str = "extrator") -> Union[str, BinaryIO]:
+    """
+    Converte a fonte no que pdfplumber/pypdf aceitam, sem copiar o conteúdo:
+      - caminho (str): devolvido como está;
+      - buffers (bytes, bytearray, memoryview, mmap): BufferReader;
+      - arquivo binário (ex.: SpooledTemporaryFile do upload): o próprio
+        objeto, rebobinado (o chamador continua dono dele; não é fechado).
+    """
+    if isinstance(source, str):
+        return source
+    if isinstance(source, _BUFFER_TYPES):
+        return BufferReader(source)  # type: ignore[return-value]
+    if is_file_like(source):
+        if not source.seekable():  # type: ignore[union-attr]
+            return io.BytesIO(source.read())  # type: ignore[union-attr]
+        source.seek(0)  # type: ignore[union-attr]
+        return source  # type: ignore[return-value]
+    raise TypeError(f"Tipo de entrada inválido para {owner}: {type(source)}")
+
+
+def source_size(source: SourceT) -> Optional[int]:
+    """Tamanho (bytes) da fonte sem lê-la; None se não dá para saber."""
+    if isinstance(source, str):
+        try:
+            return os.path.getsize(source)
+        except OSError:
+            return None
+    if isinstance(source, _BUFFER_TYPES):
+        return memoryview(source).nbytes
+    if is_file_like(source) and source.seekable():  # type: ignore[union-attr]
+        pos = source.tell()  # type: ignore[union-attr]
+        try:
+            return source.seek(0, io.SEEK_END)  # type: ignore[union-attr]
+        finally:
+            source.seek(pos)  # type: ignore[union-attr]
+    return None
+
+
+def picklable_source(source: SourceT) -> Union[str, bytes]:
+    """
+    Fonte enviável a outro processo (pool de workers): caminho ou bytes.
+    Buffers e arquivos são copiados uma única vez aqui; a posição de leitura
+    do arquivo é preservada (ele pode estar em uso por um leitor aberto).
+    """
+    if isinstance(source, (str, bytes)):
+        return source
+    if isinstance(source, _BUFFER_TYPES):
+        return bytes(source)
+    if is_file_like(source):
+        pos = source.tell()  # type: ignore[union-attr]
+        try:
+            source.seek(0)  # type: ignore[union-attr]
+            return source.read()  # type: ignore[union-attr]
+        finally:
+            source.seek(pos)  # type: ignore[union-attr]
+    raise TypeError(f"Tipo de entrada inválido: {type(source)}")
+
+
+def iter_source_chunks(
+    source: SourceT, size: int = _CHUNK
+) -> Iterator[Union[bytes, memoryview]]:
+    """Conteúdo da fonte em blocos (hash sem carregar arquivos inteiros)."""
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            yield from iter(lambda: fh.read(size), b"")
+        return
+    if isinstance(source, _BUFFER_TYPES):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), size):
+            yield view[start : start + size]
+        return
+    if is_file_like(source):
+        source.seek(0)  # type: ignore[union-attr]
+        yield from iter(lambda: source.read(size), b"")  # type: ignore[union-attr]
+        return
+    raise TypeError(f"Tipo de entrada inválido: {type(source)}")
@@ -0,0 +1,47 @@
+# src/ws_docflow/infra/pdf/word_extractor.py
+from __future__ import annotations
+
+from typing import Iterator, List
+
+import pdfplumber
+from ws_docflow.core.ports import PositionedWord, SourceT, WordExtractor
+from ws_docflow.infra.pdf.pdfplumber_extractor import _open_pdf
+
+
+class PdfPlumberWordExtractor(WordExtractor):
+    """
+    Palavras posicionadas via `page.extract_words()` do pdfplumber.
+
+    Agrupa os caracteres em palavras, mas não reconstrói o texto em ordem de
+    leitura (`extract_text`): quem consome (LayoutParser) usa as coordenadas
+    para achar linhas, rótulos e valores. Cada página é liberada logo após
+    ter as palavras lidas.
+    """
+
+    version = f"pdfplumber-words-{pdfplumber.__version__}"
+
+    def __init__(
+        self,
+        x_tolerance: float = 3,
+        y_tolerance: float = 3,
+    ) -> None:
+        self.x_tolerance = x_tolerance
+        self.y_tolerance = y_tolerance
+
+    def extract_words(self, source: SourceT) -> List[PositionedWord]:
+        return [w for page in self.iter_page_words(source) for w in page]
+
+    def iter_page_words(self, source: SourceT) -> Iterator[List[PositionedWord]]:
+        """Palavras página a página, sob demanda (o consumidor pode parar)."""
+        with _open_pdf(source) as pdf:
+            for number, page in enumerate(pdf.pages):
+                words = page.extract_words(
+                    x_tolerance=self.x_tolerance, y_tolerance=self.y_tolerance
+                )
+                page.close()
+                yield [
+                    PositionedWord(
+                        w["text"], w["x0"], w["x1"], w["top"], w["bottom"], number
+                    )
+                    for w in words
+                ]
@@ -0,0 +1,88 @@
+# src/ws_docflow/infra/resources.py
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from ws_docflow.core.errors import ExtractionLimitError, OverloadedError
+
+_MB = 1024 * 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Memória residente (RSS) atual do processo.
+    Linux: /proc/self/statm; demais: pico via `resource` (aproximação);
+    None quando não há como medir.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            resident_pages = int(fh.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KiB no Linux, bytes no macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limites duros da extração. Diferente do `max_pages` do use case (que só
+    trunca a leitura), estourar um limite aborta a extração:
+      - max_pages é do documento: ExtractionLimitError (HTTP 413);
+      - max_rss_bytes é um disjuntor do processo inteiro, não do documento:
+        o RSS inclui o que as outras extrações do processo (executor de
+        threads, jobs) estão usando, então estourá-lo diz "processo cheio",
+        não "PDF grande demais": OverloadedError (HTTP 503 + Retry-After).
+    """
+
+    # nº máximo de páginas do documento (None = sem limite)
+    max_pages: Optional[int] = None
+    # RSS máximo do processo, em bytes, verificado a cada página
+    max_rss_bytes: Optional[int] = None
+    # sugestão ao cliente quando o disjuntor de memória abre (segundos)
+    retry_after: int = 1
+
+    @classmethod
+    def from_mb(
+        cls,
+        max_pages: Optional[int] = None,
+        max_rss_mb: Optional[int] = None,
+        retry_after: int = 1,
+    ) -> "ResourceLimits":
+        return cls(
+            max_pages=max_pages or None,
+            max_rss_bytes=max_rss_mb * _MB if max_rss_mb else None,
+            retry_after=retry_after,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_pages is not None or self.max_rss_bytes is not None
+
+    def check_pages(self, n_pages: int) -> None:
+        if self.max_pages is not None and n_pages > self.max_pages:
+            raise ExtractionLimitError(
+                f"Documento com {n_pages} páginas excede o limite de "
+                f"{self.max_pages} páginas."
+            )
+
+    def check_rss(self, page_number: int) -> None:
+        if self.max_rss_bytes is None:
+            return
+        rss = current_rss_bytes()
+        if rss is not None and rss > self.max_rss_bytes:
+            raise OverloadedError(
+                f"Memória do processo ({rss // _MB} MB) excedeu o limite de "
+                f"{self.max_rss_bytes // _MB} MB na página {page_number}. "
+                f"Tente novamente em {self.retry_after}s.",
+                retry_after=self.retry_after,
+            )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from pydantic_core import to_json
+
+from ws_docflow.core.domain.fields import Fields, include_of
+from ws_docflow.core.domain.models import DocumentoDados
+from ws_docflow.core.domain.records import DocumentoRecord, record_to_dict
+
+# -----------------------
+# DocumentoDados → JSON (bytes)
+# -----------------------
+# Direto pelo serializer compilado do modelo (pydantic-core), sem o
+# model_dump intermediário (dicts) + json.dumps/JSONResponse, que percorriam
+# a árvore duas vezes. Mesma semântica da saída de sempre: sem campos None
+# nem campos não preenchidos pelo parser; UTF-8 sem escapes (como
+# ensure_ascii=False); Decimal como string e datas em ISO 8601.
+
+_SERIALIZER = DocumentoDados.__pydantic_serializer__
+_EXCLUDE: dict = dict(exclude_none=True, exclude_unset=True)
+
+
+def _indent(pretty: bool) -> Optional[int]:
+    return 2 if pretty else None
+
+
+def _options(fields: Fields) -> dict:
+    include = include_of(fields)
+    return _EXCLUDE if include is None else dict(_EXCLUDE, include=include)
+
+
+def _plain(doc: Any, fields: Fields = None) -> Any:
+    """Dicts JSON-compatíveis de qualquer objeto com `model_dump`."""
+    return doc.model_dump(mode="json", **_options(fields))
+
+
+def documento_json(doc: Any, *, pretty: bool = False, fields: Fields = None) -> bytes:
+    """
+    Um documento → JSON compacto (ou indentado com `pretty`), recortado a
+    `fields` quando há seleção (ver core.domain.fields).
+    """
+    if isinstance(doc, DocumentoDados):
+        return _SERIALIZER.to_json(doc, indent=_indent(pretty), **_options(fields))
+    return to_json(_plain(doc, fields), indent=_indent(pretty))
+
+
+def documentos_json(
+    docs: Iterable[Any], *, pretty: bool = False, fields: Fields = None
+) -> bytes:
+    """Lista de documentos → array JSON."""
+    if pretty:
+        return to_json([_plain(doc, fields) for doc in docs], indent=2)
+    parts = (documento_json(doc, fields=fields) for doc in docs)
+    return b"[" + b",".join(parts) + b"]"
+
+
+def lote_json(docs: Iterable[Any], fields: Fields = None) -> bytes:
+    """Resposta do parse multi: {"documentos": [...], "total": n} (compacto)."""
+    parts = [documento_json(doc, fields=fields) for doc in docs]
+    return b'{"documentos":[%s],"total":%d}' % (b",".join(parts), len(parts))
+
+
+def record_json(record: DocumentoRecord, *, fields: Fields = None) -> bytes:
+    """
+    Forma compacta (core.domain.records) → o mesmo JSON de `documento_json`,
+    sem reconstruir o DocumentoDados: a árvore só tem os campos preenchidos
+    e os None saem no exclude_none.
+    """
+    return to_json(
+        record_to_dict(record), exclude_none=True, include=include_of(fields)
+    )
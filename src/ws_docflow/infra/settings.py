@@ -0,0 +1,146 @@
+# src/ws_docflow/infra/settings.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.getenv(name)
+    return value.strip() if value and value.strip() else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on", "sim"}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return float(value)
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configurações de runtime (API/CLI), lidas de variáveis de ambiente
+    com prefixo `WS_DOCFLOW_`.
+    """
+
+    # backend de extração: pdfplumber | pypdf | auto (pypdf → pdfplumber)
+    pdf_backend: str = "pdfplumber"
+    # extração paralela por páginas (1 = serial) e tamanho mínimo p/ usar o pool
+    pdf_workers: int = 1
+    parallel_min_pages: int = 16
+    # cache de extração: LRU em memória (0 desliga) + disco opcional
+    cache_entries: int = 128
+    cache_dir: Optional[str] = None
+    cache_max_mb: int = 256
+    # parada antecipada: lê páginas só até as âncoras dos parsers aparecerem
+    early_stop: bool = False
+    # orçamento de páginas por documento (None = sem limite)
+    max_pages: Optional[int] = None
+    # modo de memória limitada: libera o layout de cada página após ler o texto
+    memory_bounded: bool = False
+    # limites duros (abortam a extração): nº de páginas do documento e RSS do
+    # processo inteiro (MB; disjuntor, responde 503)
+    page_limit: Optional[int] = None
+    max_rss_mb: Optional[int] = None
+    # OCR (Tesseract) das páginas sem camada de texto
+    ocr: bool = False
+    ocr_lang: str = "por"
+    ocr_workers: int = 2
+    ocr_page_timeout: int = 60
+    # classificador de layout: despacha direto ao parser quando a confiança
+    # passa do mínimo; abaixo dele, a cadeia de fallback completa
+    classify: bool = True
+    classify_min_confidence: float = 0.5
+    # saída dos parsers validada em modo strict, sem coerção de tipos
+    # (padrão: uma validação só, na fronteira do documento, com coerção)
+    strict_models: bool = False
+    # instâncias compartilhadas de unidades/recintos/participantes (por
+    # tabela; 0 desliga)
+    intern_entries: int = 4096
+    # parse da API fora do event loop: executor (thread | process), vagas e
+    # fila de espera; além da fila, HTTP 503 com Retry-After (segundos)
+    parse_executor: str = "thread"
+    parse_workers: int = 2
+    parse_queue: int = 8
+    retry_after: int = 2
+    # tamanho máximo (MB) do corpo dos pedidos e de cada PDF recebido
+    # (None = sem limite); acima dele, HTTP 413 antes de bufferizar o resto
+    max_body_mb: Optional[int] = None
+    max_pdf_mb: Optional[int] = None
+    # jobs assíncronos (/api/jobs): arquivo SQLite da fila, workers, por
+    # quanto tempo (s) o resultado fica disponível depois de concluído e o
+    # lease (s) de um job em processamento sem heartbeat do dono
+    jobs_db: str = "ws_docflow_jobs.sqlite3"
+    job_workers: int = 1
+    job_ttl: int = 86400
+    job_lease: int = 60
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            pdf_backend=_env_str("WS_DOCFLOW_PDF_BACKEND", cls.pdf_backend).lower(),
+            pdf_workers=_env_int("WS_DOCFLOW_PDF_WORKERS", cls.pdf_workers) or 1,
+            parallel_min_pages=_env_int(
+                "WS_DOCFLOW_PARALLEL_MIN_PAGES", cls.parallel_min_pages
+            )
+            or cls.parallel_min_pages,
+            cache_entries=_env_int("WS_DOCFLOW_CACHE_ENTRIES", cls.cache_entries) or 0,
+            cache_dir=os.getenv("WS_DOCFLOW_CACHE_DIR") or None,
+            cache_max_mb=_env_int("WS_DOCFLOW_CACHE_MAX_MB", cls.cache_max_mb)
+            or cls.cache_max_mb,
+            early_stop=_env_bool("WS_DOCFLOW_EARLY_STOP", cls.early_stop),
+            max_pages=_env_int("WS_DOCFLOW_MAX_PAGES", cls.max_pages),
+            memory_bounded=_env_bool("WS_DOCFLOW_MEMORY_BOUNDED", cls.memory_bounded),
+            page_limit=_env_int("WS_DOCFLOW_PAGE_LIMIT", cls.page_limit),
+            max_rss_mb=_env_int("WS_DOCFLOW_MAX_RSS_MB", cls.max_rss_mb),
+            ocr=_env_bool("WS_DOCFLOW_OCR", cls.ocr),
+            ocr_lang=_env_str("WS_DOCFLOW_OCR_LANG", cls.ocr_lang),
+            ocr_workers=_env_int("WS_DOCFLOW_OCR_WORKERS", cls.ocr_workers)
+            or cls.ocr_workers,
+            ocr_page_timeout=_env_int(
+                "WS_DOCFLOW_OCR_PAGE_TIMEOUT", cls.ocr_page_timeout
+            )
+            or cls.ocr_page_timeout,
+            classify=_env_bool("WS_DOCFLOW_CLASSIFY", cls.classify),
+            classify_min_confidence=_env_float(
+                "WS_DOCFLOW_CLASSIFY_MIN_CONFIDENCE", cls.classify_min_confidence
+            ),
+            strict_models=_env_bool("WS_DOCFLOW_STRICT_MODELS", cls.strict_models),
+            intern_entries=_env_int("WS_DOCFLOW_INTERN_ENTRIES", cls.intern_entries)
+            or 0,
+            parse_executor=_env_str(
+                "WS_DOCFLOW_PARSE_EXECUTOR", cls.parse_executor
+            ).lower(),
+            parse_workers=_env_int("WS_DOCFLOW_PARSE_WORKERS", cls.parse_workers) or 1,
+            parse_queue=_env_int("WS_DOCFLOW_PARSE_QUEUE", cls.parse_queue) or 0,
+            retry_after=_env_int("WS_DOCFLOW_RETRY_AFTER", cls.retry_after)
+            or cls.retry_after,
+            max_body_mb=_env_int("WS_DOCFLOW_MAX_BODY_MB", cls.max_body_mb) or None,
+            max_pdf_mb=_env_int("WS_DOCFLOW_MAX_PDF_MB", cls.max_pdf_mb) or None,
+            jobs_db=_env_str("WS_DOCFLOW_JOBS_DB", cls.jobs_db),
+            job_workers=_env_int("WS_DOCFLOW_JOB_WORKERS", cls.job_workers) or 1,
+            job_ttl=_env_int("WS_DOCFLOW_JOB_TTL", cls.job_ttl) or cls.job_ttl,
+            job_lease=_env_int("WS_DOCFLOW_JOB_LEASE", cls.job_lease) or cls.job_lease,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings.from_env()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import base64
+import shutil
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Optional, cast
+
+from ws_docflow.core.errors import PayloadTooLargeError
+
+# -----------------------
+# Ingestão de uploads: buffer "spooled" + limites de tamanho
+# -----------------------
+# O PDF recebido vai em blocos para um SpooledTemporaryFile (memória até
+# _SPOOL_MEMORY, disco acima disso), nunca inteiro num `bytes`. O base64 é
+# decodificado numa única passada, bloco a bloco, direto para esse buffer
+# (antes: uma decodificação só para validar e outra para usar). Os limites
+# valem antes de copiar/decodificar: o tamanho final do base64 sai do
+# comprimento do texto; a cópia de um arquivo para assim que passa do limite.
+
+_MB = 1024 * 1024
+# acima disso o buffer vai para um arquivo temporário (o mesmo do Starlette)
+_SPOOL_MEMORY = _MB
+# caracteres de base64 por bloco (múltiplo de 4) → 3 MB decodificados
+_B64_CHUNK = 4 * _MB
+_COPY_CHUNK = _MB
+
+
+def _spooled() -> BinaryIO:
+    # modo binário: os tipos do typeshed não o deduzem do `mode`
+    return cast(BinaryIO, SpooledTemporaryFile(max_size=_SPOOL_MEMORY, mode="w+b"))
+
+
+def _human(size: int) -> str:
+    return f"{size / _MB:.1f} MB" if size >= _MB else f"{size} bytes"
+
+
+def check_size(size: Optional[int], max_bytes: Optional[int]) -> None:
+    """PayloadTooLargeError se `size` passa de `max_bytes` (None = sem limite)."""
+    if size is not None and max_bytes is not None and size > max_bytes:
+        raise PayloadTooLargeError(
+            f"PDF com {_human(size)} excede o limite de {_human(max_bytes)}."
+        )
+
+
+def spool_copy(fileobj: BinaryIO, max_bytes: Optional[int] = None) -> BinaryIO:
+    """
+    Cópia em blocos de um arquivo (ex.: o upload, que o framework fecha ao
+    fim do pedido) para um buffer próprio, rebobinado.
+    """
+    out = _spooled()
+    try:
+        fileobj.seek(0)
+        if max_bytes is None:
+            shutil.copyfileobj(fileobj, out, _COPY_CHUNK)
+        else:
+            for chunk in iter(lambda: fileobj.read(_COPY_CHUNK), b""):
+                out.write(chunk)
+                check_size(out.tell(), max_bytes)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def decoded_size(text: str) -> int:
+    """Tamanho do conteúdo de um base64 (com padding), sem decodificar."""
+    return len(text) // 4 * 3 - text[-2:].count("=")
+
+
+def decode_base64(text: str, max_bytes: Optional[int] = None) -> BinaryIO:
+    """
+    Base64 (alfabeto padrão, com padding, sem espaços) → buffer rebobinado,
+    numa única passada. ValueError se inválido; PayloadTooLargeError antes
+    de decodificar qualquer byte se o conteúdo passa de `max_bytes`.
+    """
+    if len(text) % 4:
+        raise ValueError("comprimento não é múltiplo de 4 (padding incorreto)")
+    check_size(decoded_size(text), max_bytes)
+    out = _spooled()
+    try:
+        last = len(text) - _B64_CHUNK
+        for start in range(0, len(text), _B64_CHUNK):
+            chunk = text[start : start + _B64_CHUNK]
+            # padding só no fim do texto (o validate aceitaria no fim do bloco)
+            if start < last and chunk.endswith("="):
+                raise ValueError("padding no meio do conteúdo")
+            out.write(base64.b64decode(chunk, validate=True))
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
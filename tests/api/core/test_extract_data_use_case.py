@@ -40,3 +40,7 @@ def test_use_case_fallback():
     assert doc is not None
     assert hasattr(doc, "model_dump")
     assert doc.model_dump()["parser"] == "B"
+
+
+def test_iter_pages_padrao_do_port_usa_extract():
+    assert list(DummyExtractor().iter_pages(b"%PDF")) == ["TEXTO DO PDF"]
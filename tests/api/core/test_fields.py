@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+from ws_docflow.core.domain.fields import include_of, parse_fields, wants
+from ws_docflow.core.errors import InvalidFieldsError
+
+
+def test_parse_fields_vazio_e_tudo():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    assert wants(None, "totais_origem")
+
+
+def test_parse_fields_caminhos_e_secoes():
+    fields = parse_fields("declaracao.numero, situacao_atual,destino")
+
+    assert fields == {"declaracao.numero", "situacao_atual", "destino"}
+    assert wants(fields, "declaracao") and wants(fields, "destino")
+    assert not wants(fields, "totais_origem")
+    assert not wants(fields, "situacao")  # prefixo de "situacao_atual"
+
+
+@pytest.mark.parametrize("spec", ["totais", "destino.foo", "situacao_atual.x"])
+def test_parse_fields_caminho_desconhecido(spec):
+    with pytest.raises(InvalidFieldsError):
+        parse_fields(spec)
+
+
+def test_include_of_ancestral_cobre_o_caminho():
+    fields = parse_fields("origem.unidade_local.codigo,origem,declaracao.numero")
+    assert include_of(fields) == {"origem": True, "declaracao": {"numero": True}}
+    assert include_of(None) is None
@@ -0,0 +1,152 @@
+from ws_docflow.infra.pdf.caching_extractor import (
+    CachingExtractor,
+    DiskCache,
+    ExtractionCache,
+)
+
+
+class CountingExtractor:
+    version = "v1"
+
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, source):
+        self.calls += 1
+        return f"texto-{len(source)}"
+
+
+def test_cache_em_memoria_evita_reextracao():
+    inner = CountingExtractor()
+    ex = CachingExtractor(inner, ExtractionCache(max_entries=2))
+
+    assert ex.extract(b"%PDF-a") == ex.extract(b"%PDF-a") == "texto-6"
+    assert inner.calls == 1
+    ex.extract(b"%PDF-bb")
+    assert inner.calls == 2
+
+    stats = ex.cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_ratio"] == round(1 / 3, 4)
+
+
+def test_cache_em_disco_compartilhado_entre_instancias(tmp_path):
+    inner = CountingExtractor()
+    CachingExtractor(inner, ExtractionCache(disk_dir=tmp_path)).extract(b"%PDF-a")
+
+    # "outro processo": memória vazia, mesmo diretório
+    other = ExtractionCache(max_entries=0, disk_dir=tmp_path)
+    assert CachingExtractor(inner, other).extract(b"%PDF-a") == "texto-6"
+    assert inner.calls == 1 and other.disk_hits == 1
+
+
+def test_chave_muda_com_versao_do_extrator():
+    cache = ExtractionCache()
+    inner = CountingExtractor()
+    CachingExtractor(inner, cache).extract(b"%PDF-a")
+
+    inner.version = "v2"
+    CachingExtractor(inner, cache).extract(b"%PDF-a")
+    assert inner.calls == 2
+
+
+def test_disco_respeita_limite_de_tamanho(tmp_path):
+    disk = DiskCache(tmp_path, max_bytes=25)
+    for i in range(5):
+        disk.put(f"{i:02d}chave", "x" * 10)
+
+    files = list(tmp_path.glob("*/*.txt"))
+    assert sum(f.stat().st_size for f in files) <= 25
+    assert disk.get("04chave") == "x" * 10  # o mais recente sobrevive
+
+
+class PagedExtractor(CountingExtractor):
+    def iter_pages(self, source):
+        self.calls += 1
+        yield from ("p1", "", "p2")
+
+
+def test_iter_pages_leitura_parcial_grava_e_cresce_sob_demanda():
+    inner = PagedExtractor()
+    ex = CachingExtractor(inner, ExtractionCache())
+
+    pages = ex.iter_pages(b"%PDF-a")
+    assert next(pages) == "p1"
+    pages.close()  # consumidor parou cedo: grava só o que foi lido
+    assert ex.cache.stats()["memory_entries"] == 1
+
+    # o início sai do cache; o resto, do extrator (e a entrada fica completa)
+    assert list(ex.iter_pages(b"%PDF-a")) == ["p1", "", "p2"]
+    assert list(ex.iter_pages(b"%PDF-a")) == ["p1", "", "p2"]
+    assert inner.calls == 2
+
+
+def test_iter_pages_acerto_respeita_max_pages():
+    from ws_docflow.core.pages import join_until
+
+    inner = PagedExtractor()
+    ex = CachingExtractor(inner, ExtractionCache())
+    assert join_until(ex.iter_pages(b"%PDF-a"), max_pages=1) == "p1"
+    assert join_until(ex.iter_pages(b"%PDF-a"), max_pages=1) == "p1"
+    assert inner.calls == 1
+
+
+def test_early_stop_duas_vezes_acerta_o_cache():
+    import re
+
+    from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+
+    class Parser:
+        required_anchors = (re.compile("p1"),)
+
+        def parse(self, text):
+            return text
+
+    inner = PagedExtractor()
+    ex = CachingExtractor(inner, ExtractionCache())
+    uc = ExtractDataUseCase(ex, Parser(), early_stop=True)
+
+    assert uc.run(b"%PDF-a") == uc.run(b"%PDF-a") == "p1"
+    assert inner.calls == 1
+    stats = ex.cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 1)
+
+
+def test_pagina_vazia_e_documento_sem_paginas_no_cache():
+    class Vazio(CountingExtractor):
+        def iter_pages(self, source):
+            self.calls += 1
+            return iter(())
+
+    inner = Vazio()
+    ex = CachingExtractor(inner, ExtractionCache())
+    assert list(ex.iter_pages(b"%PDF-a")) == list(ex.iter_pages(b"%PDF-a")) == []
+    assert inner.calls == 1
+
+
+def test_chave_do_auto_depende_dos_parsers():
+    from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+    from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+    from ws_docflow.infra.pdf.factory import build_extractor
+
+    cache = ExtractionCache()
+    extrato = build_extractor("auto", [BrDtaExtratoParser()], cache=cache)
+    ambos = build_extractor("auto", [BrDtaExtratoParser(), BrDtaParser()], cache=cache)
+
+    assert extrato.cache_key(b"%PDF-a") != ambos.cache_key(b"%PDF-a")
+
+
+def test_disco_so_lista_o_diretorio_acima_do_limite(tmp_path, monkeypatch):
+    disk = DiskCache(tmp_path, max_bytes=25)
+    scans = []
+    real = DiskCache._entries
+    monkeypatch.setattr(
+        DiskCache, "_entries", lambda self: scans.append(1) or real(self)
+    )
+
+    disk.put("00chave", "x" * 10)
+    disk.put("01chave", "x" * 10)
+    assert scans == []
+    disk.put("02chave", "x" * 10)  # 30 > 25: lista e descarta o mais antigo
+    assert scans == [1]
+    assert disk._total <= 25
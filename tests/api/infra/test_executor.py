@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+
+from ws_docflow.core.errors import OverloadedError
+from ws_docflow.infra.executor import ParsePool
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def test_pool_roda_fora_do_event_loop():
+    pool = ParsePool(workers=1, max_queue=0)
+    try:
+        name = asyncio.run(pool.run(_thread_name))
+        assert name.startswith("ws-docflow-parse")
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_pool_lotado_recusa_na_hora():
+    pool = ParsePool(workers=1, max_queue=1, retry_after=7)
+    gate = threading.Event()
+
+    async def cenario():
+        first = asyncio.ensure_future(pool.run(gate.wait, 5))
+        second = asyncio.ensure_future(pool.run(gate.wait, 5))
+        await asyncio.sleep(0)
+        stats = pool.stats()
+        assert (stats["in_flight"], stats["queued"]) == (1, 1)
+        assert pool.saturated
+        with pytest.raises(OverloadedError) as exc:
+            await pool.run(gate.wait, 5)
+        assert exc.value.retry_after == 7
+        gate.set()
+        return await asyncio.gather(first, second)
+
+    try:
+        assert asyncio.run(cenario()) == [True, True]
+        stats = pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert (stats["in_flight"], stats["queued"]) == (0, 0)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_run_waiting_espera_vaga_sem_recusar():
+    pool = ParsePool(workers=1, max_queue=0)
+    gate = threading.Event()
+
+    async def cenario():
+        first = asyncio.ensure_future(pool.run(gate.wait, 5))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(pool.run_waiting(divmod, 7, 2))
+        await asyncio.sleep(0.05)
+        # lotado: o 2º espera (não falha nem roda) até a vaga abrir
+        assert not second.done()
+        gate.set()
+        return await asyncio.gather(first, second)
+
+    try:
+        assert asyncio.run(cenario()) == [True, (3, 1)]
+        stats = pool.stats()
+        assert (stats["completed"], stats["rejected"]) == (2, 0)
+        assert pool._waiters == []
+    finally:
+        pool.shutdown()
+
+
+def test_pool_conta_falhas():
+    pool = ParsePool(workers=1, max_queue=0)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            asyncio.run(pool.run(divmod, 1, 0))
+        assert pool.stats()["failed"] == 1
+        # a vaga foi liberada
+        assert asyncio.run(pool.run(divmod, 7, 2)) == (3, 1)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_de_processos():
+    pool = ParsePool(workers=1, max_queue=0, kind="process")
+    try:
+        assert asyncio.run(pool.run(divmod, 7, 2)) == (3, 1)
+        assert pool.stats()["executor"] == "process"
+    finally:
+        pool.shutdown()
+
+
+def test_pool_tipo_invalido():
+    with pytest.raises(ValueError):
+        ParsePool(kind="fiber")
@@ -0,0 +1,177 @@
+import json
+import tempfile
+import threading
+import time
+
+from ws_docflow.core.errors import ExtractionLimitError
+from ws_docflow.infra.jobs import (
+    CONCLUIDO,
+    FALHOU,
+    PENDENTE,
+    PROCESSANDO,
+    JobRunner,
+    JobStore,
+    job_json,
+)
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _wait_done(store: JobStore, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job is not None and job.terminado:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} não terminou")
+
+
+def test_fila_em_ordem_de_chegada(tmp_path):
+    clock = Clock()
+    store = JobStore(tmp_path / "jobs.db", clock=clock)
+    first = store.submit(b"%PDF-1", "a.pdf", "destino")
+    clock.now += 1
+    store.submit(b"%PDF-2", "b.pdf")
+
+    assert store.claim() == (first.id, b"%PDF-1", "destino")
+    assert store.get(first.id).estado == PROCESSANDO
+    assert store.stats() == {PENDENTE: 1, PROCESSANDO: 1, CONCLUIDO: 0, FALHOU: 0}
+
+    store.finish(first.id, b'{"ok":true}')
+    job = store.get(first.id)
+    assert job.estado == CONCLUIDO
+    assert json.loads(job_json(job))["documento"] == {"ok": True}
+
+
+def test_jobs_sobrevivem_a_restart(tmp_path):
+    clock = Clock()
+    path = tmp_path / "jobs.db"
+    store = JobStore(path, lease=30, clock=clock)
+    interrompido = store.submit(b"%PDF-1", "a.pdf")
+    pendente = store.submit(b"%PDF-2", "b.pdf")
+    store.claim()  # "processando" quando o processo morreu
+    store.close()
+
+    reaberto = JobStore(path, lease=30, clock=clock)
+    assert reaberto.recover() == 0  # o lease do dono ainda vale
+    clock.now += 30
+    assert reaberto.recover() == 1
+    assert reaberto.get(interrompido.id).estado == PENDENTE
+    assert reaberto.get(pendente.id).estado == PENDENTE
+
+
+def test_recover_so_devolve_leases_vencidos(tmp_path):
+    clock = Clock()
+    path = tmp_path / "jobs.db"
+    vivo = JobStore(path, lease=30, clock=clock)
+    outro = JobStore(path, lease=30, clock=clock)
+    job = vivo.submit(b"%PDF-1")
+    assert vivo.claim()[0] == job.id
+
+    # outro worker subindo não toma o job de quem está vivo e renova o lease
+    clock.now += 20
+    assert outro.recover() == 0
+    assert vivo.renew() == 1
+    clock.now += 20
+    assert outro.recover() == 0
+
+    # sem heartbeat até vencer: volta para a fila e outro worker o pega
+    clock.now += 10
+    assert outro.recover() == 1
+    assert outro.claim()[0] == job.id
+    # o dono antigo não sobrescreve o resultado de quem retomou o job
+    assert not vivo.finish(job.id, b'{"velho":true}')
+    assert outro.finish(job.id, b'{"novo":true}')
+    assert outro.get(job.id).documento == b'{"novo":true}'
+
+
+def test_dois_runners_no_mesmo_arquivo_nao_repetem_job(tmp_path):
+    path = tmp_path / "jobs.db"
+    started = threading.Event()
+    gate = threading.Event()
+    calls = []
+
+    def run(pdf, fields):
+        calls.append(pdf)
+        started.set()
+        gate.wait(5)
+        return b"{}"
+
+    a = JobRunner(JobStore(path, lease=0.3), run, poll=0.05)
+    b = JobRunner(JobStore(path, lease=0.3), run, poll=0.05)
+    a.start()
+    try:
+        job = a.submit(b"%PDF-1")
+        assert started.wait(5)
+        # o 2º worker sobe (e fica ocioso) enquanto o 1º processa, por mais
+        # de um lease: o heartbeat mantém o job com quem o pegou
+        b.start()
+        time.sleep(1.0)
+        gate.set()
+        assert _wait_done(a.store, job.id).estado == CONCLUIDO
+        assert calls == [b"%PDF-1"]
+    finally:
+        gate.set()
+        a.stop(timeout=5)
+        b.stop(timeout=5)
+
+
+def test_submit_de_arquivo_grava_o_pdf_em_blocos(tmp_path, monkeypatch):
+    import ws_docflow.infra.jobs as jobs_mod
+
+    monkeypatch.setattr(jobs_mod, "_BLOB_CHUNK", 7)
+    pdf = b"%PDF-1.4\n" + bytes(range(256)) * 4
+    upload = tempfile.TemporaryFile()
+    upload.write(pdf)  # posição no fim, como depois da cópia do upload
+
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit(upload, "a.pdf")
+    upload.close()
+
+    assert store.claim() == (job.id, pdf, None)
+
+
+def test_resultado_expira_no_ttl(tmp_path):
+    clock = Clock()
+    store = JobStore(tmp_path / "jobs.db", ttl=60, clock=clock)
+    job = store.submit(b"%PDF-1")
+    store.claim()
+    store.fail(job.id, 422, "layout desconhecido")
+
+    clock.now += 59
+    assert store.get(job.id).erro == "layout desconhecido"
+    clock.now += 1
+    assert store.get(job.id) is None
+    assert store.purge() == 1
+
+
+def test_runner_processa_e_mapeia_erros(tmp_path):
+    def run(pdf, fields):
+        if pdf == b"%PDF grande":
+            raise ExtractionLimitError("900 páginas")
+        if pdf == b"%PDF quebrado":
+            raise ValueError("layout desconhecido")
+        return b'{"fields":%s}' % json.dumps(fields and sorted(fields)).encode()
+
+    store = JobStore(tmp_path / "jobs.db")
+    runner = JobRunner(store, run, workers=2, poll=0.05)
+    runner.start()
+    try:
+        ok = runner.submit(b"%PDF ok", "a.pdf", "destino")
+        grande = runner.submit(b"%PDF grande")
+        quebrado = runner.submit(b"%PDF quebrado")
+
+        assert _wait_done(store, ok.id).documento == b'{"fields":["destino"]}'
+        assert _wait_done(store, grande.id).status == 413
+        job = _wait_done(store, quebrado.id)
+        assert (job.estado, job.status) == (FALHOU, 422)
+        assert "layout desconhecido" in job.erro
+    finally:
+        runner.stop(timeout=5)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from ws_docflow.infra.metrics import StageMetrics, prometheus_lines, record, timed
+
+
+def test_histograma_de_etapa_no_formato_prometheus():
+    m = StageMetrics()
+    m.observe("parse", 0.003)
+    m.observe("parse", 0.2)
+    m.observe("parse", 60)
+
+    text = m.prometheus()
+
+    assert "# TYPE ws_docflow_stage_seconds histogram" in text
+    assert 'ws_docflow_stage_seconds_bucket{stage="parse",le="0.001"} 0' in text
+    assert 'ws_docflow_stage_seconds_bucket{stage="parse",le="0.005"} 1' in text
+    assert 'ws_docflow_stage_seconds_bucket{stage="parse",le="30"} 2' in text
+    assert 'ws_docflow_stage_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'ws_docflow_stage_seconds_count{stage="parse"} 3' in text
+    assert 'ws_docflow_stage_seconds_sum{stage="parse"} 60.203' in text
+    assert text.endswith("\n")
+
+
+def test_valores_e_contadores():
+    m = StageMetrics()
+    m.record("pdf_pages", 3)
+    m.count("parser_attempts", parser="P", result="matched")
+    m.count("parser_attempts", parser="P", result="matched")
+
+    text = m.prometheus(prefix="x")
+
+    assert 'x_pdf_pages_bucket{le="2"} 0' in text
+    assert 'x_pdf_pages_bucket{le="5"} 1' in text
+    assert "x_pdf_pages_sum 3" in text
+    assert "# TYPE x_parser_attempts_total counter" in text
+    assert 'x_parser_attempts_total{parser="P",result="matched"} 2' in text
+
+
+def test_stats_continua_so_com_as_etapas():
+    m = StageMetrics()
+    with m.timed("extract"):
+        pass
+    m.record("input_bytes", 1024)
+    m.count("fallbacks", reason="parser")
+
+    assert set(m.stats()) == {"extract"}
+    m.reset()
+    assert m.prometheus() == ""
+
+
+def test_atalhos_aceitam_sink_ausente_ou_so_com_observe():
+    class SoObserve:
+        def __init__(self):
+            self.stages = []
+
+        def observe(self, stage, seconds):
+            self.stages.append(stage)
+
+    sink = SoObserve()
+    with timed(sink, "open"):
+        pass
+    record(sink, "pdf_pages", 2)  # sem `record`: ignorado
+    with timed(None, "open"):
+        pass
+    record(None, "pdf_pages", 2)
+
+    assert sink.stages == ["open"]
+
+
+def test_prometheus_lines_escapa_rotulos():
+    lines = prometheus_lines("g", "gauge", "ajuda", [({"k": 'a"b'}, 0.5)])
+    assert lines == ["# HELP g ajuda", "# TYPE g gauge", 'g{k="a\\"b"} 0.5']
@@ -0,0 +1,173 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ws_docflow.infra.pdf.ocr_extractor as mod
+from ws_docflow.infra.lru import LruCache
+from ws_docflow.infra.pdf.ocr_extractor import OcrFallbackExtractor
+
+
+class FakePDF:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        return False
+
+
+class FakeStream:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def get_rawdata(self):
+        return self.raw
+
+
+class FakePage:
+    width = 595
+    height = 842
+
+    def __init__(self, text, scan=None):
+        self._text = text
+        self.images = [{"stream": FakeStream(scan)}] if scan else []
+
+    def extract_text(self):
+        return self._text
+
+
+def _setup(monkeypatch, pages, ocr):
+    calls = []
+
+    def fake_ocr(path, index, resolution, lang, timeout):
+        calls.append(index)
+        return ocr(index)
+
+    monkeypatch.setattr(mod, "_open_pdf", lambda _src: FakePDF(pages))
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(mod, "_ocr_page", fake_ocr)
+    monkeypatch.setattr(mod, "_POOLS", {})  # pool compartilhado novo por teste
+    return calls
+
+
+def test_ocr_so_nas_paginas_sem_texto(monkeypatch):
+    pages = [
+        FakePage("Texto A"),
+        FakePage("", scan=b"scan-1"),
+        FakePage(None),  # em branco: sem imagem, nada a reconhecer
+        FakePage("Texto D"),
+    ]
+    calls = _setup(monkeypatch, pages, lambda i: f"OCR {i}")
+
+    ex = OcrFallbackExtractor(cache=LruCache(8))
+    assert list(ex.iter_pages(b"%PDF")) == ["Texto A", "OCR 1", "", "Texto D"]
+    assert calls == [1]
+    assert ex.ocr_pages == 1
+
+
+def test_ocr_sem_paginas_escaneadas_nao_cria_pool(monkeypatch):
+    _setup(monkeypatch, [FakePage("A"), FakePage("B")], lambda i: "x")
+
+    def no_pool(*a, **k):
+        raise AssertionError("pool não deveria ser criado")
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", no_pool)
+    assert OcrFallbackExtractor(cache=LruCache(8)).extract(b"%PDF") == "A\nB"
+
+
+def test_ocr_cache_por_conteudo_da_pagina(monkeypatch):
+    pages = [FakePage("", scan=b"mesmo"), FakePage("", scan=b"mesmo")]
+    calls = _setup(monkeypatch, pages, lambda i: "reconhecido")
+    cache = LruCache(8)
+
+    ex = OcrFallbackExtractor(workers=1, cache=cache)
+    assert ex.extract(b"%PDF") == "reconhecido\nreconhecido"
+    # 2ª leitura (outra instância, mesmo cache): nenhum OCR novo
+    assert OcrFallbackExtractor(workers=1, cache=cache).extract(b"%PDF")
+    assert calls == [0]
+    assert ex.ocr_cache_hits == 1
+
+
+def test_ocr_timeout_por_pagina(monkeypatch):
+    pages = [FakePage("", scan=b"lento"), FakePage("Texto B")]
+
+    def slow(_i):
+        time.sleep(0.5)
+        return "tarde demais"
+
+    _setup(monkeypatch, pages, slow)
+    ex = OcrFallbackExtractor(page_timeout=0.05, cache=LruCache(8))
+    ex.result_grace = 0
+
+    assert list(ex.iter_pages(b"%PDF")) == ["", "Texto B"]
+    assert ex.ocr_timeouts == 1
+
+
+def test_ocr_pool_compartilhado_entre_extracoes(monkeypatch):
+    pages = [FakePage("", scan=f"scan-{i}".encode()) for i in range(4)]
+    _setup(monkeypatch, pages, lambda i: f"OCR {i}")
+    pools = []
+
+    class SpyPool(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", SpyPool)
+
+    # uma instância por requisição, como na API: o pool é um só
+    for _ in range(3):
+        ex = OcrFallbackExtractor(workers=2, cache=LruCache(8))
+        assert ex.extract(b"%PDF") == "OCR 0\nOCR 1\nOCR 2\nOCR 3"
+    assert pools == [2]
+
+
+def test_ocr_timeout_rodando_mata_o_worker_e_segue(monkeypatch):
+    pages = [FakePage("", scan=b"travado"), FakePage("", scan=b"ok")]
+
+    def ocr(i):
+        if i == 0:
+            time.sleep(0.3)  # rasterização/Tesseract travado
+        return "OK"
+
+    _setup(monkeypatch, pages, ocr)
+    killed = []
+
+    class FakeProcess:
+        def kill(self):
+            killed.append(True)
+
+    class SpyPool(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            super().__init__(max_workers)
+            self._processes = {1: FakeProcess()}
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", SpyPool)
+    ex = OcrFallbackExtractor(workers=1, page_timeout=0.05, cache=LruCache(8))
+    ex.result_grace = 0
+
+    # a 2ª página estava na fila do executor morto: vai ao novo
+    assert list(ex.iter_pages(b"%PDF")) == ["", "OK"]
+    assert killed == [True] and ex.ocr_timeouts == 1
+
+
+def test_ocr_prazo_conta_do_envio(monkeypatch):
+    class SlowPage(FakePage):
+        def extract_text(self):
+            time.sleep(0.15)  # página seguinte demora: a coleta atrasa
+            return super().extract_text()
+
+    pages = [FakePage("", scan=b"lento"), SlowPage("Texto B")]
+
+    def slow(_i):
+        time.sleep(0.3)
+        return "tarde demais"
+
+    _setup(monkeypatch, pages, slow)
+    ex = OcrFallbackExtractor(workers=1, page_timeout=0.2, cache=LruCache(8))
+    ex.result_grace = 0
+
+    # 0,2 s desde o envio (não desde a coleta, que acharia o OCR pronto)
+    assert list(ex.iter_pages(b"%PDF")) == ["", "Texto B"]
+    assert ex.ocr_timeouts == 1
@@ -47,3 +47,126 @@ def test_pdfplumber_extractor_sem_texto(monkeypatch, tmp_path):
     pdf.write_bytes(b"%PDF-1.4\n")
     out = PdfPlumberExtractor().extract(str(pdf))
     assert out.strip() == ""  # garante retorno vazio sem explodir
+
+
+class CountingPage(FakePage):
+    calls = 0
+
+    def extract_text(self):
+        CountingPage.calls += 1
+        return self._text
+
+
+def test_pdfplumber_extractor_early_stop(monkeypatch):
+    from ws_docflow.core.pages import join_until
+    from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+
+    pages = [
+        CountingPage(
+            "Origem\nUnidade Local : 1017700 - PORTO\n"
+            "Recinto Aduaneiro : 0301304 - TECON"
+        ),
+        CountingPage(
+            "Destino\nUnidade Local : 1010700 - DRF\n"
+            "Recinto Aduaneiro : 0403201 - EADI\nCargas"
+        ),
+    ] + [CountingPage("carga") for _ in range(50)]
+    CountingPage.calls = 0
+    monkeypatch.setattr(
+        mod, "pdfplumber", types.SimpleNamespace(open=lambda _s: FakePDF(pages))
+    )
+
+    from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+
+    anchors = [BrDtaExtratoParser.required_anchors]
+    out = join_until(PdfPlumberExtractor().iter_pages(b"%PDF"), anchors)
+    assert CountingPage.calls == 2  # bloco Origem/Destino quebrado entre páginas
+    assert out.endswith("Cargas")
+
+    CountingPage.calls = 0
+    out = join_until(PdfPlumberExtractor().iter_pages(b"%PDF"), [], max_pages=3)
+    assert CountingPage.calls == 3 and out.endswith("carga")
+
+
+def test_pdfplumber_extractor_paralelo_costura_na_ordem(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pages = [FakePage(f"p{i}" if i % 3 else None) for i in range(10)]
+    monkeypatch.setattr(
+        mod, "pdfplumber", types.SimpleNamespace(open=lambda _s: FakePDF(pages))
+    )
+    # threads no lugar de processos: mesmo contrato, sem depender de fork
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+
+    serial = PdfPlumberExtractor().extract(b"%PDF")
+    paralelo = PdfPlumberExtractor(workers=3, parallel_min_pages=4).extract(b"%PDF")
+    assert paralelo == serial == "p1\np2\np4\np5\np7\np8"
+
+
+def test_pdfplumber_iter_pages_paralelo_entrega_na_ordem_e_para_cedo(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pages = [FakePage(f"p{i}") for i in range(12)]
+    monkeypatch.setattr(
+        mod, "pdfplumber", types.SimpleNamespace(open=lambda _s: FakePDF(pages))
+    )
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    from ws_docflow.core.pages import join_until
+    from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+
+    ex = PdfPlumberExtractor(workers=2, parallel_min_pages=4)
+    assert list(ex.iter_pages(b"%PDF")) == [f"p{i}" for i in range(12)]
+    assert join_until(ex.iter_pages(b"%PDF"), [], max_pages=3) == "p0\np1\np2"
+
+
+class ClosingPage(FakePage):
+    def __init__(self, text):
+        super().__init__(text)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pdfplumber_extractor_memory_bounded_libera_paginas(monkeypatch):
+    pages = [ClosingPage("A"), ClosingPage("B")]
+    monkeypatch.setattr(
+        mod, "pdfplumber", types.SimpleNamespace(open=lambda _s: FakePDF(pages))
+    )
+
+    from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+
+    assert PdfPlumberExtractor().extract(b"%PDF") == "A\nB"
+    assert not any(p.closed for p in pages)
+
+    it = PdfPlumberExtractor(memory_bounded=True).iter_pages(b"%PDF")
+    assert next(it) == "A"
+    assert pages[0].closed and not pages[1].closed  # liberada logo após o texto
+
+
+def test_pdfplumber_extractor_limites(monkeypatch):
+    import pytest
+
+    import ws_docflow.infra.resources as resources
+    from ws_docflow.core.errors import ExtractionLimitError, OverloadedError
+    from ws_docflow.infra.resources import ResourceLimits
+
+    pages = [FakePage("A"), FakePage("B"), FakePage("C")]
+    monkeypatch.setattr(
+        mod, "pdfplumber", types.SimpleNamespace(open=lambda _s: FakePDF(pages))
+    )
+
+    from ws_docflow.infra.pdf.pdfplumber_extractor import PdfPlumberExtractor
+
+    with pytest.raises(ExtractionLimitError, match="3 páginas"):
+        PdfPlumberExtractor(limits=ResourceLimits(max_pages=2)).extract(b"%PDF")
+
+    monkeypatch.setattr(resources, "current_rss_bytes", lambda: 600 * 1024 * 1024)
+    limits = ResourceLimits.from_mb(max_rss_mb=512, retry_after=7)
+    # disjuntor do processo (não do documento): 503 + Retry-After na API
+    with pytest.raises(OverloadedError, match="página 1") as exc:
+        list(PdfPlumberExtractor(limits=limits).iter_pages(b"%PDF"))
+    assert exc.value.retry_after == 7
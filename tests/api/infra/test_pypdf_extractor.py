@@ -0,0 +1,79 @@
+import types
+
+import pytest
+
+import ws_docflow.infra.pdf.pypdf_extractor as mod
+from ws_docflow.infra.pdf.factory import build_extractor
+from ws_docflow.infra.pdf.fallback_extractor import FallbackExtractor, parsers_accept
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+
+TEXTO_OK = """
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - TECON RIO GRANDE
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI MULTI ARMAZENS
+""".strip()
+
+
+class FakePage:
+    def __init__(self, text):
+        self._text = text
+
+    def extract_text(self):
+        return self._text
+
+
+class FakeExtractor:
+    def __init__(self, text=None, exc=None):
+        self.text = text
+        self.exc = exc
+        self.calls = 0
+
+    def extract(self, source):
+        self.calls += 1
+        if self.exc:
+            raise self.exc
+        return self.text
+
+
+def test_pypdf_extractor_ok(monkeypatch):
+    def fake_reader(_stream):
+        return types.SimpleNamespace(
+            pages=[FakePage("A"), FakePage(None), FakePage("B")]
+        )
+
+    monkeypatch.setattr(mod, "pypdf", types.SimpleNamespace(PdfReader=fake_reader))
+
+    out = mod.PypdfExtractor().extract(b"%PDF-1.4\n")
+    assert out == "A\nB"
+
+
+def test_pypdf_extractor_tipo_invalido():
+    with pytest.raises(TypeError):
+        mod.PypdfExtractor().extract(123)  # type: ignore[arg-type]
+
+
+def test_fallback_usa_rapido_quando_parser_acha_ancoras():
+    fast, slow = FakeExtractor(TEXTO_OK), FakeExtractor("lento")
+    ex = FallbackExtractor(fast, slow, parsers_accept([BrDtaExtratoParser()]))
+
+    assert ex.extract(b"%PDF") == TEXTO_OK
+    assert slow.calls == 0 and ex.primary_hits == 1
+
+
+@pytest.mark.parametrize(
+    "fast", [FakeExtractor("texto sem âncoras"), FakeExtractor(exc=ValueError("x"))]
+)
+def test_fallback_recorre_ao_lento(fast):
+    slow = FakeExtractor(TEXTO_OK)
+    ex = FallbackExtractor(fast, slow, parsers_accept([BrDtaExtratoParser()]))
+
+    assert ex.extract(b"%PDF") == TEXTO_OK
+    assert slow.calls == 1 and ex.fallbacks == 1
+
+
+def test_build_extractor_backend_invalido():
+    with pytest.raises(ValueError):
+        build_extractor("inexistente")
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.serialization import (
+    documento_json,
+    documentos_json,
+    lote_json,
+)
+
+EXTRATO = """
+Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte : RODOVIARIA
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZÉNS LTDA-NOVO HAMBURGO/RS
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+"""
+
+
+def _doc():
+    return BrDtaExtratoParser().parse(EXTRATO)
+
+
+def _legado(doc):
+    return doc.model_dump(mode="json", exclude_none=True, exclude_unset=True)
+
+
+def test_mesmo_conteudo_que_model_dump_sem_none_nem_unset():
+    doc = _doc()
+    out = documento_json(doc)
+
+    assert json.loads(out) == _legado(doc)
+    assert b"null" not in out
+    assert b'"valor_total_usd":"57024.00"' in out
+    assert "ARMAZÉNS".encode() in out  # UTF-8 sem escapes
+
+
+def test_compacto_por_padrao_e_indentado_com_pretty():
+    doc = _doc()
+    compacto = documento_json(doc)
+    pretty = documento_json(doc, pretty=True)
+
+    assert b"\n" not in compacto and b'": ' not in compacto
+    assert pretty.startswith(b'{\n  "declaracao": {')
+    assert json.loads(pretty) == json.loads(compacto)
+
+
+def test_listas_e_lote():
+    docs = [_doc(), _doc()]
+    esperado = [_legado(d) for d in docs]
+
+    assert json.loads(documentos_json(docs)) == esperado
+    assert json.loads(documentos_json(docs, pretty=True)) == esperado
+    assert json.loads(lote_json(docs)) == {"documentos": esperado, "total": 2}
+    assert json.loads(lote_json([])) == {"documentos": [], "total": 0}
@@ -0,0 +1,85 @@
+import io
+import mmap
+import types
+
+import pytest
+
+import ws_docflow.infra.pdf.pdfplumber_extractor as plumber_mod
+from ws_docflow.infra.pdf.caching_extractor import CachingExtractor, ExtractionCache
+from ws_docflow.infra.pdf.sources import BufferReader, pdf_input, picklable_source
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 10
+
+
+def test_buffer_reader_le_sem_copiar_o_buffer():
+    buf = bytearray(PDF)
+    r = BufferReader(memoryview(buf))
+    assert r.read(4) == b"%PDF"
+    r.seek(-3, io.SEEK_END)
+    assert r.read() == PDF[-3:]
+    r.seek(0)
+    assert r.read() == PDF
+
+    buf[0:4] = b"XXXX"  # mesma memória: nada foi copiado
+    r.seek(0)
+    assert r.read(4) == b"XXXX"
+
+
+@pytest.fixture
+def fontes(tmp_path):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(PDF)
+    fh = open(path, "r+b")
+    mm = mmap.mmap(fh.fileno(), 0)
+    spooled = io.BytesIO(PDF)
+    spooled.read(10)  # posição "suja": o extrator rebobina
+    yield [str(path), PDF, bytearray(PDF), memoryview(PDF), mm, spooled]
+    mm.close()
+    fh.close()
+
+
+def test_pdfplumber_aceita_todos_os_tipos_de_fonte(monkeypatch, fontes):
+    class FakePDF:
+        def __init__(self, stream):
+            data = open(stream, "rb").read() if isinstance(stream, str) else None
+            self.data = data if data is not None else stream.read()
+            self.pages = [types.SimpleNamespace(extract_text=lambda: "ok")]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+    lidos = []
+
+    def fake_open(stream):
+        pdf = FakePDF(stream)
+        lidos.append(pdf.data)
+        return pdf
+
+    monkeypatch.setattr(
+        plumber_mod, "pdfplumber", types.SimpleNamespace(open=fake_open)
+    )
+    ex = plumber_mod.PdfPlumberExtractor()
+    for fonte in fontes:
+        assert ex.extract(fonte) == "ok"
+    assert lidos == [PDF] * len(fontes)
+
+
+def test_cache_key_igual_para_qualquer_fonte(fontes):
+    ex = CachingExtractor(types.SimpleNamespace(version="1"), ExtractionCache())
+    assert len({ex.cache_key(f) for f in fontes}) == 1
+
+
+def test_picklable_source_preserva_posicao_do_arquivo():
+    fh = io.BytesIO(PDF)
+    fh.seek(7)
+    assert picklable_source(fh) == PDF
+    assert fh.tell() == 7
+    assert picklable_source(memoryview(PDF)) == PDF
+
+
+def test_fonte_invalida():
+    with pytest.raises(TypeError):
+        pdf_input(123)  # type: ignore[arg-type]
@@ -0,0 +1,41 @@
+import base64
+import io
+
+import pytest
+
+from ws_docflow.core.errors import PayloadTooLargeError
+from ws_docflow.infra import uploads
+from ws_docflow.infra.uploads import decode_base64, decoded_size, spool_copy
+
+
+def test_decode_base64_em_blocos(monkeypatch):
+    monkeypatch.setattr(uploads, "_B64_CHUNK", 8)  # vários blocos por texto
+    for n in range(40):
+        data = bytes(range(n))
+        text = base64.b64encode(data).decode()
+        assert decoded_size(text) == n
+        assert decode_base64(text).read() == data
+
+
+@pytest.mark.parametrize(
+    "text", ["AAA", "####", "AAAA AAA", "AAAAAA==AAAA", "AA==AAAA"]
+)
+def test_decode_base64_invalido(monkeypatch, text):
+    monkeypatch.setattr(uploads, "_B64_CHUNK", 8)
+    with pytest.raises(ValueError):
+        decode_base64(text)
+
+
+def test_limite_antes_de_decodificar(monkeypatch):
+    def nao_decodifica(*args, **kwargs):
+        raise AssertionError("decodificou acima do limite")
+
+    monkeypatch.setattr(uploads.base64, "b64decode", nao_decodifica)
+    with pytest.raises(PayloadTooLargeError):
+        decode_base64(base64.b64encode(b"x" * 100).decode(), max_bytes=99)
+
+
+def test_spool_copy_para_no_limite():
+    assert spool_copy(io.BytesIO(b"%PDF-1.4")).read() == b"%PDF-1.4"
+    with pytest.raises(PayloadTooLargeError):
+        spool_copy(io.BytesIO(b"x" * 100), max_bytes=10)
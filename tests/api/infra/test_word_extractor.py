@@ -0,0 +1,43 @@
+import ws_docflow.infra.pdf.word_extractor as mod
+from ws_docflow.core.ports import PositionedWord
+from ws_docflow.infra.pdf.word_extractor import PdfPlumberWordExtractor
+
+
+class FakePDF:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        return False
+
+
+class FakePage:
+    def __init__(self, words):
+        self._words = words
+        self.closed = False
+
+    def extract_words(self, **kwargs):
+        return self._words
+
+    def close(self):
+        self.closed = True
+
+
+def _w(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 10, "top": top, "bottom": top + 8}
+
+
+def test_word_extractor_palavras_posicionadas(monkeypatch):
+    pages = [FakePage([_w("Origem", 40, 10)]), FakePage([_w("Cargas", 40, 10)])]
+    monkeypatch.setattr(mod, "_open_pdf", lambda _src: FakePDF(pages))
+
+    words = PdfPlumberWordExtractor().extract_words(b"%PDF")
+
+    assert words == [
+        PositionedWord("Origem", 40, 50, 10, 18, 0),
+        PositionedWord("Cargas", 40, 50, 10, 18, 1),
+    ]
+    assert all(p.closed for p in pages)  # layout liberado página a página
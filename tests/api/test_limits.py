@@ -0,0 +1,35 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from ws_docflow.api.limits import BodySizeLimit
+
+app = FastAPI()
+app.add_middleware(BodySizeLimit, max_bytes=10)
+
+
+@app.post("/eco")
+async def eco(request: Request):
+    return {"tamanho": len(await request.body())}
+
+
+client = TestClient(app)
+
+
+def test_corpo_dentro_do_limite():
+    r = client.post("/eco", content=b"x" * 10)
+    assert r.json() == {"tamanho": 10}
+
+
+def test_content_length_acima_do_limite_413():
+    r = client.post("/eco", content=b"x" * 11)
+    assert r.status_code == 413
+    assert "limite" in r.json()["detail"]
+
+
+def test_corpo_chunked_interrompido_413():
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 4
+
+    r = client.post("/eco", content=chunks())  # sem Content-Length
+    assert r.status_code == 413
@@ -26,19 +26,22 @@ class FakeDoc:
 class FakeUC:
     """Substitui ExtractDataUseCase dentro do módulo da API."""
 
-    def __init__(self, extractor, parsers):
+    def __init__(self, extractor, parsers, **options):
         # podemos inspecionar/guardar se necessário
         self.extractor = extractor
         self.parsers = parsers
+        self.options = options
 
     def run(self, source: str | bytes):
         # Apenas valida se o "PDF" começa com %PDF (tolerando espaços antes),
-        # que é a mesma checagem feita no main._run_parse_from_bytes.
-        if isinstance(source, (bytes, bytearray)):
+        # que é a mesma checagem feita em routes._run_parse.
+        if isinstance(source, (bytes, bytearray, memoryview)):
             data = bytes(source)
+        elif hasattr(source, "read"):
+            # upload multipart: a rota repassa o próprio arquivo temporário
+            source.seek(0)
+            data = source.read()
         elif isinstance(source, str):
-            # quando cair no fallback via arquivo temporário, o main abre por caminho;
-            # aqui não vamos reler o arquivo; apenas devolvemos algo estático de sucesso.
             data = b"%PDF from path"
         else:
             raise TypeError("source inválido no FakeUC.run")
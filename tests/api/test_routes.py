@@ -36,3 +36,352 @@ def test_api_parse_b64_invalido():
         "/api/parse-b64", json={"filename": "x.pdf", "content_base64": "XXXX"}
     )
     assert r.status_code in (400, 415, 422, 500)
+
+
+def test_api_cache_stats():
+    r = client.get("/api/cache/stats")
+    assert r.status_code == 200
+    assert "enabled" in r.json()
+
+
+def test_api_parse_limite_excedido_413(monkeypatch):
+    from ws_docflow.core.errors import ExtractionLimitError
+
+    def fake_run(self, source):
+        raise ExtractionLimitError("Documento com 900 páginas excede o limite")
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    r = client.post(
+        "/api/parse", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    )
+    assert r.status_code == 413
+    assert "900 páginas" in r.json()["detail"]
+
+
+def test_api_parse_multi(monkeypatch):
+    def fake_run_many(self, source, splitter, workers=1, executor=None):
+        return [FakeDoc({"n": 1}), FakeDoc({"n": 2})]
+
+    monkeypatch.setattr(ExtractDataUseCase, "run_many", fake_run_many)
+    r = client.post(
+        "/api/parse-multi",
+        files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")},
+    )
+    assert r.status_code == 200
+    assert r.json() == {"documentos": [{"n": 1}, {"n": 2}], "total": 2}
+
+
+class CountingExtractor:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def extract(self, source):
+        self.calls += 1
+        return self.text
+
+    def iter_pages(self, source):
+        self.calls += 1
+        yield self.text
+
+
+def test_api_extrai_uma_vez_para_toda_a_cadeia_de_parsers(monkeypatch):
+    import ws_docflow.api.routes as routes
+
+    # nenhum parser casa: a cadeia inteira é percorrida sobre o mesmo texto
+    ex = CountingExtractor("Documento sem Origem/Destino")
+    monkeypatch.setattr(routes, "build_extractor", lambda *a, **k: ex)
+
+    r = client.post(
+        "/api/parse", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    )
+    assert r.status_code == 422
+    assert ex.calls == 1
+
+
+def test_api_stage_stats():
+    from ws_docflow.api import routes
+
+    routes.get_stage_metrics().observe("classify", 0.002)
+    r = client.get("/api/stats/stages")
+    assert r.status_code == 200
+    assert r.json()["classify"]["count"] >= 1
+
+
+def test_api_parse_fields(monkeypatch):
+    import ws_docflow.api.routes as routes
+
+    texto = (
+        "No. da Declaração : 25/0399908-0\nOrigem\n"
+        "Unidade Local : 1017700 - A\nRecinto Aduaneiro : 0301304 - B\n"
+        "Destino\nUnidade Local : 1010700 - C\nRecinto Aduaneiro : 0403201 - D\n"
+        "Tratamento na Origem/Totais\nTipo : Armazenamento\n"
+        "Valor Total do Trânsito em Dólar : 1,00\n"
+        "Valor Total do Trânsito na Moeda Nacional : 5,00\n"
+    )
+    monkeypatch.setattr(
+        routes, "build_extractor", lambda *a, **k: CountingExtractor(texto)
+    )
+
+    r = client.post(
+        "/api/parse?fields=declaracao.numero,destino.unidade_local",
+        files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")},
+    )
+    assert r.status_code == 200
+    assert r.json() == {
+        "declaracao": {"numero": "2503999080"},
+        "destino": {"unidade_local": {"codigo": "1010700", "descricao": "C"}},
+    }
+
+    r = client.post(
+        "/api/parse?fields=totais",
+        files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")},
+    )
+    assert r.status_code == 400
+    assert "totais" in r.json()["detail"]
+
+
+def test_api_interning_stats():
+    r = client.get("/api/stats/interning")
+    assert r.status_code == 200
+    assert set(r.json()) == {"unidades_locais", "recintos", "participantes"}
+
+
+def test_api_parse_pool_lotado_503(monkeypatch):
+    from ws_docflow.api import routes
+    from ws_docflow.core.errors import OverloadedError
+
+    class FullPool:
+        kind = "thread"
+
+        async def run(self, fn, *args, **kwargs):
+            raise OverloadedError("Servidor ocupado", retry_after=3)
+
+    monkeypatch.setattr(routes, "get_parse_pool", lambda: FullPool())
+    r = client.post(
+        "/api/parse", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "3"
+    assert "ocupado" in r.json()["detail"]
+
+
+def test_api_disjuntor_de_memoria_503(monkeypatch):
+    from ws_docflow.infra.resources import ResourceLimits
+
+    def fake_run(self, source):
+        # RSS do processo (qualquer um passa de 1 MB) acima do teto
+        ResourceLimits.from_mb(max_rss_mb=1, retry_after=4).check_rss(1)
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    r = client.post(
+        "/api/parse", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "4"
+    assert "Memória do processo" in r.json()["detail"]
+
+
+def test_api_pool_stats():
+    r = client.get("/api/stats/pool")
+    assert r.status_code == 200
+    body = r.json()
+    assert {"executor", "workers", "in_flight", "queued", "rejected"} <= set(body)
+
+
+def test_metrics_prometheus(monkeypatch, tmp_path):
+    def fake_run(self, source):
+        return FakeDoc({"ok": True})
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    f = tmp_path / "a.pdf"
+    f.write_bytes(b"%PDF-1.4\n")
+    with f.open("rb") as fh:
+        client.post("/api/parse", files={"file": ("a.pdf", fh, "application/pdf")})
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'ws_docflow_stage_seconds_count{stage="serialize"}' in r.text
+    assert "ws_docflow_input_bytes_count" in r.text
+    assert 'ws_docflow_parse_pool_tasks{state="queued"}' in r.text
+    assert "ws_docflow_extraction_cache_hit_ratio" in r.text
+
+
+def _ndjson(r):
+    import json
+
+    return sorted((json.loads(line) for line in r.text.splitlines()), key=str)
+
+
+def test_api_parse_batch_erro_por_documento(monkeypatch):
+    def fake_run(self, source):
+        data = source.read() if hasattr(source, "read") else bytes(source)
+        if b"quebrado" in data:
+            raise ValueError("layout desconhecido")
+        return FakeDoc({"n": data[-1:].decode()})
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    files = [
+        ("files", ("a.pdf", b"%PDF-1.4\n1", "application/pdf")),
+        ("files", ("b.pdf", b"%PDF quebrado", "application/pdf")),
+        ("files", ("c.txt", b"texto", "text/plain")),
+        ("files", ("d.pdf", b"%PDF-1.4\n4", "application/pdf")),
+    ]
+    r = client.post("/api/parse-batch", files=files)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = {line["indice"]: line for line in _ndjson(r)}
+    assert lines[0] == {"indice": 0, "arquivo": "a.pdf", "documento": {"n": "1"}}
+    assert lines[1]["status"] == 422 and "layout" in lines[1]["erro"]
+    assert lines[2]["status"] == 415
+    assert lines[3]["documento"] == {"n": "4"}
+
+
+def test_api_parse_batch_b64_gzip(monkeypatch):
+    import base64
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", lambda self, s: FakeDoc({"ok": 1}))
+    payload = [
+        {"filename": "a.pdf", "content_base64": base64.b64encode(b"%PDF-1.4").decode()},
+        {"content_base64": "XXX"},
+    ]
+    r = client.post("/api/parse-batch-b64?gzip=true", json=payload)
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"  # httpx descomprime o corpo
+    lines = {line["indice"]: line for line in _ndjson(r)}
+    assert lines[0]["documento"] == {"ok": 1}
+    assert lines[1]["arquivo"] is None
+    assert lines[1]["status"] == 422
+    assert "content_base64" in lines[1]["erro"]
+
+
+def test_api_parse_batch_executor_de_processos(monkeypatch):
+    from ws_docflow.api import routes
+    from ws_docflow.infra.executor import ParsePool
+
+    def fake_run(self, source):
+        return FakeDoc({"tipo": type(source).__name__, "tamanho": len(source)})
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    pool = ParsePool(workers=1, max_queue=0, kind="process")
+    monkeypatch.setattr(routes, "get_parse_pool", lambda: pool)
+    # acima do limite em memória do upload: vira arquivo em disco (spool)
+    big = b"%PDF-1.4\n" + b"0" * (2 * 1024 * 1024)
+    files = [
+        ("files", ("a.pdf", big, "application/pdf")),
+        ("files", ("b.pdf", b"%PDF-1.4\n", "application/pdf")),
+    ]
+    try:
+        r = client.post("/api/parse-batch", files=files)
+    finally:
+        pool.shutdown()
+    assert r.status_code == 200
+    lines = {line["indice"]: line for line in _ndjson(r)}
+    assert lines[0]["documento"] == {"tipo": "bytes", "tamanho": len(big)}
+    assert lines[1]["documento"] == {"tipo": "bytes", "tamanho": 9}
+
+
+def test_api_parse_batch_pool_lotado_503(monkeypatch):
+    from ws_docflow.api import routes
+    from ws_docflow.infra.executor import ParsePool
+
+    class FullPool(ParsePool):
+        saturated = True
+
+    monkeypatch.setattr(routes, "get_parse_pool", lambda: FullPool(retry_after=5))
+    files = [("files", ("a.pdf", b"%PDF-1.4\n", "application/pdf"))]
+    r = client.post("/api/parse-batch", files=files)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "5"
+
+
+def test_api_jobs_submit_poll_result(monkeypatch, tmp_path):
+    import time
+
+    from ws_docflow.api import routes
+    from ws_docflow.infra.jobs import JobRunner, JobStore
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", lambda self, s: FakeDoc({"ok": 1}))
+    runner = JobRunner(JobStore(tmp_path / "jobs.db"), routes._parse_with_uc, poll=0.05)
+    monkeypatch.setattr(routes, "get_job_runner", lambda: runner)
+    runner.start()
+    try:
+        r = client.post(
+            "/api/jobs", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+        )
+        assert r.status_code == 202
+        job = r.json()
+        assert job["estado"] == "pendente"
+        assert "concluido_em" not in job
+        assert r.headers["Location"] == f"/api/jobs/{job['id']}"
+
+        deadline = time.monotonic() + 5
+        while job["estado"] != "concluido" and time.monotonic() < deadline:
+            time.sleep(0.01)
+            job = client.get(f"/api/jobs/{job['id']}").json()
+        assert job["documento"] == {"ok": 1}
+
+        r = client.get(f"/api/jobs/{job['id']}/result")
+        assert r.status_code == 200
+        assert r.json() == {"ok": 1}
+        assert client.get("/api/jobs/naoexiste").status_code == 404
+    finally:
+        runner.stop(timeout=5)
+
+
+def test_api_stats_jobs_sem_fila_iniciada_nao_sobe_a_fila(monkeypatch):
+    from functools import lru_cache
+
+    from ws_docflow.api import routes
+
+    @lru_cache(maxsize=1)
+    def nao_inicia():
+        raise AssertionError("a fila de jobs não deveria subir")
+
+    monkeypatch.setattr(routes, "get_job_runner", nao_inicia)
+    r = client.get("/api/stats/jobs")
+    assert r.status_code == 200
+    assert set(r.json().values()) == {0}
+    assert nao_inicia.cache_info().currsize == 0
+
+
+def test_api_jobs_resultado_pendente_409(monkeypatch, tmp_path):
+    from ws_docflow.api import routes
+    from ws_docflow.infra.jobs import JobRunner, JobStore
+
+    # sem start(): o job fica na fila
+    runner = JobRunner(JobStore(tmp_path / "jobs.db"), routes._parse_with_uc)
+    monkeypatch.setattr(routes, "get_job_runner", lambda: runner)
+    r = client.post(
+        "/api/jobs", files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    )
+    r = client.get(f"/api/jobs/{r.json()['id']}/result")
+    assert r.status_code == 409
+    assert "pendente" in r.json()["detail"]
+
+    r = client.post("/api/jobs", files={"file": ("a.pdf", b"oi", "application/pdf")})
+    assert r.status_code == 415
+
+
+def test_api_pdf_acima_do_limite_413(monkeypatch):
+    import base64
+
+    from ws_docflow.api import routes
+
+    def fake_run(self, source):
+        raise AssertionError("não deveria chegar ao parse")
+
+    monkeypatch.setattr(ExtractDataUseCase, "run", fake_run)
+    monkeypatch.setattr(routes, "_max_pdf_bytes", lambda: 8)
+    pdf = b"%PDF-1.4\n" + b"x" * 100
+
+    r = client.post("/api/parse", files={"file": ("a.pdf", pdf, "application/pdf")})
+    assert r.status_code == 413
+    r = client.post(
+        "/api/parse-b64", json={"content_base64": base64.b64encode(pdf).decode()}
+    )
+    assert r.status_code == 413
+    assert "limite" in r.json()["detail"]
+    r = client.post("/api/jobs", files={"file": ("a.pdf", pdf, "application/pdf")})
+    assert r.status_code == 413
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+
+from ws_docflow.core.domain.models import set_strict_models, strict_models
+
+
+@pytest.fixture(autouse=True)
+def _modo_dos_modelos_restaurado():
+    """Teste que muda o modo dos modelos não vaza a mudança para os outros."""
+    previous = strict_models()
+    yield
+    set_strict_models(previous)
+
+
+@pytest.fixture(params=[False, True], ids=["padrao", "estrito"])
+def modo_dos_modelos(request):
+    """O teste roda nos dois modos: padrão (coerção) e estrito (sem coerção)."""
+    set_strict_models(request.param)
+    return request.param
@@ -43,3 +43,60 @@ def test_cli_parse_invalido(monkeypatch, tmp_path):
     result = runner.invoke(cli.app, ["parse", str(pdf)])
     # qualquer saída não-zero é suficiente; não dependa da mensagem
     assert result.exit_code != 0
+
+
+def test_cli_parse_compacto_e_pretty(monkeypatch, tmp_path):
+    pdf = tmp_path / "ok.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+    monkeypatch.setattr(
+        ExtractDataUseCase, "run", lambda self, source: FakeDoc({"a": {"b": 1}})
+    )
+
+    compacto = runner.invoke(cli.app, ["parse", str(pdf)])
+    pretty = runner.invoke(cli.app, ["parse", str(pdf), "--pretty"])
+
+    assert compacto.exit_code == 0 and pretty.exit_code == 0
+    assert compacto.stdout.strip() == '{"a":{"b":1}}'
+    assert pretty.stdout.startswith('{\n  "a": {')
+
+
+def test_cli_parse_fields_invalido(tmp_path):
+    pdf = tmp_path / "ok.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+
+    result = runner.invoke(cli.app, ["parse", str(pdf), "--fields", "totais"])
+    assert result.exit_code == 2
+
+
+def test_cli_parse_batch_ndjson_e_resumo(monkeypatch, tmp_path):
+    from ws_docflow.core.domain.records import to_record
+    from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+
+    (tmp_path / "a.pdf").write_bytes(b"%PDF-1.4\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.pdf").write_bytes(b"%PDF-1.4\n")
+    doc = BrDtaParser().parse(
+        "Nº da Declaração: 240125002-0\nTipo: DTA - ENTRADA COMUM\n"
+        "Origem\nUnidade Local: 1017700 - A\nRecinto Aduaneiro: 0301304 - B\n"
+        "Destino\nUnidade Local: 1010700 - C\nRecinto Aduaneiro: 0403201 - D\n"
+    )
+
+    def fake_run_many(
+        self, source, splitter, workers=1, *, records=False, executor=None
+    ):
+        assert records
+        if source.endswith("b.pdf"):
+            raise ValueError("quebrado")
+        return [to_record(doc), to_record(doc)]
+
+    monkeypatch.setattr(ExtractDataUseCase, "run_many", fake_run_many)
+
+    result = runner.invoke(cli.app, ["parse-batch", str(tmp_path), "-q"])
+    lines = [json.loads(ln) for ln in result.stdout.splitlines()]
+    assert result.exit_code == 1  # um PDF falhou, o lote seguiu
+    assert [ln.get("erro") for ln in lines] == [None, None, "quebrado"]
+    assert lines[0]["documento"]["declaracao"]["numero"] == "2401250020"
+
+    result = runner.invoke(cli.app, ["parse-batch", str(tmp_path), "-q", "--summary"])
+    out = json.loads(result.stdout)
+    assert out["documentos"] == 2 and out["erros"] == 1
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import ws_docflow.infra.parsers.br_dta_extrato_parser as extrato_mod
+import ws_docflow.infra.parsers.br_dta_parser as classico_mod
+from ws_docflow.core.domain.fields import parse_fields
+from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.serialization import documento_json
+
+EXTRATO = """
+Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte : RODOVIARIA
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+CNPJ/CPF do Beneficiário : 08.325.039/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+Situação Atual
+CONCESSAO em 29/08/2025
+"""
+
+CLASSICO = """
+Nº da Declaração: 240125002-0
+Tipo: DTA - ENTRADA COMUM
+Situação Atual
+CONCESSAO em 18/03/2024
+Origem
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local: 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro: 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+Tratamento na Origem Totais
+Tipo: Armazenamento
+Americano: 57.024,00
+Real: 308.585,37
+Cargas
+"""
+
+CAMPOS = parse_fields("declaracao.numero,situacao_atual,destino")
+
+
+class _Proibido:
+    def search(self, text):
+        raise AssertionError("seção não pedida foi calculada")
+
+
+class DummyExtractor:
+    def __init__(self, text: str) -> None:
+        self._text = text
+
+    def extract(self, source) -> str:
+        return self._text
+
+
+@pytest.mark.parametrize(
+    "mod,parser,text",
+    [
+        (extrato_mod, BrDtaExtratoParser(), EXTRATO),
+        (classico_mod, BrDtaParser(), CLASSICO),
+    ],
+)
+def test_secoes_nao_pedidas_nao_sao_calculadas(monkeypatch, mod, parser, text):
+    monkeypatch.setattr(mod, "_TOTAIS", _Proibido())
+    monkeypatch.setattr(mod, "_participante", lambda raw: pytest.fail(raw))
+    if mod is extrato_mod:
+        monkeypatch.setattr(mod, "_dt_brs_to_iso", lambda *a: pytest.fail("data"))
+
+    doc = parser.parse(text, fields=CAMPOS)
+
+    assert doc.declaracao.numero
+    assert doc.situacao_atual.startswith("CONCESSAO")
+    assert doc.totais_origem is None and doc.beneficiario is None
+    assert doc.transporte is None and doc.situacao is None
+
+
+def test_saida_so_com_os_campos_pedidos():
+    uc = ExtractDataUseCase(
+        DummyExtractor(EXTRATO),
+        [BrDtaExtratoParser(), BrDtaParser()],
+        fields=CAMPOS,
+    )
+    out = json.loads(documento_json(uc.run("x.pdf"), fields=CAMPOS))
+
+    assert out == {
+        "declaracao": {"numero": "2503999080"},
+        "situacao_atual": "CONCESSAO em 29/08/2025",
+        "destino": {
+            "unidade_local": {"codigo": "1010700", "descricao": "DRF NOVO HAMBURGO"},
+            "recinto_aduaneiro": {
+                "codigo": "0403201",
+                "descricao": "EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS",
+            },
+        },
+    }
+
+
+def test_sem_fields_documento_completo():
+    doc = BrDtaExtratoParser().parse(EXTRATO)
+    assert doc.totais_origem.tipo == "ARMAZENAMENTO"
+    assert doc.beneficiario and doc.transporte.via == "RODOVIARIA"
+    assert doc.situacao.registrada_por_cpf == "778.857.910-68"
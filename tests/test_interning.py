@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import (
+    BrDtaExtratoParser,
+    _split_code_desc,
+)
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.parsers.interning import (
+    DEFAULT_MAX_ENTRIES,
+    UNIDADES_LOCAIS,
+    intern_stats,
+    set_intern_limit,
+)
+
+EXTRATO = """
+No. da Declaração : {numero}
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+CNPJ/CPF do Beneficiário : 08.325.039/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA
+"""
+
+CLASSICO = """
+Nº da Declaração: 240125002-0
+Origem
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local: 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro: 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+"""
+
+
+@pytest.fixture(autouse=True)
+def _tabelas_limpas():
+    set_intern_limit(DEFAULT_MAX_ENTRIES)
+    yield
+    set_intern_limit(DEFAULT_MAX_ENTRIES)
+
+
+def test_mesma_instancia_entre_documentos_e_parsers():
+    parser = BrDtaExtratoParser()
+    a = parser.parse(EXTRATO.format(numero="25/0399908-0"))
+    b = parser.parse(EXTRATO.format(numero="25/0399909-9"))
+    c = BrDtaParser().parse(CLASSICO)
+
+    assert a.declaracao.numero != b.declaracao.numero
+    assert a.origem.unidade_local is b.origem.unidade_local
+    assert a.destino.recinto_aduaneiro is b.destino.recinto_aduaneiro
+    assert a.beneficiario is b.beneficiario
+    # mesmo texto bruto no layout clássico (só o separador difere)
+    assert c.origem.unidade_local is a.origem.unidade_local
+
+    stats = intern_stats()
+    assert stats["unidades_locais"] == {"entries": 2, "hits": 4, "misses": 2}
+    assert stats["participantes"]["hits"] == 1
+
+
+def test_instancias_compartilhadas_sao_imutaveis():
+    doc = BrDtaExtratoParser().parse(EXTRATO.format(numero="25/0399908-0"))
+    with pytest.raises(ValidationError):
+        doc.origem.unidade_local.descricao = "OUTRA"
+
+
+def test_limite_zero_desliga_o_compartilhamento():
+    set_intern_limit(0)
+    parser = BrDtaExtratoParser()
+    a = parser.parse(EXTRATO.format(numero="25/0399908-0"))
+    b = parser.parse(EXTRATO.format(numero="25/0399908-0"))
+
+    assert a.origem.unidade_local is not b.origem.unidade_local
+    assert a.model_dump() == b.model_dump()
+    assert intern_stats()["unidades_locais"]["entries"] == 0
+
+
+def test_formato_invalido_nao_e_guardado():
+    with pytest.raises(ValueError):
+        UNIDADES_LOCAIS.get("12 - CURTO", _split_code_desc)
+    assert intern_stats()["unidades_locais"]["entries"] == 0
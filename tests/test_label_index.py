@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.label_index import LabelIndex, label_key
+
+TEXTO = """
+Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Esta declaração possui dossiê(s) vinculado(s):  20250029718711-2
+20250029718712-0
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Cargas
+CNPJ/CPF do Beneficiário : 00.000.000/0000-00
+"""
+
+
+def test_label_key_ignora_acentos_caixa_e_espacos():
+    assert label_key("Nº da Declaração") == label_key("no  da DECLARACAO")
+    assert label_key("No. da Declaração") != label_key("Nº da Declaração")
+
+
+def test_index_primeira_ocorrencia_e_offset():
+    idx = LabelIndex(TEXTO)
+
+    assert idx.get("no. da declaracao") == "25/0399908-0"
+    assert idx.get("Tipo") == "DTA - ENTRADA COMUM"  # não o dos totais
+    entry = idx.entry("Tipo")
+    assert TEXTO[entry.offset :].startswith("Tipo : DTA")
+
+
+def test_index_horario_nao_separa_rotulo():
+    idx = LabelIndex(TEXTO)
+    line = idx.line("Declaração registrada em")
+
+    assert line.startswith("Declaração registrada em 29/08/2025 às 16:37:40")
+    assert idx.get("Declaração registrada em 29/08/2025 às 16:37:40 hs, pelo CPF") == (
+        "778.857.910-68"
+    )
+
+
+def test_index_para_na_secao_cargas():
+    idx = LabelIndex(TEXTO)
+    assert idx.get("CNPJ/CPF do Beneficiário") == ""
+    assert LabelIndex(TEXTO, stop_head=None).get("CNPJ/CPF do Beneficiário")
+
+
+def test_dossies_com_continuacao_em_outra_linha():
+    _transp, sit = BrDtaExtratoParser()._parse_via_situacao(TEXTO)
+    assert sit["dossies_vinculados"] == ["20250029718711-2", "20250029718712-0"]
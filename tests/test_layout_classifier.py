@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import pytest
+
+from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.infra.metrics import StageMetrics
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.parsers.classifier import (
+    LAYOUT_CLASSICO,
+    LAYOUT_EXTRATO,
+    LayoutClassifier,
+)
+from ws_docflow.infra.parsers.normalize import NormalizedText
+
+EXTRATO = """
+Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+""".strip()
+
+CLASSICO = """
+Nº da Declaração: 240125002-0
+Tipo: DTA - ENTRADA COMUM
+Origem
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0923201 - TRANSCONTINENTAL LOGÍSTICA_S.A
+Tratamento na Origem Totais
+Tipo: Armazenamento
+""".strip()
+
+
+class DummyExtractor:
+    def __init__(self, text: str) -> None:
+        self._text = text
+
+    def extract(self, source):
+        return self._text
+
+
+class SpyParser:
+    def __init__(self, layout, fail=False):
+        self.layout = layout
+        self.fail = fail
+        self.calls = 0
+        self.texts = []
+
+    def parse(self, text):
+        self.calls += 1
+        self.texts.append(text)
+        if self.fail:
+            raise ValueError(f"{self.layout} não casou")
+        return self.layout
+
+
+@pytest.mark.parametrize(
+    "text, layout", [(EXTRATO, LAYOUT_EXTRATO), (CLASSICO, LAYOUT_CLASSICO)]
+)
+def test_classifier_reconhece_layout(text, layout):
+    guess = LayoutClassifier().classify(text)
+    assert guess.layout == layout
+    assert guess.confidence == pytest.approx(1.0)
+
+
+def test_classifier_sem_ancoras():
+    assert LayoutClassifier().classify("texto qualquer") == (None, 0.0)
+
+
+def test_classifier_confianca_baixa_com_ancoras_misturadas():
+    misturado = "Dados Gerais\nNº da Declaração: 1\nUnidade Local: X"
+    guess = LayoutClassifier().classify(misturado)
+    assert guess.confidence < 0.5
+
+
+def test_use_case_despacha_so_para_o_parser_do_layout():
+    extrato, classico = SpyParser(LAYOUT_EXTRATO), SpyParser(LAYOUT_CLASSICO)
+    uc = ExtractDataUseCase(
+        DummyExtractor(CLASSICO), [extrato, classico], classifier=LayoutClassifier()
+    )
+
+    assert uc.run("x.pdf") == LAYOUT_CLASSICO
+    assert (extrato.calls, classico.calls) == (0, 1)
+
+
+def test_use_case_confianca_alta_nao_cai_para_a_cadeia():
+    extrato = SpyParser(LAYOUT_EXTRATO, fail=True)
+    classico = SpyParser(LAYOUT_CLASSICO)
+    uc = ExtractDataUseCase(
+        DummyExtractor(EXTRATO), [extrato, classico], classifier=LayoutClassifier()
+    )
+
+    with pytest.raises(ValueError, match="extrato"):
+        uc.run("x.pdf")
+    assert classico.calls == 0
+
+
+def test_use_case_confianca_baixa_usa_fallback():
+    extrato = SpyParser(LAYOUT_EXTRATO, fail=True)
+    classico = SpyParser(LAYOUT_CLASSICO)
+    uc = ExtractDataUseCase(
+        DummyExtractor("sem âncoras"),
+        [extrato, classico],
+        classifier=LayoutClassifier(),
+    )
+
+    assert uc.run("x.pdf") == LAYOUT_CLASSICO
+    assert (extrato.calls, classico.calls) == (1, 1)
+
+
+def test_use_case_reporta_tempo_por_etapa():
+    metrics = StageMetrics()
+    uc = ExtractDataUseCase(
+        DummyExtractor(CLASSICO),
+        [BrDtaExtratoParser(), BrDtaParser()],
+        classifier=LayoutClassifier(),
+        metrics=metrics,
+    )
+
+    doc = uc.run("x.pdf")
+
+    # despachado ao parser clássico (o de extrato nem é tentado)
+    assert doc.declaracao.numero == "2401250020"
+    stats = metrics.stats()
+    assert set(stats) == {"extract", "classify", "parse"}
+    assert all(s["count"] == 1 for s in stats.values())
+
+
+def test_use_case_conta_tentativas_e_fallbacks():
+    metrics = StageMetrics()
+    extrato = SpyParser(LAYOUT_EXTRATO, fail=True)
+    uc = ExtractDataUseCase(
+        DummyExtractor("sem âncoras"),
+        [extrato, SpyParser(LAYOUT_CLASSICO)],
+        classifier=LayoutClassifier(),
+        metrics=metrics,
+    )
+
+    assert uc.run("x.pdf") == LAYOUT_CLASSICO
+
+    # confiança baixa: cadeia inteira, o 1º falha e o 2º casa
+    text = metrics.prometheus()
+    assert 'ws_docflow_fallbacks_total{reason="classifier"} 1' in text
+    assert 'ws_docflow_fallbacks_total{reason="parser"} 1' in text
+    assert (
+        'ws_docflow_parser_attempts_total{parser="SpyParser",result="failed"} 1' in text
+    )
+    assert (
+        'ws_docflow_parser_attempts_total{parser="SpyParser",result="matched"} 1'
+        in text
+    )
+
+
+def test_use_case_normaliza_uma_vez_e_repassa_o_documento():
+    metrics = StageMetrics()
+    extrato = SpyParser(LAYOUT_EXTRATO, fail=True)
+    classico = SpyParser(LAYOUT_CLASSICO)
+    uc = ExtractDataUseCase(
+        DummyExtractor("sem âncoras"),
+        [extrato, classico],
+        classifier=LayoutClassifier(),
+        metrics=metrics,
+        normalizer=NormalizedText,
+    )
+
+    assert uc.run("x.pdf") == LAYOUT_CLASSICO
+
+    # a cadeia inteira recebe o mesmo documento normalizado
+    (doc,) = extrato.texts
+    assert isinstance(doc, NormalizedText)
+    assert classico.texts == [doc]
+    assert metrics.stats()["normalize"]["count"] == 1
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 import pytest
 from pydantic import ValidationError
 from ws_docflow.core.domain.models import DeclaracaoInfo, Situacao, Transporte
@@ -137,3 +139,107 @@ def test_transporte_situacao_opcionais():
     )
     assert doc2.transporte.via == "RODOVIARIA"
     assert doc2.situacao.veiculos_informados is False
+
+
+TECON = "0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON RIO GRANDE-RIO GRANDE/RS"
+
+EXTRATO = f"""
+Dados Gerais
+
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+
+Via de Transporte/Situação
+
+Via de Transporte : RODOVIARIA
+Declaração solicitada em 29/08/2025 às 16:30:23 hs,  pelo CPF : 778.857.910-68
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Esta declaração ainda não tem veículo(s) informado(s)
+Esta declaração possui dossiê(s) vinculado(s):  20250029718711-2
+
+Origem
+
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : {TECON}
+
+Destino
+
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+
+Beneficiário/Transportador
+
+CNPJ/CPF do Beneficiário : 08.325.039/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA
+CNPJ/CPF do Transportador : 13.233.554/0001-80
+Nome do Transportador: MULTI EXPRESS BRASIL TRANSPORTES DE CARGAS LTDA
+
+Tratamento na Origem/Totais
+
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+""".strip()
+
+
+def test_from_parsed_estrito_recusa_tipo_solto():
+    from ws_docflow.core.domain.models import set_strict_models
+
+    data = _documento_minimo()
+    data["totais_origem"] = {"tipo": "OUTRO", "valor_total_usd": "57024.00"}
+
+    doc = DocumentoDados.from_parsed(data)  # modo padrão: coerção do pydantic
+    assert doc.totais_origem.valor_total_usd == Decimal("57024.00")
+
+    set_strict_models(True)
+    with pytest.raises(ValidationError):
+        DocumentoDados.from_parsed(data)
+
+
+@pytest.mark.parametrize("estrito", [False, True])
+def test_from_parsed_valida_uma_vez_o_documento_todo(estrito):
+    from ws_docflow.core.domain.models import set_strict_models
+
+    set_strict_models(estrito)
+    data = _documento_minimo()
+    data["origem"]["unidade_local"]["codigo"] = "123"
+
+    with pytest.raises(ValidationError):
+        DocumentoDados.from_parsed(data)
+
+
+def test_from_parsed_default_da_declaracao_por_documento():
+    # "declaracao" fora da projeção: cada documento com a sua instância
+    data = _documento_minimo()
+    del data["declaracao"]
+    a = DocumentoDados.from_parsed(data)
+    b = DocumentoDados.from_parsed(data)
+
+    assert a.declaracao is not b.declaracao
+    assert "declaracao" not in a.model_fields_set
+
+
+def test_estrito_e_padrao_geram_o_mesmo_documento():
+    from ws_docflow.core.domain.models import set_strict_models
+    from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+
+    padrao = BrDtaExtratoParser().parse(EXTRATO)
+    set_strict_models(True)
+    estrito = BrDtaExtratoParser().parse(EXTRATO)
+
+    kw = dict(mode="json", exclude_none=True, exclude_unset=True)
+    assert padrao.model_dump(**kw) == estrito.model_dump(**kw)
+    assert padrao.situacao.model_fields_set == estrito.situacao.model_fields_set
+
+
+def _documento_minimo():
+    local = {
+        "unidade_local": {"codigo": "1017700", "descricao": "PORTO"},
+        "recinto_aduaneiro": {"codigo": "0301304", "descricao": "TECON"},
+    }
+    return {
+        "declaracao": {"numero": "2503999080", "tipo": "DTA - ENTRADA COMUM"},
+        "situacao_atual": "",
+        "origem": dict(local, unidade_local=dict(local["unidade_local"])),
+        "destino": local,
+    }
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.parsers.label_index import label_index, label_key
+from ws_docflow.infra.parsers.normalize import NormalizedText, fold, normalized
+
+EXTRATO = """Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte : RODOVIÁRIA
+Declaração registrada em 29/08/2025 às 16:37:40 hs, pelo CPF : 778.857.910-68
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZÉNS  LTDA
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+Situação Atual
+CONCLUÍDA javascript:history.back();
+"""
+
+
+def _sujo(text: str) -> str:
+    """Mesmo documento com CRLF, tabs, NBSP, espaços nas pontas e caixa alta."""
+    lines = []
+    for i, line in enumerate(text.splitlines()):
+        label, sep, value = line.partition(" : ")
+        if sep:
+            line = f"{label.upper()}\t:\xa0 {value}"
+        lines.append(("  " if i % 2 else "") + line + " \t")
+    return "\r\n".join(lines)
+
+
+def test_fold_preserva_tamanho():
+    for text in ("Nº DA DECLARAÇÃO", "N° da declaração\t:", "Ωİ ß", ""):
+        assert len(fold(text)) == len(text)
+    assert fold("Nº DA DECLARAÇÃO\t:") == "no da declaracao :"
+    assert fold("N° da\xa0Declaração") == "no da declaracao"
+    assert label_key("N° da Declaração") == label_key("Nº da Declaração")
+
+
+def test_texto_canonico():
+    doc = NormalizedText(
+        "  Situação   Atual \r\n\tX javascript:history.back();\r\nY\rZ "
+    )
+    assert doc.text == "situacao atual\nx \ny\nz"
+
+
+def test_verbatim_devolve_o_original():
+    original = "Título\r\n  Recinto   ADUANEIRO :\t0403201 - EADI  LTDA  \r\nFim"
+    doc = NormalizedText(original)
+
+    start = doc.text.index("0403201")
+    end = doc.text.index("\nfim")
+    assert doc.verbatim(start, end) == "0403201 - EADI  LTDA"
+    assert original[doc.to_original(start) :].startswith("0403201")
+    # CRLF vira "\n"; espaços internos (pontas das linhas do meio) ficam
+    assert doc.verbatim(0, len(doc)) == (
+        "Título\n  Recinto   ADUANEIRO :\t0403201 - EADI  LTDA  \nFim"
+    )
+
+
+def test_normalizacao_repassada_sem_cache_global():
+    text = EXTRATO + "\n"
+    doc = normalized(text)
+    # documento já normalizado passa adiante; texto cru é normalizado de novo
+    assert normalized(doc) is doc
+    assert normalized(text) is not doc
+    # o índice vive no documento: os parsers da cadeia o montam uma vez só
+    assert label_index(doc) is label_index(doc)
+    assert label_index(text) is not label_index(doc)
+
+
+@pytest.mark.parametrize("sujo", [False, True])
+def test_extrato_valores_verbatim(sujo):
+    doc = BrDtaExtratoParser().parse(_sujo(EXTRATO) if sujo else EXTRATO)
+
+    assert doc.declaracao.numero == "2503999080"
+    assert doc.declaracao.tipo == "DTA - ENTRADA COMUM"
+    assert doc.transporte.via == "RODOVIÁRIA"
+    assert doc.situacao.registrada_por_cpf == "778.857.910-68"
+    assert doc.destino.recinto_aduaneiro.descricao == "EADI-MULTI ARMAZÉNS  LTDA"
+    assert str(doc.totais_origem.valor_total_brl) == "308585.37"
+    assert doc.situacao_atual == "CONCLUÍDA"
+
+
+def test_classico_com_crlf_e_caixa_alta():
+    text = (
+        "Nº DA DECLARAÇÃO: 24/0123456-7\r\n"
+        "ORIGEM\r\n"
+        "Unidade Local: 1017700 - PORTO DE RIO GRANDE\r\n"
+        "RECINTO ADUANEIRO:\t0301304 - TECON\r\n"
+        "Destino   \r\n"
+        "UNIDADE LOCAL: 1010700 - DRF NOVO HAMBURGO\r\n"
+        "Recinto Aduaneiro: 0403201 - EADI\r\n"
+        "SITUAÇÃO ATUAL\r\n"
+        "CONCESSÃO em 18/03/2024 javascript:history.back();\r\n"
+        "  CARGAS\r\n"
+    )
+
+    doc = BrDtaParser().parse(text)
+    assert doc.declaracao.numero == "2401234567"
+    assert doc.origem.recinto_aduaneiro.descricao == "TECON"
+    assert doc.destino.unidade_local.descricao == "DRF NOVO HAMBURGO"
+    assert doc.situacao_atual == "CONCESSÃO em 18/03/2024"
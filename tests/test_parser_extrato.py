@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import pytest
+
 from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
 
 
+@pytest.mark.usefixtures("modo_dos_modelos")
 def test_extrato_dados_gerais_via_transporte_situacao():
     text = """
 Dados Gerais
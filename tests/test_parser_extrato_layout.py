@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from ws_docflow.core.ports import PositionedWord
+from ws_docflow.core.use_cases.extract_layout_data import ExtractLayoutDataUseCase
+from ws_docflow.infra.parsers.br_dta_extrato_layout_parser import (
+    BrDtaExtratoLayoutParser,
+)
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+
+# (x, texto) por linha: 6pt por caractere + 4pt entre palavras
+LINHAS = [
+    (40, "Dados Gerais"),
+    (40, "No. da Declaração : 25/0399908-0"),
+    (40, "Tipo : DTA - ENTRADA COMUM"),
+    (40, "Via de Transporte/Situação"),
+    (40, "Via de Transporte : RODOVIARIA"),
+    (
+        40,
+        "Declaração registrada em 29/08/2025 às 16:37:40 hs, pelo CPF : 778.857.910-68",
+    ),
+    (40, "Origem"),
+    (40, "Unidade Local : 1017700 - PORTO DE RIO GRANDE"),
+    (40, "Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON"),
+    # valor quebrado: continuação alinhada à coluna do valor acima (x=154)
+    (154, "RIO GRANDE-RIO GRANDE/RS"),
+    (40, "Destino"),
+    (40, "Unidade Local : 1010700 - DRF NOVO HAMBURGO"),
+    (40, "Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS"),
+    (40, "Beneficiário/Transportador"),
+    (40, "CNPJ/CPF do Beneficiário : 08.325.039/0001-90"),
+    (40, "Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA"),
+    (40, "Tratamento na Origem/Totais"),
+    (40, "Tipo : Armazenamento"),
+    (40, "Valor Total do Trânsito em Dólar : 57.024,00"),
+    (40, "Valor Total do Trânsito na Moeda Nacional : 308.585,37"),
+    (40, "Cargas"),
+    (40, "Conhecimento : MSCU0001"),
+]
+
+
+def _words(linhas, page=0):
+    """Palavras com caixas aproximadas, uma linha a cada 14pt."""
+    words = []
+    for n, (x, text) in enumerate(linhas):
+        top = 30 + 14 * n
+        for token in text.split():
+            words.append(
+                PositionedWord(token, x, x + 6 * len(token), top, top + 10, page)
+            )
+            x += 6 * len(token) + 4
+    return words
+
+
+def _dump(doc):
+    return doc.model_dump(mode="json", exclude_none=True, exclude_unset=True)
+
+
+def test_layout_parser_pares_por_geometria():
+    doc = BrDtaExtratoLayoutParser().parse_words(_words(LINHAS))
+
+    assert doc.declaracao.numero == "2503999080"
+    assert doc.declaracao.tipo == "DTA - ENTRADA COMUM"  # não o "Tipo" dos totais
+    assert doc.origem.unidade_local.codigo == "1017700"
+    # linha quebrada é continuação do valor, não é perdida
+    assert doc.origem.recinto_aduaneiro.descricao == (
+        "INST.PORT.MAR.ALF.USO PUBLICO-TECON RIO GRANDE-RIO GRANDE/RS"
+    )
+    assert doc.destino.recinto_aduaneiro.codigo == "0403201"
+    assert doc.beneficiario.documento == "08.325.039/0001-90"
+    assert doc.transporte.via == "RODOVIARIA"
+    assert doc.situacao.registrada_por_cpf == "778.857.910-68"
+    assert doc.totais_origem.tipo == "ARMAZENAMENTO"
+    assert str(doc.totais_origem.valor_total_brl) == "308585.37"
+
+
+def test_layout_parser_concorda_com_parser_de_texto():
+    linhas = [ln for i, ln in enumerate(LINHAS) if i != 9]
+    linhas[8] = (40, LINHAS[8][1] + " RIO GRANDE-RIO GRANDE/RS")
+    texto = "\n".join(t for _x, t in linhas)
+
+    esperado = _dump(BrDtaExtratoParser().parse(texto))
+    assert _dump(BrDtaExtratoLayoutParser().parse_words(_words(linhas))) == esperado
+
+
+def test_layout_parser_sem_origem_destino():
+    import pytest
+
+    with pytest.raises(ValueError, match="Origem/Destino"):
+        BrDtaExtratoLayoutParser().parse_words(_words(LINHAS[:6]))
+
+
+class FakeWordExtractor:
+    def __init__(self, pages):
+        self.pages = pages
+        self.read = 0
+
+    def extract_words(self, source):
+        return [w for page in self.iter_page_words(source) for w in page]
+
+    def iter_page_words(self, source):
+        for page in self.pages:
+            self.read += 1
+            yield page
+
+
+def test_layout_use_case_para_na_pagina_de_cargas():
+    pages = [
+        _words(LINHAS[:10], page=0),
+        _words(LINHAS[10:], page=1),
+        _words([(40, "Conhecimento : X")], page=2),
+        _words([(40, "Conhecimento : Y")], page=3),
+    ]
+    ex = FakeWordExtractor(pages)
+    uc = ExtractLayoutDataUseCase(ex, BrDtaExtratoLayoutParser(), early_stop=True)
+
+    assert uc.run(b"%PDF").destino.unidade_local.codigo == "1010700"
+    assert ex.read == 2
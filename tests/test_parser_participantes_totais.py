@@ -1,6 +1,9 @@
+import pytest
+
 from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
 
 
+@pytest.mark.usefixtures("modo_dos_modelos")
 def test_participantes_e_totais_com_declaracao_e_situacao():
     text = """
     Nº da Declaração: 240125002-0
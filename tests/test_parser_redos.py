@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+
+# orçamento por documento (s): folgado para CI lenta; as regex antigas
+# levavam segundos a minutos nestas entradas (ex.: 30 linhas em branco
+# após "Origem" → > 20 s)
+BUDGET = 1.0
+N = 20_000
+
+ADVERSARIAIS = {
+    "brancos_apos_origem": "Origem\n" + " \n" * N + "Unidade Local : 1 - X\n",
+    "brancos_apos_origem_classico": "Origem\n" + " \n" * N + "Unidade Local: 1 - X\n",
+    "brancos_entre_blocos": (
+        "Origem\n"
+        + "\n \n" * N
+        + "Unidade Local : 1017700 - A\nRecinto Aduaneiro : 0301304 - B\n"
+        + "\n \n" * N
+        + "Destino\n"
+    ),
+    "situacao_atual_sem_cargas": "Situação Atual\nx\n" + "\n" * N + "y",
+    "situacao_atual_espacos": "Situação Atual " + " \n  " * N + "z",
+    "muitas_origens": "Origem\n\n" * N,
+    "muitas_situacoes": "Situação " * N,
+    "totais_brancos": "Tratamento na Origem/Totais\n" + "\n \n" * N + "Tipo : X\n",
+    "totais_classico_brancos": (
+        "Tratamento na Origem Totais\n" + "\n \n" * N + "Tipo: X\n"
+    ),
+    "linha_gigante": "Unidade Local : " + "9" * (50 * N) + "\n",
+}
+
+EXTRATO = """Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+"""
+
+
+def _timed_parse(parser, text):
+    start = time.perf_counter()
+    try:
+        doc = parser.parse(text)
+    except ValueError:
+        doc = None
+    return doc, time.perf_counter() - start
+
+
+@pytest.mark.parametrize("parser", [BrDtaExtratoParser(), BrDtaParser()])
+@pytest.mark.parametrize("nome", sorted(ADVERSARIAIS))
+def test_entrada_adversarial_dentro_do_orcamento(parser, nome):
+    _doc, elapsed = _timed_parse(parser, ADVERSARIAIS[nome])
+    assert elapsed < BUDGET, f"{nome}: {elapsed:.2f}s"
+
+
+@pytest.mark.parametrize("parser", [BrDtaExtratoParser(), BrDtaParser()])
+def test_documento_enorme_dentro_do_orcamento(parser):
+    # ~2.000 páginas de cargas (100 mil linhas, ~6 MB) depois do cabeçalho
+    cargas = "".join(
+        f"Conhecimento {i} : MSCU{i:07d} Peso 1.234,56\n" for i in range(100_000)
+    )
+    text = EXTRATO + "Cargas\n" + cargas + "Situação Atual\nFINALIZADA"
+
+    doc, elapsed = _timed_parse(parser, text)
+    assert elapsed < BUDGET, f"{elapsed:.2f}s"
+    if isinstance(parser, BrDtaExtratoParser):
+        assert doc.totais_origem.valor_total_brl is not None
+
+
+def test_brancos_entre_linhas_do_bloco_continuam_aceitos():
+    text = EXTRATO.replace("\nUnidade Local", "\n\n  \nUnidade Local")
+    doc = BrDtaExtratoParser().parse(text)
+    assert doc.destino.unidade_local.codigo == "1010700"
+
+
+def test_situacao_atual_classico_vai_ate_cargas():
+    text = (
+        "Origem\nUnidade Local: 1017700 - A\nRecinto Aduaneiro: 0301304 - B\n"
+        "Destino\nUnidade Local: 1017700 - A\nRecinto Aduaneiro: 0301304 - B\n"
+        "Situação Atual\n\n\nCONCESSAO em 18/03/2024\nFinalizada   \n\n  Cargas\nX"
+    )
+
+    doc = BrDtaParser().parse(text)
+    assert doc.situacao_atual == "CONCESSAO em 18/03/2024\nFinalizada"
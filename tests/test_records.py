@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import pickle
+
+from ws_docflow.core.domain.records import (
+    UNSET,
+    DocumentoRecord,
+    from_record,
+    resumo,
+    to_record,
+)
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.serialization import documento_json, record_json
+
+EXTRATO = """
+Dados Gerais
+No. da Declaração : 25/0399908-0
+Tipo : DTA - ENTRADA COMUM
+Via de Transporte : RODOVIARIA
+Declaração registrada em 29/08/2025 às 16:37:40 hs,  pelo CPF : 778.857.910-68
+Esta declaração possui dossiê(s) vinculado(s):  20250029718711-2
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+CNPJ/CPF do Beneficiário : 08.325.039/0001-90
+Nome do Beneficiário: SS INDUSTRIA METALURGICA DE TELAS LTDA
+Tratamento na Origem/Totais
+Tipo : Armazenamento
+Valor Total do Trânsito em Dólar : 57.024,00
+Valor Total do Trânsito na Moeda Nacional : 308.585,37
+"""
+
+CLASSICO = """
+Nº da Declaração: 240125002-0
+Tipo: DTA - PASSAGEM
+Origem
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0301304 - INST.PORT.MAR.ALF.USO PUBLICO-TECON
+Destino
+Unidade Local: 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro: 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+"""
+
+DUMP = dict(mode="json", exclude_none=True, exclude_unset=True)
+
+
+def _fields_set(model):
+    """Campos preenchidos, recursivamente (o que o exclude_unset enxerga)."""
+    out = {}
+    for name in model.model_fields_set:
+        value = getattr(model, name)
+        out[name] = _fields_set(value) if hasattr(value, "model_fields_set") else 1
+    return out
+
+
+def test_ida_e_volta_sem_perdas():
+    for doc in (BrDtaExtratoParser().parse(EXTRATO), BrDtaParser().parse(CLASSICO)):
+        rec = to_record(doc)
+        back = from_record(rec)
+
+        assert isinstance(rec, DocumentoRecord)
+        assert back == doc
+        assert _fields_set(back) == _fields_set(doc)
+        assert back.model_dump(**DUMP) == doc.model_dump(**DUMP)
+
+
+def test_unset_preservado_e_listas_como_tuplas():
+    rec = to_record(BrDtaParser().parse(CLASSICO))
+    assert rec.situacao is UNSET and rec.transporte is UNSET
+
+    rec = to_record(BrDtaExtratoParser().parse(EXTRATO))
+    assert rec.situacao.dossies_vinculados == ("20250029718711-2",)
+    assert rec.situacao.veiculos_informados is UNSET
+    # entidades imutáveis entram por referência
+    assert rec.origem.unidade_local.codigo == "1017700"
+
+
+def test_pickle_mantem_o_unset():
+    rec = to_record(BrDtaParser().parse(CLASSICO))
+    back = pickle.loads(pickle.dumps(rec))
+    assert back == rec and back.situacao is UNSET
+
+
+def test_record_json_igual_ao_do_documento():
+    doc = BrDtaExtratoParser().parse(EXTRATO)
+    assert record_json(to_record(doc)) == documento_json(doc)
+
+
+def test_resumo_do_lote():
+    recs = [
+        to_record(BrDtaExtratoParser().parse(EXTRATO)),
+        to_record(BrDtaExtratoParser().parse(EXTRATO)),
+        to_record(BrDtaParser().parse(CLASSICO)),
+    ]
+    out = resumo(recs)
+
+    assert out["documentos"] == 3
+    assert out["por_tipo"] == {"DTA - ENTRADA COMUM": 2, "DTA - PASSAGEM": 1}
+    assert out["por_destino"] == {"1010700": 3}
+    assert out["valor_total_brl"] == "617170.74"
+    json.dumps(out)  # pronto para a saída
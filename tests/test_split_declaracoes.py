@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import ws_docflow.core.use_cases.extract_data as uc_mod
+from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
+from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
+from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.parsers.classifier import LayoutClassifier
+from ws_docflow.infra.parsers.normalize import NormalizedText
+from ws_docflow.infra.parsers.splitter import split_declaracoes
+
+
+def _extrato(numero: str, destino: str) -> str:
+    return f"""
+Dados Gerais
+No. da Declaração : {numero}
+Tipo : DTA - ENTRADA COMUM
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - TECON RIO GRANDE
+Destino
+Unidade Local : {destino} - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA
+Cargas
+Conhecimento : MSCU0001
+"""
+
+
+CLASSICO = """
+Nº da Declaração: 240125002-0
+Tipo: DTA - ENTRADA COMUM
+Origem
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0301304 - TECON RIO GRANDE
+Destino
+Unidade Local: 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro: 0923201 - TRANSCONTINENTAL LOGISTICA
+"""
+
+TEXTO = _extrato("25/0000001-0", "1010700") + _extrato("25/0000002-0", "1010800")
+TEXTO += CLASSICO
+
+
+class DummyExtractor:
+    def __init__(self, text: str) -> None:
+        self._text = text
+
+    def extract(self, source) -> str:
+        return self._text
+
+
+def test_split_declaracoes_corta_antes_de_cada_cabecalho():
+    partes = split_declaracoes(TEXTO)
+
+    assert len(partes) == 3
+    assert partes[0].startswith("Dados Gerais")  # título vai com a declaração
+    assert partes[1].startswith("Dados Gerais\nNo. da Declaração : 25/0000002-0")
+    assert partes[2].startswith("Nº da Declaração: 240125002-0")
+
+
+def test_split_declaracoes_junta_continuacao_da_mesma_declaracao():
+    # cabeçalho repetido no topo da página seguinte: mesma declaração
+    continuacao = "Dados Gerais\nNo. da Declaração : 25/0000001-0\nCargas\nItem : 2\n"
+    texto = _extrato("25/0000001-0", "1010700") + continuacao + CLASSICO
+
+    partes = split_declaracoes(texto)
+
+    assert len(partes) == 2
+    assert partes[0].endswith("Item : 2")
+    assert partes[1].startswith("Nº da Declaração: 240125002-0")
+
+
+def test_split_declaracoes_documento_unico():
+    texto = _extrato("25/0000001-0", "1010700")
+    assert split_declaracoes(texto) == [texto]
+
+
+def test_run_many_uma_declaracao_por_trecho(monkeypatch):
+    monkeypatch.setattr(uc_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+    texto = TEXTO.replace(CLASSICO, _extrato("25/0000003-0", "1010900"))
+    uc = ExtractDataUseCase(
+        DummyExtractor(texto), [BrDtaExtratoParser(), BrDtaParser()]
+    )
+
+    for workers in (1, 3):
+        docs = uc.run_many(
+            "multi.pdf", split_declaracoes, workers=workers, parallel_min_chars=0
+        )
+        assert [d.declaracao.numero for d in docs] == [
+            "2500000010",
+            "2500000020",
+            "2500000030",
+        ]
+        assert docs[1].destino.unidade_local.codigo == "1010800"
+
+
+def test_run_many_texto_pequeno_nao_sobe_processos(monkeypatch):
+    def no_pool(*a, **k):
+        raise AssertionError("pool não deveria ser criado")
+
+    monkeypatch.setattr(uc_mod, "ProcessPoolExecutor", no_pool)
+    uc = ExtractDataUseCase(
+        DummyExtractor(TEXTO), [BrDtaExtratoParser(), BrDtaParser()]
+    )
+
+    docs = uc.run_many("multi.pdf", split_declaracoes, workers=4)
+    assert len(docs) == 3
+
+
+def test_run_many_paralelo_normaliza_uma_vez_no_executor_recebido(monkeypatch):
+    def no_pool(*a, **k):
+        raise AssertionError("o executor recebido deveria ser usado")
+
+    monkeypatch.setattr(uc_mod, "ProcessPoolExecutor", no_pool)
+    normalizados = []
+
+    def normalizer(text: str) -> NormalizedText:
+        normalizados.append(text)
+        return NormalizedText(text)
+
+    uc = ExtractDataUseCase(
+        DummyExtractor(TEXTO),
+        [BrDtaExtratoParser(), BrDtaParser()],
+        classifier=LayoutClassifier(),
+        normalizer=normalizer,
+    )
+
+    with ThreadPoolExecutor(2) as executor:
+        for _ in range(2):  # o mesmo pool atende as duas chamadas
+            docs = uc.run_many(
+                "multi.pdf",
+                split_declaracoes,
+                workers=2,
+                parallel_min_chars=0,
+                executor=executor,
+            )
+            assert [d.declaracao.numero for d in docs] == [
+                "2500000010",
+                "2500000020",
+                "2401250020",
+            ]
+
+    # um trecho, uma normalização (classificação e parse no worker)
+    assert sorted(normalizados) == sorted(split_declaracoes(TEXTO) * 2)
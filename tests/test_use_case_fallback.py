@@ -3,6 +3,7 @@ from __future__ import annotations
 from ws_docflow.core.use_cases.extract_data import ExtractDataUseCase
 from ws_docflow.infra.parsers.br_dta_extrato_parser import BrDtaExtratoParser
 from ws_docflow.infra.parsers.br_dta_parser import BrDtaParser
+from ws_docflow.infra.parsers.normalize import NormalizedText
 
 
 class DummyExtractor:
@@ -60,3 +61,73 @@ Recinto Aduaneiro: 0923201 - TRANSCONTINENTAL LOGÍSTICA_S.A
 
     assert doc.declaracao.numero == "2401250020"
     assert doc.destino.recinto_aduaneiro.codigo == "0923201"
+
+
+class PagesSpy(DummyExtractor):
+    """Entrega o texto em "páginas" separadas por form feed."""
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.pulled = 0
+        self.extract_calls = 0
+
+    def extract(self, pdf_path: str) -> str:
+        self.extract_calls += 1
+        return self._text.replace("\f", "\n")
+
+    def iter_pages(self, source):
+        for page in self._text.split("\f"):
+            self.pulled += 1
+            yield page
+
+
+def test_use_case_early_stop_consome_paginas_sob_demanda():
+    text = """
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - TECON RIO GRANDE
+\fDestino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+Cargas
+""" + "".join(f"\fcarga {i}" for i in range(1000))
+    spy = PagesSpy(text.strip())
+
+    uc = ExtractDataUseCase(spy, [BrDtaExtratoParser(), BrDtaParser()], early_stop=True)
+    doc = uc.run("fake.pdf")
+
+    assert spy.pulled == 2 and spy.extract_calls == 0  # parou em "Cargas"
+    assert doc.destino.unidade_local.codigo == "1010700"
+
+    # sem early_stop/max_pages, também página a página, até o fim
+    ExtractDataUseCase(spy, BrDtaExtratoParser()).run("fake.pdf")
+    assert spy.pulled == 2 + 1002 and spy.extract_calls == 0
+
+
+def test_early_stop_ancora_cargas_no_texto_normalizado():
+    text = """
+Origem
+Unidade Local : 1017700 - PORTO DE RIO GRANDE
+Recinto Aduaneiro : 0301304 - TECON RIO GRANDE
+Destino
+Unidade Local : 1010700 - DRF NOVO HAMBURGO
+Recinto Aduaneiro : 0403201 - EADI-MULTI ARMAZENS LTDA-NOVO HAMBURGO/RS
+\f   CARGAS
+""" + "".join(f"\fcarga {i}" for i in range(100))
+    spy = PagesSpy(text.strip())
+    janelas = []
+
+    def normalizer(texto):
+        janelas.append(texto)
+        return NormalizedText(texto)
+
+    uc = ExtractDataUseCase(
+        spy, BrDtaExtratoParser(), early_stop=True, normalizer=normalizer
+    )
+    doc = uc.run("fake.pdf")
+
+    # "CARGAS" (caixa alta, recuado) vale como o título da seção
+    assert spy.pulled == 2
+    assert doc.destino.unidade_local.codigo == "1010700"
+    # uma normalização por janela (as duas âncoras dividem) + a do documento
+    assert len(janelas) == 3